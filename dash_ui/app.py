@@ -1,3 +1,6 @@
+import json
+import urllib.request
+
 import dash
 from dash import html, dcc, Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
@@ -5,6 +8,9 @@ from dash_iconify import DashIconify
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.MORPH])
 
+# 감지 서버 통계 API
+METRICS_URL = "http://127.0.0.1:8010/metrics"
+
 app.layout = dbc.Container(
     [
         # 상태 저장
@@ -203,6 +209,27 @@ app.layout = dbc.Container(
                             ],
                             className="mb-3",
                         ),
+                        # OCR 크롭 품질 점수 분포
+                        dbc.Card(
+                            [
+                                dbc.CardHeader("OCR 크롭 품질"),
+                                dbc.CardBody(
+                                    [
+                                        dcc.Graph(
+                                            id="quality-histogram",
+                                            config={"displayModeBar": False},
+                                            style={"height": "180px"},
+                                        ),
+                                        html.Small(
+                                            id="quality-summary",
+                                            className="text-muted",
+                                        ),
+                                    ],
+                                    className="p-2",
+                                ),
+                            ],
+                            className="mb-3",
+                        ),
                         # 환경설정 카드 추가
                         dbc.Card(
                             [
@@ -267,6 +294,7 @@ app.layout = dbc.Container(
             ]
         ),
         dcc.Interval(id="status-interval", interval=2000, n_intervals=0),
+        dcc.Interval(id="events-interval", interval=500, n_intervals=0),
         dcc.Store(id="sidebar-toggle", data=True),
         dcc.Store(id="feed-connection-status", data=False),
     ],
@@ -294,14 +322,76 @@ def toggle_sidebar(n, is_open):
     return style, new_open
 
 
-# 상태 업데이트 콜백
-@app.callback(
+# 상태 업데이트 콜백 (events_feed.js 가 /ws/events 로 받아 둔 값을 표시)
+app.clientside_callback(
+    """
+    function(n) {
+        var state = window.dashEvents;
+        if (!state || !state.connected) {
+            return ["-", "감지 서버 이벤트 연결 대기 중...", "🟡 감지 서버 연결 대기 중"];
+        }
+        var status = state.lastFailure
+            ? "🟠 " + state.lastFailure
+            : "🟢 시스템 정상 작동 중 (" + state.mode + ")";
+        return [String(state.count), state.ocrLines.join("\\n") || "-", status];
+    }
+    """,
     Output("object-count", "children"),
     Output("ocr-output", "children"),
+    Output("status-msg", "children"),
+    Input("events-interval", "n_intervals"),
+)
+
+
+def fetch_metrics():
+    """감지 서버의 /metrics 를 읽습니다. (서버가 꺼져 있으면 None)"""
+    try:
+        with urllib.request.urlopen(METRICS_URL, timeout=1.0) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+# OCR 크롭 품질 분포 콜백
+@app.callback(
+    Output("quality-histogram", "figure"),
+    Output("quality-summary", "children"),
     Input("status-interval", "n_intervals"),
 )
-def update_status(n):
-    return "3", "ABC-1234"
+def update_quality(n):
+    metrics = fetch_metrics() or {}
+    quality = metrics.get("ocr_quality") or {}
+
+    # 모든 스트림의 최근 점수 분포를 합산
+    edges, counts = [], []
+    evaluated = rejected = 0
+    for stats in quality.values():
+        histogram = stats["histogram"]
+        edges = histogram["edges"]
+        counts = [a + b for a, b in zip(counts, histogram["counts"])] or list(
+            histogram["counts"]
+        )
+        evaluated += stats["evaluated"]
+        rejected += stats["rejected"]
+
+    figure = {
+        "data": [
+            {
+                "type": "bar",
+                "x": [f"{edges[i]:.1f}" for i in range(len(counts))],
+                "y": counts,
+                "marker": {"color": "#17a2b8"},
+            }
+        ],
+        "layout": {
+            "margin": {"l": 30, "r": 10, "t": 10, "b": 30},
+            "xaxis": {"title": "점수"},
+            "bargap": 0.05,
+        },
+    }
+    if not quality:
+        return figure, "감지 서버 통계 없음"
+    return figure, f"평가 {evaluated} / 제외 {rejected}"
 
 
 # 간소화된 WebSocket 연결 상태 관리를 위한 콜백
@@ -0,0 +1,64 @@
+// 감지 서버 이벤트(/ws/events JSON) 수신 → 상태 정보 패널 갱신용 데이터 보관
+// (영상 디코딩 없이 객체 수와 OCR 결과를 표시)
+const EVENTS_WS_URL = "ws://127.0.0.1:8010/ws/events";
+const MAX_OCR_LINES = 5;
+
+window.dashEvents = {
+  connected: false,
+  mode: "idle",
+  count: 0,
+  ocrLines: [],
+  lastFailure: null,
+};
+
+let eventsWs = null;
+
+function formatTime(ts) {
+  return new Date(ts * 1000).toLocaleTimeString();
+}
+
+function applyEvent(event) {
+  const state = window.dashEvents;
+  if (event.type === "track_started") {
+    // 새 객체 추적이 시작되면 이전 실패 표시를 지움
+    state.lastFailure = null;
+  } else if (event.type === "ocr_result") {
+    state.lastFailure = null;
+    state.ocrLines.unshift(`${formatTime(event.ts)}  #${event.track}  ${event.text}`);
+  } else if (event.type === "ocr_failed") {
+    state.ocrLines.unshift(`${formatTime(event.ts)}  #${event.track}  OCR 실패`);
+  } else if (event.type === "track_ended" && event.reason) {
+    state.lastFailure = `${formatTime(event.ts)} ${event.reason}`;
+  }
+  state.ocrLines.length = Math.min(state.ocrLines.length, MAX_OCR_LINES);
+}
+
+function connectEvents() {
+  eventsWs = new WebSocket(EVENTS_WS_URL);
+
+  eventsWs.onopen = function () {
+    console.log("이벤트 WebSocket 연결 성공!");
+    window.dashEvents.connected = true;
+  };
+
+  eventsWs.onmessage = function (event) {
+    if (typeof event.data !== "string") {
+      // msgpack 형식은 대시보드에서 사용하지 않음 (events.format = "json")
+      console.warn("JSON이 아닌 이벤트 메시지는 무시합니다.");
+      return;
+    }
+    const message = JSON.parse(event.data);
+    window.dashEvents.mode = message.mode;
+    window.dashEvents.count = message.count;
+    message.events.forEach(applyEvent);
+  };
+
+  eventsWs.onclose = function () {
+    console.log("이벤트 WebSocket 연결 종료됨 → 3초 후 재연결");
+    window.dashEvents.connected = false;
+    eventsWs = null;
+    setTimeout(connectEvents, 3000);
+  };
+}
+
+document.addEventListener("DOMContentLoaded", connectEvents);
@@ -1,5 +1,18 @@
+// 영상 표시 방식
+// "server": 서버가 오버레이를 그린 분석 영상(/ws/annotated)
+// "client": 원본 영상(/ws/pass_through) 위에 오버레이 정보(/ws/overlay JSON)를 캔버스에 직접 그림
+//           (서버의 프레임 복사/그리기와 두 번째 JPEG 인코딩이 없어짐)
+const FEED_MODE = "server";
+const WS_BASE_URL = "ws://127.0.0.1:8010";
+
+// 연결 직후 서버에 보내는 송출 프로필 (캔버스 크기에 맞춰 축소해서 받음)
+// 예: { max_fps: 10, max_width: 320, quality: 60 } / null 이면 원본 그대로
+const FEED_PROFILE = { max_width: 640, quality: 80 };
+
 // WebSocket 관련 변수
 let feedWs = null;
+let overlayWs = null;
+let lastOverlay = null;
 let feedPingInterval = null;
 let canvasInterval = null;
 
@@ -25,6 +38,10 @@ function initializeElements() {
     img.onload = function () {
       console.log("이미지 로드됨");
       ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
+      URL.revokeObjectURL(img.src);
+      if (FEED_MODE === "client") {
+        drawOverlay(lastOverlay);
+      }
     };
 
     // 상태 표시 요소
@@ -61,6 +78,66 @@ document.addEventListener("DOMContentLoaded", function () {
   }, 100);
 });
 
+// 오버레이 정보(JSON)를 캔버스에 그림 (서버 pipeline.render_overlay 와 같은 모양)
+function drawOverlay(overlay) {
+  if (!overlay || !ctx) return;
+
+  const scaleX = canvas.width / overlay.size[0];
+  const scaleY = canvas.height / overlay.size[1];
+  const box = (b) => [b[0] * scaleX, b[1] * scaleY, b[2] * scaleX, b[3] * scaleY];
+
+  ctx.save();
+  ctx.lineWidth = 2;
+  ctx.font = "bold 20px sans-serif";
+
+  // ROI
+  ctx.strokeStyle = "#00ff00";
+  ctx.strokeRect(...box(overlay.roi));
+
+  // 움직임 감지 상태 (idle 모드)
+  if (overlay.motion !== null) {
+    ctx.fillStyle = overlay.motion ? "#00ff00" : "#ff0000";
+    ctx.fillText(overlay.motion ? "Motion On" : "Motion Off", 10, 120 * scaleY);
+  }
+
+  // 추적 객체 박스와 id / OCR 결과
+  ctx.font = "bold 14px sans-serif";
+  for (const track of overlay.tracks) {
+    const [x, y, w, h] = box(track.bbox);
+    const color = track.ocr_state === "done" ? "#00ff00" : "#ff0000";
+    ctx.strokeStyle = color;
+    ctx.fillStyle = color;
+    ctx.strokeRect(x, y, w, h);
+    let label = "#" + track.id;
+    if (track.ocr_result) label += " " + track.ocr_result;
+    ctx.fillText(label, x, Math.max(y - 8, 15));
+  }
+
+  // 상단 메시지 (OCR 결과 우선, 없으면 실패 사유)
+  ctx.font = "bold 20px sans-serif";
+  if (overlay.ocr_result) {
+    ctx.fillStyle = "#00ff00";
+    ctx.fillText("OCR: " + overlay.ocr_result, 10, 40 * scaleY);
+  } else if (overlay.failure) {
+    ctx.fillStyle = "#ff0000";
+    ctx.fillText(overlay.failure, 10, 40 * scaleY);
+  }
+  ctx.restore();
+}
+
+// 오버레이 정보 WebSocket 연결 (client 모드)
+function connectOverlay() {
+  if (overlayWs) overlayWs.close();
+  overlayWs = new WebSocket(WS_BASE_URL + "/ws/overlay");
+  overlayWs.onmessage = function (event) {
+    lastOverlay = JSON.parse(event.data);
+  };
+  overlayWs.onclose = function () {
+    overlayWs = null;
+    lastOverlay = null;
+  };
+}
+
 // WebSocket 연결 함수
 window.connectFeed = function () {
   console.log("WebSocket 연결 시도 중...");
@@ -79,11 +156,15 @@ window.connectFeed = function () {
     }
 
     // WebSocket 서버 URL
-    const wsUrl = "ws://127.0.0.1:8010/ws/annotated";
+    const wsUrl =
+      WS_BASE_URL + (FEED_MODE === "client" ? "/ws/pass_through" : "/ws/annotated");
     console.log("연결 시도 URL:", wsUrl);
 
     feedWs = new WebSocket(wsUrl);
     feedWs.binaryType = "arraybuffer";
+    if (FEED_MODE === "client") {
+      connectOverlay();
+    }
 
     // 연결 성공 시 버튼 상태 설정
     feedWs.onopen = function () {
@@ -98,6 +179,10 @@ window.connectFeed = function () {
       if (connectBtn) connectBtn.disabled = true;
       if (disconnectBtn) disconnectBtn.disabled = false;
 
+      if (FEED_PROFILE) {
+        feedWs.send(JSON.stringify(FEED_PROFILE));
+      }
+
       // 핑 메시지 전송 (연결 유지)
       feedPingInterval = setInterval(function () {
         if (feedWs && feedWs.readyState === WebSocket.OPEN) {
@@ -147,6 +232,7 @@ window.disconnectFeed = function () {
   if (feedWs) {
     console.log("연결 해제 요청됨");
     feedWs.close();
+    if (overlayWs) overlayWs.close();
 
     // 연결 버튼과 연결 해제 버튼 상태 직접 업데이트
     const connectBtn = document.getElementById("btn-connect-feed");
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+def to_array(boxes):
+    """(x, y, w, h) 목록을 (N, 4) float 배열로 변환합니다."""
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """
+    두 박스 집합 간 IoU 행렬을 벡터 연산으로 계산합니다.
+
+    :param boxes_a: (N, 4) (x, y, w, h)
+    :param boxes_b: (M, 4) (x, y, w, h)
+    :return: (N, M) IoU 행렬
+    """
+    a = to_array(boxes_a)
+    b = to_array(boxes_b)
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+    inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = inter_w * inter_h
+
+    area_a = a[:, 2:3] * a[:, 3:4]
+    area_b = b[:, 2] * b[:, 3]
+    union = area_a + area_b - inter
+    return inter / np.maximum(union, 1e-6)
+
+
+def centroid_distance_matrix(boxes_a, boxes_b):
+    """
+    중심점 거리를 boxes_a 박스 대각선 길이로 정규화한 행렬을 계산합니다.
+
+    :return: (N, M) 정규화 거리 행렬 (1.0 = 박스 대각선만큼 떨어짐)
+    """
+    a = to_array(boxes_a)
+    b = to_array(boxes_b)
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+
+    ca = a[:, :2] + a[:, 2:] / 2
+    cb = b[:, :2] + b[:, 2:] / 2
+    dist = np.linalg.norm(ca[:, None, :] - cb[None, :, :], axis=2)
+    diag = np.maximum(np.hypot(a[:, 2], a[:, 3]), 1e-6)
+    return dist / diag[:, None]
+
+
+def associate(track_boxes, det_boxes, iou_threshold=0.3, centroid_threshold=0.5):
+    """
+    IoU(겹침이 없으면 중심점 거리)로 추적 박스와 감지 박스를 그리디 매칭합니다.
+
+    :param track_boxes: (N, 4) 추적 중인 박스
+    :param det_boxes: (M, 4) 감지된 박스
+    :param iou_threshold: 매칭으로 인정할 최소 IoU
+    :param centroid_threshold: IoU 미달 시 매칭으로 인정할 최대 정규화 중심점 거리
+    :return: (matches [(track_idx, det_idx)], 미매칭 track 인덱스, 미매칭 감지 인덱스)
+    """
+    n, m = len(track_boxes), len(det_boxes)
+    if n == 0 or m == 0:
+        return [], list(range(n)), list(range(m))
+
+    iou = iou_matrix(track_boxes, det_boxes)
+    dist = centroid_distance_matrix(track_boxes, det_boxes)
+
+    # IoU 매칭을 우선하고, 빠르게 움직여 겹치지 않는 경우 중심점 거리로 보완
+    score = np.where(iou >= iou_threshold, 1.0 + iou, 0.0)
+    near = (score == 0) & (dist <= centroid_threshold)
+    score = np.where(near, 1.0 - dist, score)
+
+    # 점수가 높은 쌍부터 배정 (후보 쌍만 순회)
+    candidates = np.argwhere(score > 0)
+    order = np.argsort(-score[candidates[:, 0], candidates[:, 1]], kind="stable")
+
+    matches = []
+    used_tracks = np.zeros(n, dtype=bool)
+    used_dets = np.zeros(m, dtype=bool)
+    for t, d in candidates[order]:
+        if used_tracks[t] or used_dets[d]:
+            continue
+        used_tracks[t] = True
+        used_dets[d] = True
+        matches.append((int(t), int(d)))
+
+    unmatched_tracks = np.flatnonzero(~used_tracks).tolist()
+    unmatched_dets = np.flatnonzero(~used_dets).tolist()
+    return matches, unmatched_tracks, unmatched_dets
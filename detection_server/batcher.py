@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from settings import get_setting
+from detector import detect_all_objects, detect_all_objects_batch, padded_region
+from metrics import get_stage
+
+
+class _Job:
+    __slots__ = ("stream_id", "frame", "imgsz", "future", "submitted")
+
+    def __init__(self, stream_id, frame, imgsz=None):
+        self.stream_id = stream_id
+        self.frame = frame
+        self.imgsz = imgsz
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class DetectionBatcher:
+    """
+    여러 스트림의 YOLO 감지 요청을 모아 한 번의 batched predict로 처리합니다.
+    첫 요청 이후 max_wait_ms 동안 또는 max_batch개가 모일 때까지 기다립니다.
+    """
+
+    def __init__(self, max_batch=8, max_wait_ms=10.0):
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.batches = 0
+        self.frames = 0
+        self.avg_batch = 0.0
+        self.max_seen = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stage = get_stage("yolo_batch", self._queue)
+        self._thread = threading.Thread(
+            target=self._run, name="yolo-batcher", daemon=True
+        )
+        self._thread.start()
+        print(
+            f"✅ YOLO 배치 감지 시작 (max_batch={self.max_batch}, "
+            f"max_wait={self.max_wait * 1000:.0f}ms)",
+            flush=True,
+        )
+
+    def submit(self, stream_id, frame, imgsz=None):
+        """감지 요청을 큐에 넣고 ((N, 4) 박스, (N,) 신뢰도)를 돌려줄 Future를 반환합니다."""
+        job = _Job(stream_id, frame, imgsz)
+        self._queue.put(job)
+        return job.future
+
+    def detect(self, stream_id, frame, imgsz=None):
+        """배치 처리가 끝날 때까지 기다렸다가 감지 결과를 반환합니다."""
+        return self.submit(stream_id, frame, imgsz).result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            # 추론 입력 크기(imgsz)가 같은 요청끼리 한 번의 predict로 처리
+            groups = {}
+            for job in batch:
+                groups.setdefault(job.imgsz, []).append(job)
+
+            for imgsz, jobs in groups.items():
+                try:
+                    with self._stage.time():
+                        results = detect_all_objects_batch(
+                            [job.frame for job in jobs], imgsz=imgsz
+                        )
+                except Exception as e:
+                    print(f"💥 배치 감지 예외: {e}", flush=True)
+                    for job in jobs:
+                        job.future.set_exception(e)
+                    continue
+
+                done = time.perf_counter()
+                for job, result in zip(jobs, results):
+                    get_stage(f"detect:{job.stream_id}").observe(done - job.submitted)
+                    job.future.set_result(result)
+                    job.frame = None
+
+            with self._lock:
+                self.batches += 1
+                self.frames += len(batch)
+                self.avg_batch = self.frames / self.batches
+                self.max_seen = max(self.max_seen, len(batch))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "frames": self.frames,
+                "avg_batch_size": round(self.avg_batch, 2),
+                "max_batch_size": self.max_seen,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+# 전역 배치 감지기 (최초 사용 시 생성)
+_batcher = None
+
+
+def get_batcher():
+    """설정(batching.enabled)이 켜져 있으면 전역 배치 감지기를 반환합니다."""
+    global _batcher
+    if _batcher is not None:
+        return _batcher
+
+    config = get_setting("batching", {}) or {}
+    if not config.get("enabled", False):
+        return None
+
+    _batcher = DetectionBatcher(
+        config.get("max_batch", 8), config.get("max_wait_ms", 10.0)
+    )
+    return _batcher
+
+
+def get_region_config():
+    """
+    ROI 영역 추론 설정을 반환합니다.
+
+    :return: (enabled, source("roi"/"motion"), padding, imgsz)
+    """
+    config = get_setting("roi_inference", {}) or {}
+    return (
+        bool(config.get("enabled", False)),
+        config.get("source", "roi"),
+        float(config.get("padding", 0.25)),
+        config.get("imgsz", 320),
+    )
+
+
+def detect(stream_id, frame, region=None):
+    """
+    스트림 프레임의 객체를 감지합니다. 배치 감지가 켜져 있으면 다른 스트림과 묶어 처리합니다.
+
+    :param region: (x, y, w, h) 주어지면 ROI 영역 추론 설정에 따라 이 영역(여백 포함)만
+                   잘라 작은 imgsz로 감지하고, 박스를 프레임 좌표로 되돌립니다.
+    :return: ((N, 4) xywh 배열, (N,) 신뢰도 배열)
+    """
+    enabled, _, padding, imgsz = get_region_config()
+    offset = None
+    if enabled and region is not None:
+        x0, y0, x1, y1 = padded_region(frame.shape, region, padding)
+        frame = frame[y0:y1, x0:x1]
+        offset = (x0, y0)
+    else:
+        imgsz = None
+
+    batcher = get_batcher()
+    if batcher is None:
+        with get_stage(f"detect:{stream_id}").time():
+            boxes, scores = detect_all_objects(frame, imgsz=imgsz)
+    else:
+        boxes, scores = batcher.detect(stream_id, frame, imgsz)
+
+    if offset is not None and len(boxes):
+        boxes = boxes.copy()
+        boxes[:, 0] += offset[0]
+        boxes[:, 1] += offset[1]
+    return boxes, scores
@@ -0,0 +1,122 @@
+"""
+YOLO 감지 백엔드별 처리 시간과 결과 일치도를 녹화 영상으로 비교합니다.
+
+사용 예 (저장소 루트에서 실행):
+    python detection_server/bench_detector.py recorded.mp4 --backends ultralytics,onnxruntime,openvino
+
+ultralytics predict 결과를 기준으로 각 백엔드의 감지 박스가 IoU 0.5 이상으로
+일치하는 비율(match)을 함께 출력합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ultralytics import YOLO
+from settings import get_model_path, get_setting
+import detector
+from detector import detect_all_objects
+from association import associate
+from onnx_detector import ONNX_BACKENDS, export_onnx, load_onnx_detector
+from bench_tracker import read_frames
+
+
+def load_backend(backend, model_path, config):
+    """감지 백엔드를 로드하여 detector 모듈에 주입합니다."""
+    if backend == "ultralytics":
+        model = YOLO(model_path)
+    else:
+        model = load_onnx_detector(model_path, dict(config, backend=backend))
+    detector.yolo_model = model
+    return model
+
+
+def run_backend(frames, warmup, imgsz):
+    """
+    전체 프레임을 한 장씩 감지합니다. (앞쪽 warmup 프레임은 측정 제외)
+
+    :return: (프레임당 평균 ms, p95 ms, 프레임별 감지 박스 목록)
+    """
+    for frame in frames[:warmup]:
+        detect_all_objects(frame, imgsz=imgsz)
+
+    times = []
+    results = []
+    for frame in frames:
+        start = time.perf_counter()
+        boxes, _ = detect_all_objects(frame, imgsz=imgsz)
+        times.append((time.perf_counter() - start) * 1000.0)
+        results.append(boxes)
+    return float(np.mean(times)), float(np.percentile(times, 95)), results
+
+
+def match_rate(reference, results, iou_threshold=0.5):
+    """기준 감지 박스 중 IoU 기준으로 일치하는 박스 비율"""
+    total = matched = 0
+    for ref_boxes, boxes in zip(reference, results):
+        total += len(ref_boxes)
+        if len(ref_boxes) and len(boxes):
+            matches, _, _ = associate(ref_boxes, boxes, iou_threshold, 0.0)
+            matched += len(matches)
+    return matched / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="YOLO 감지 백엔드별 속도 / 일치도 비교"
+    )
+    parser.add_argument("video", help="녹화 영상 경로")
+    parser.add_argument(
+        "--backends",
+        default=",".join(("ultralytics",) + ONNX_BACKENDS),
+        help="비교할 백엔드 (쉼표 구분, 첫 번째가 일치도 기준)",
+    )
+    parser.add_argument("--model", help="가중치 경로 (기본값: yolo_model_path)")
+    parser.add_argument("--imgsz", type=int, help="추론 입력 크기")
+    parser.add_argument("--threads", type=int, help="ONNX intra-op 스레드 수")
+    parser.add_argument("--max-frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--force-export", action="store_true", help="캐시된 ONNX를 무시하고 다시 내보냄"
+    )
+    args = parser.parse_args()
+
+    model_path = args.model or get_model_path()
+    config = dict(get_setting("detector", {}) or {})
+    if args.imgsz:
+        config["imgsz"] = args.imgsz
+    if args.threads is not None:
+        config["intra_op_threads"] = args.threads
+    imgsz = config.get("imgsz", 416)
+
+    if args.force_export and not model_path.endswith(".onnx"):
+        export_onnx(model_path, imgsz, config.get("onnx_path"), force=True)
+
+    frames = read_frames(args.video, args.max_frames)
+    if not frames:
+        print(f"🚨 영상 읽기 실패: {args.video}")
+        return
+    print(f"🎞️ 프레임 {len(frames)}개 로드 완료 (imgsz={imgsz})")
+
+    print(f"{'backend':<12} {'avg_ms':>8} {'p95_ms':>8} {'fps':>8} {'match':>7}")
+    reference = None
+    for backend in args.backends.split(","):
+        backend = backend.strip()
+        load_backend(backend, model_path, config)
+        avg_ms, p95_ms, results = run_backend(frames, args.warmup, imgsz)
+        if reference is None:
+            reference = results
+        match = match_rate(reference, results)
+        print(
+            f"{backend:<12} {avg_ms:>8.2f} {p95_ms:>8.2f} "
+            f"{1000.0 / max(avg_ms, 1e-6):>8.1f} {match:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+OCR 엔진별 인식 속도와 정확도를 저장된 크롭 이미지로 비교합니다.
+
+사용 예 (저장소 루트에서 실행):
+    python detection_server/bench_ocr.py crops/ --engines easyocr,easyocr_digits,crnn
+
+정답은 폴더의 labels.csv ("파일명,숫자") 또는 파일명 앞부분("1234_0001.png" → 1234)에서 읽습니다.
+숫자가 없는 크롭은 정답을 "none" 으로 표시합니다.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from settings import get_setting
+from ocr import create_engine
+from digit_recognizer import OCR_ENGINES
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_crops(folder):
+    """크롭 이미지와 정답을 [(파일명, 이미지, 정답 또는 None)] 로 읽습니다."""
+    labels = {}
+    labels_path = os.path.join(folder, "labels.csv")
+    if os.path.exists(labels_path):
+        with open(labels_path, "r", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if len(row) >= 2:
+                    labels[row[0].strip()] = row[1].strip()
+
+    crops = []
+    for path in sorted(glob.glob(os.path.join(folder, "*"))):
+        name = os.path.basename(path)
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        label = labels.get(name, name.split("_")[0])
+        crops.append((name, image, None if label.lower() == "none" else label))
+    return crops
+
+
+def run_engine(engine, crops, warmup):
+    """
+    :return: (평균 ms, p95 ms, 정확도, 인식률, 오인식 목록)
+    """
+    for _, image, _ in crops[:warmup]:
+        engine.read(image)
+
+    times = []
+    correct = read = 0
+    errors = []
+    for name, image, label in crops:
+        start = time.perf_counter()
+        text, _ = engine.read(image)
+        times.append((time.perf_counter() - start) * 1000.0)
+        read += text is not None
+        if text == label:
+            correct += 1
+        else:
+            errors.append((name, label, text))
+    return (
+        float(np.mean(times)),
+        float(np.percentile(times, 95)),
+        correct / len(crops),
+        read / len(crops),
+        errors,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 엔진별 속도 / 정확도 비교")
+    parser.add_argument("crops", help="크롭 이미지 폴더")
+    parser.add_argument(
+        "--engines", default=",".join(OCR_ENGINES), help="비교할 엔진 (쉼표 구분)"
+    )
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    crops = load_crops(args.crops)
+    if not crops:
+        print(f"🚨 크롭 이미지가 없습니다: {args.crops}")
+        return
+    print(f"🎞️ 크롭 {len(crops)}장 로드 완료")
+
+    config = get_setting("ocr", {}) or {}
+    print(f"{'engine':<15} {'avg_ms':>8} {'p95_ms':>8} {'acc':>7} {'read':>7}")
+    for name in args.engines.split(","):
+        name = name.strip()
+        try:
+            engine = create_engine(name, config)
+        except Exception as e:
+            print(f"{name:<15} 로드 실패: {e}")
+            continue
+        avg_ms, p95_ms, accuracy, read_rate, errors = run_engine(
+            engine, crops, args.warmup
+        )
+        print(
+            f"{name:<15} {avg_ms:>8.2f} {p95_ms:>8.2f} "
+            f"{accuracy:>7.1%} {read_rate:>7.1%}"
+        )
+        if args.show_errors:
+            for file_name, label, text in errors:
+                print(f"    {file_name}: 정답 {label} → {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+추적기 종류별 처리 속도(FPS)와 ID 전환 횟수를 녹화 영상으로 비교합니다.
+
+사용 예 (저장소 루트에서 실행):
+    python detection_server/bench_tracker.py recorded.mp4 --backends csrt,kcf,mosse,detection
+
+정답 파일(--gt, MOT 형식 "frame,id,x,y,w,h")이 없으면 매 프레임 YOLO 감지를
+IoU로 이어붙인 결과를 기준 ID로 사용합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from detector import detect_all_objects
+from association import associate
+from tracker import TRACKER_BACKENDS
+from track_manager import TrackManager
+from pipeline import load_model
+
+
+def read_frames(video_path, max_frames):
+    """영상 디코딩이 측정에 포함되지 않도록 프레임을 미리 읽어둡니다."""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def load_ground_truth(path):
+    """MOT 형식 정답 파일을 {frame_idx: [(id, (x, y, w, h))]} 로 읽습니다."""
+    gt = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.strip().split(",")
+            if len(parts) < 6:
+                continue
+            # MOT 프레임 번호는 1부터 시작
+            frame_idx, obj_id = int(parts[0]) - 1, int(parts[1])
+            bbox = tuple(float(v) for v in parts[2:6])
+            gt.setdefault(frame_idx, []).append((obj_id, bbox))
+    return gt
+
+
+def build_reference_ids(frames, iou_threshold=0.3):
+    """매 프레임 YOLO 감지 결과를 IoU로 연결해 기준 ID를 만듭니다. (측정 제외)"""
+    gt = {}
+    prev_ids, prev_boxes = [], []
+    next_id = 1
+    for idx, frame in enumerate(frames):
+        boxes, _ = detect_all_objects(frame)
+        matches, _, unmatched = associate(prev_boxes, boxes, iou_threshold)
+        ids = [0] * len(boxes)
+        for t, d in matches:
+            ids[d] = prev_ids[t]
+        for d in unmatched:
+            ids[d] = next_id
+            next_id += 1
+        gt[idx] = [(ids[d], tuple(boxes[d])) for d in range(len(boxes))]
+        prev_ids, prev_boxes = ids, [tuple(b) for b in boxes]
+    return gt
+
+
+def count_id_switches(gt, hypotheses, iou_threshold=0.5):
+    """기준 ID마다 매칭된 track id가 바뀐 횟수를 셉니다."""
+    switches = 0
+    last_assigned = {}
+    for idx, gt_objects in gt.items():
+        hyp = hypotheses.get(idx, [])
+        if not gt_objects or not hyp:
+            continue
+        gt_boxes = [b for _, b in gt_objects]
+        hyp_boxes = [b for _, b in hyp]
+        matches, _, _ = associate(gt_boxes, hyp_boxes, iou_threshold, 0.0)
+        for g, h in matches:
+            gt_id, track_id = gt_objects[g][0], hyp[h][0]
+            previous = last_assigned.get(gt_id)
+            if previous is not None and previous != track_id:
+                switches += 1
+            last_assigned[gt_id] = track_id
+    return switches
+
+
+def run_backend(backend, frames):
+    """
+    한 추적기 종류로 전체 프레임을 처리합니다. (YOLO 감지 시간 포함, OCR 제외)
+
+    :return: (FPS, YOLO 호출 수, {frame_idx: [(track_id, bbox)]})
+    """
+    manager = TrackManager(backend=backend)
+    hypotheses = {}
+    detector_calls = 0
+
+    start = time.perf_counter()
+    for idx, frame in enumerate(frames):
+        if not manager.tracks:
+            boxes, _ = detect_all_objects(frame)
+            detector_calls += 1
+            if len(boxes):
+                manager.apply_detections(frame, boxes)
+        else:
+            manager.update_trackers(frame)
+            manager.frames_since_detection += 1
+            if (
+                manager.tracks
+                and manager.frames_since_detection >= manager.detection_interval
+            ):
+                boxes, _ = detect_all_objects(frame)
+                detector_calls += 1
+                manager.apply_detections(frame, boxes)
+        hypotheses[idx] = [(t.id, t.bbox) for t in manager.tracks.values()]
+    elapsed = time.perf_counter() - start
+
+    return len(frames) / max(elapsed, 1e-6), detector_calls, hypotheses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추적기 종류별 FPS / ID 전환 비교")
+    parser.add_argument("video", help="녹화 영상 경로")
+    parser.add_argument(
+        "--backends",
+        default=",".join(TRACKER_BACKENDS),
+        help="비교할 추적기 (쉼표 구분)",
+    )
+    parser.add_argument("--gt", help="MOT 형식 정답 파일 (frame,id,x,y,w,h)")
+    parser.add_argument("--max-frames", type=int, default=500)
+    args = parser.parse_args()
+
+    load_model()
+    frames = read_frames(args.video, args.max_frames)
+    if not frames:
+        print(f"🚨 영상 읽기 실패: {args.video}")
+        return
+    print(f"🎞️ 프레임 {len(frames)}개 로드 완료")
+
+    if args.gt:
+        gt = load_ground_truth(args.gt)
+    else:
+        print("🔄 기준 ID 생성 중 (매 프레임 YOLO 감지)...")
+        gt = build_reference_ids(frames)
+    gt_objects = int(np.sum([len(v) for v in gt.values()]))
+
+    print(
+        f"{'backend':<10} {'fps':>8} {'yolo':>6} {'id_sw':>6} (기준 객체 {gt_objects})"
+    )
+    for backend in args.backends.split(","):
+        backend = backend.strip()
+        fps, detector_calls, hypotheses = run_backend(backend, frames)
+        switches = count_id_switches(gt, hypotheses)
+        print(f"{backend:<10} {fps:>8.1f} {detector_calls:>6} {switches:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+from collections import deque
+
+import cv2
+import numpy as np
+
+from settings import get_setting
+from roi_checker import ROI_BOX
+
+# 점수 구성 요소 (weights 설정 키와 같은 순서)
+QUALITY_COMPONENTS = ("sharpness", "exposure", "size", "center")
+
+
+class CropQualityScorer:
+    """
+    OCR 입력 크롭의 품질 점수(0~1)를 계산하고, 기준 미만 크롭은 OCR 제출에서 제외합니다.
+
+    - sharpness: 라플라시안 분산 / sharpness_ref (흐림)
+    - exposure: 평균 밝기가 중간값에 가까울수록, 포화(너무 어둡거나 밝은) 픽셀이 적을수록 높음
+    - size: 원본 박스 높이 / target_height
+    - center: ROI 중심과 박스 중심의 거리 (ROI 반대각선 길이로 정규화)
+    """
+
+    def __init__(
+        self,
+        enabled=True,
+        min_score=0.3,
+        sharpness_ref=300.0,
+        target_height=48,
+        weights=None,
+        history=500,
+        bins=10,
+        roi=None,
+    ):
+        self.enabled = enabled
+        self.min_score = min_score
+        self.sharpness_ref = float(sharpness_ref)
+        self.target_height = float(target_height)
+        weights = weights or {}
+        self.weights = np.array(
+            [weights.get(name, 1.0) for name in QUALITY_COMPONENTS], dtype=np.float32
+        )
+        self.weights /= max(float(self.weights.sum()), 1e-6)
+        self.bins = bins
+        self.roi = roi or ROI_BOX
+
+        self.scores = deque(maxlen=history)  # 최근 점수 (분포 표시용)
+        self.evaluated = 0
+        self.rejected = 0
+
+    def components(self, crop, bbox):
+        """:return: QUALITY_COMPONENTS 순서의 (4,) 0~1 점수 배열"""
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        g = gray.astype(np.float32)
+
+        # 4-이웃 라플라시안 (슬라이스 연산으로 한 번에 계산)
+        if g.shape[0] >= 3 and g.shape[1] >= 3:
+            center = g[1:-1, 1:-1]
+            laplacian = (
+                g[:-2, 1:-1] + g[2:, 1:-1] + g[1:-1, :-2] + g[1:-1, 2:] - 4.0 * center
+            )
+            sharpness = float(laplacian.var()) / self.sharpness_ref
+        else:
+            sharpness = 0.0
+
+        mean = float(g.mean())
+        clipped = np.count_nonzero((gray <= 8) | (gray >= 247)) / gray.size
+        exposure = (1.0 - abs(mean - 127.5) / 127.5) * (1.0 - clipped)
+
+        x, y, w, h = bbox
+        size = h / self.target_height
+
+        roi_x, roi_y, roi_w, roi_h = self.roi
+        offset = np.array(
+            [x + w / 2 - (roi_x + roi_w / 2), y + h / 2 - (roi_y + roi_h / 2)]
+        )
+        half_diagonal = max(np.hypot(roi_w / 2, roi_h / 2), 1.0)
+        center_score = 1.0 - np.hypot(*offset) / half_diagonal
+
+        return np.clip(
+            np.array([sharpness, exposure, size, center_score], dtype=np.float32),
+            0.0,
+            1.0,
+        )
+
+    def score(self, crop, bbox):
+        """
+        크롭 품질 점수를 계산하고 분포에 기록합니다.
+
+        :param crop: OCR 입력 이미지 (prepare_crop 결과)
+        :param bbox: (x, y, w, h) 원본 프레임 기준 박스
+        :return: (점수 0~1, OCR 제출 허용 여부)
+        """
+        value = float(self.components(crop, bbox) @ self.weights)
+        passed = not self.enabled or value >= self.min_score
+        self.scores.append(value)
+        self.evaluated += 1
+        self.rejected += not passed
+        return value, passed
+
+    def stats(self):
+        scores = np.array(list(self.scores), dtype=np.float32)
+        counts, edges = np.histogram(scores, bins=self.bins, range=(0.0, 1.0))
+        return {
+            "enabled": self.enabled,
+            "min_score": self.min_score,
+            "evaluated": self.evaluated,
+            "rejected": self.rejected,
+            "mean": round(float(scores.mean()), 3) if scores.size else None,
+            "p50": round(float(np.percentile(scores, 50)), 3) if scores.size else None,
+            "p90": round(float(np.percentile(scores, 90)), 3) if scores.size else None,
+            "histogram": {
+                "edges": [round(float(e), 2) for e in edges],
+                "counts": counts.tolist(),
+            },
+        }
+
+
+# 스트림별 품질 평가기 (점수 분포를 스트림마다 따로 집계)
+quality_scorers = {}
+
+
+def get_quality_scorer(stream_id="default"):
+    """설정(ocr_quality)에 따른 스트림별 크롭 품질 평가기를 반환합니다."""
+    scorer = quality_scorers.get(stream_id)
+    if scorer is None:
+        config = get_setting("ocr_quality", {}) or {}
+        scorer = quality_scorers[stream_id] = CropQualityScorer(
+            enabled=config.get("enabled", True),
+            min_score=config.get("min_score", 0.3),
+            sharpness_ref=config.get("sharpness_ref", 300.0),
+            target_height=config.get("target_height", 48),
+            weights=config.get("weights"),
+            history=config.get("history", 500),
+            bins=config.get("bins", 10),
+        )
+    return scorer
+
+
+def quality_snapshot():
+    """스트림별 크롭 품질 점수 분포 (/metrics 노출용)"""
+    return {stream_id: scorer.stats() for stream_id, scorer in quality_scorers.items()}
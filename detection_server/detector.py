@@ -3,6 +3,8 @@ import cv2
 import numpy as np
 import os
 
+from onnx_detector import OnnxYoloDetector
+
 # 전역 모델 변수
 yolo_model = None
 
@@ -14,30 +16,105 @@ def set_model(model):
     print("✅ YOLO 모델 설정 완료", flush=True)
 
 
-def detect_objects(frame, conf_thres=0.5):
+def _empty_detections():
+    return np.zeros((0, 4), dtype=np.int32), np.zeros((0,), dtype=np.float32)
+
+
+def _boxes_from_result(result):
+    """YOLO 결과 하나를 ((N, 4) xywh 배열, (N,) 신뢰도 배열)로 변환합니다."""
+    detections = result.boxes.xyxy.cpu().numpy()  # (N, 4)
+    scores = result.boxes.conf.cpu().numpy()
+
+    if len(detections) == 0:
+        return _empty_detections()
+
+    # xyxy → xywh (벡터 연산)
+    boxes = detections.copy()
+    boxes[:, 2:] -= boxes[:, :2]
+    return boxes.astype(np.int32), scores
+
+
+def detect_all_objects_batch(frames, conf_thres=0.5, imgsz=None):
     """
-    YOLO 모델을 사용하여 객체를 감지하고 바운딩 박스를 반환합니다.
+    여러 프레임을 한 번의 YOLO predict 호출로 감지합니다.
 
-    :param frame: 입력 BGR 이미지 (numpy array)
+    :param frames: BGR 이미지 목록
     :param conf_thres: 신뢰도 임계값
-    :return: 첫 번째 감지된 객체의 바운딩 박스 (x, y, w, h) 또는 None
+    :param imgsz: 추론 입력 크기 (None이면 모델 기본값)
+    :return: 프레임별 ((N, 4) xywh 배열, (N,) 신뢰도 배열) 목록
     """
     if yolo_model is None:
         print("⚠️ YOLO 모델이 초기화되지 않았습니다", flush=True)
+        return [_empty_detections() for _ in frames]
+
+    # ONNX Runtime / OpenVINO 백엔드 (전처리/후처리는 NumPy)
+    if isinstance(yolo_model, OnnxYoloDetector):
+        return yolo_model.detect_batch(frames, conf_thres, imgsz)
+
+    kwargs = {"imgsz": imgsz} if imgsz else {}
+    results = yolo_model.predict(
+        source=list(frames), conf=conf_thres, verbose=False, **kwargs
+    )
+    return [_boxes_from_result(result) for result in results]
+
+
+def detect_all_objects(frame, conf_thres=0.5, imgsz=None):
+    """
+    YOLO 모델을 사용하여 프레임 안의 모든 객체를 감지합니다.
+
+    :param frame: 입력 BGR 이미지 (numpy array)
+    :param conf_thres: 신뢰도 임계값
+    :param imgsz: 추론 입력 크기 (None이면 모델 기본값)
+    :return: ((N, 4) int 배열 (x, y, w, h), (N,) 신뢰도 배열)
+    """
+    return detect_all_objects_batch([frame], conf_thres, imgsz)[0]
+
+
+def padded_region(frame_shape, box, padding=0.25):
+    """
+    박스 주변을 padding 비율만큼 넓힌 영역을 프레임 안으로 잘라 반환합니다.
+
+    :param box: (x, y, w, h)
+    :param padding: 박스 크기 대비 여백 비율
+    :return: (x0, y0, x1, y1)
+    """
+    frame_h, frame_w = frame_shape[:2]
+    x, y, w, h = (int(v) for v in box)
+    px, py = int(w * padding), int(h * padding)
+    x0, y0 = max(0, x - px), max(0, y - py)
+    x1, y1 = min(frame_w, x + w + px), min(frame_h, y + h + py)
+    if x1 <= x0 or y1 <= y0:
+        return 0, 0, frame_w, frame_h  # 박스가 프레임 밖이면 전체 프레임
+    return x0, y0, x1, y1
+
+
+def union_box(boxes):
+    """(x, y, w, h) 박스들을 모두 포함하는 박스를 반환합니다. (없으면 None)"""
+    boxes = [b for b in boxes if b is not None]
+    if not boxes:
         return None
+    arr = np.asarray(boxes, dtype=np.int64)
+    x0, y0 = arr[:, 0].min(), arr[:, 1].min()
+    x1 = (arr[:, 0] + arr[:, 2]).max()
+    y1 = (arr[:, 1] + arr[:, 3]).max()
+    return int(x0), int(y0), int(x1 - x0), int(y1 - y0)
 
-    results = yolo_model.predict(source=frame, conf=conf_thres, verbose=False)
 
-    detections = results[0].boxes.xyxy.cpu().numpy()  # (N, 4)
-    scores = results[0].boxes.conf.cpu().numpy()
+def detect_objects(frame, conf_thres=0.5):
+    """
+    YOLO 모델을 사용하여 객체를 감지하고 바운딩 박스를 반환합니다.
 
-    if len(detections) == 0:
+    :param frame: 입력 BGR 이미지 (numpy array)
+    :param conf_thres: 신뢰도 임계값
+    :return: 신뢰도가 가장 높은 객체의 바운딩 박스 (x, y, w, h) 또는 None
+    """
+    boxes, scores = detect_all_objects(frame, conf_thres)
+
+    if len(boxes) == 0:
         return None
 
-    # 신뢰도 높은 것부터 정렬
+    # 신뢰도 가장 높은 것 선택
     idx = np.argmax(scores)
-    x1, y1, x2, y2 = detections[idx]
-    w = x2 - x1
-    h = y2 - y1
+    x, y, w, h = boxes[idx]
 
-    return (int(x1), int(y1), int(w), int(h))  # (x, y, w, h) 포맷
+    return (int(x), int(y), int(w), int(h))  # (x, y, w, h) 포맷
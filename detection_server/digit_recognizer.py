@@ -0,0 +1,128 @@
+import re
+import threading
+
+import cv2
+import numpy as np
+
+# 지원하는 OCR 엔진
+OCR_ENGINES = ("easyocr", "easyocr_digits", "crnn")
+
+# 3~4자리 숫자 (숫자 전용 엔진은 결과 전체가 이 형식이어야 함)
+DIGITS_PATTERN = re.compile(r"^\d{3,4}$")
+
+
+def ctc_greedy_decode(logits, alphabet, blank=0):
+    """
+    CTC greedy 디코딩 (NumPy). 연속 중복과 blank를 제거합니다.
+
+    :param logits: (T, C) 시점별 클래스 점수 (softmax 전/후 모두 가능)
+    :param alphabet: blank를 제외한 문자 목록 (클래스 1부터 대응)
+    :param blank: blank 클래스 번호
+    :return: (문자열, 신뢰도 = 남은 문자 확률의 평균)
+    """
+    logits = np.asarray(logits, dtype=np.float32)
+    if logits.min() < 0 or not np.allclose(logits.sum(axis=1), 1.0, atol=1e-3):
+        # softmax 적용 (수치 안정성을 위해 최대값을 빼고 계산)
+        logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+        logits /= logits.sum(axis=1, keepdims=True)
+
+    best = logits.argmax(axis=1)
+    probs = logits[np.arange(len(best)), best]
+    keep = np.ones(len(best), dtype=bool)
+    keep[1:] = best[1:] != best[:-1]
+    keep &= best != blank
+
+    text = "".join(alphabet[i - 1 if blank == 0 else i] for i in best[keep])
+    confidence = float(probs[keep].mean()) if keep.any() else 0.0
+    return text, confidence
+
+
+class CrnnDigitRecognizer:
+    """
+    숫자 전용 CRNN ONNX 모델로 크롭 이미지를 인식합니다. (검출 단계 없음)
+    입력: (1, 1, height, width) 그레이 0~1, 출력: (T, 1, C) 또는 (1, T, C) 점수
+    여러 스레드(스트림)에서 동시에 호출할 수 있도록 입력 버퍼는 스레드마다 따로 둡니다.
+    """
+
+    def __init__(self, model_path, height=32, width=128, alphabet="0123456789"):
+        import onnxruntime as ort
+
+        self.height = height
+        self.width = width
+        self.alphabet = alphabet
+        self._session = ort.InferenceSession(
+            model_path, providers=["CPUExecutionProvider"]
+        )
+        self._input = self._session.get_inputs()[0].name
+        self._local = threading.local()
+
+    def _buffer(self):
+        """현재 스레드의 입력 버퍼 (최초 사용 시 할당 후 재사용)"""
+        blob = getattr(self._local, "blob", None)
+        if blob is None:
+            blob = self._local.blob = np.zeros(
+                (1, 1, self.height, self.width), dtype=np.float32
+            )
+        return blob
+
+    def _prepare(self, crop):
+        """높이를 맞춰 비율 유지 축소 후 오른쪽을 0으로 채웁니다."""
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        h, w = gray.shape[:2]
+        new_w = max(1, min(self.width, int(round(w * self.height / h))))
+        resized = cv2.resize(gray, (new_w, self.height), interpolation=cv2.INTER_AREA)
+        blob = self._buffer()
+        blob.fill(0.0)
+        np.multiply(resized, 1.0 / 255.0, out=blob[0, 0, :, :new_w])
+        return blob
+
+    def read(self, crop):
+        """
+        :return: (숫자 문자열 또는 None, 신뢰도)
+        """
+        output = self._session.run(None, {self._input: self._prepare(crop)})[0]
+        logits = output[:, 0, :] if output.shape[1] == 1 else output[0]
+        text, confidence = ctc_greedy_decode(logits, self.alphabet)
+        return (text, confidence) if DIGITS_PATTERN.match(text) else (None, confidence)
+
+
+class EasyOcrDigitRecognizer:
+    """
+    EasyOCR 인식기만 사용합니다. (CRAFT 문자 검출 생략, 숫자 allowlist, greedy 디코딩)
+    YOLO가 이미 찾은 박스 안을 한 줄로 보고 인식합니다.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def read(self, crop):
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        h, w = gray.shape[:2]
+        results = self.reader.recognize(
+            gray,
+            horizontal_list=[[0, w, 0, h]],
+            free_list=[],
+            allowlist="0123456789",
+            decoder="greedy",
+            detail=1,
+        )
+        for _, text, confidence in results:
+            text = text.replace(" ", "")
+            if DIGITS_PATTERN.match(text):
+                return text, float(confidence)
+        return None, 0.0
+
+
+class EasyOcrRecognizer:
+    """기존 방식: EasyOCR 검출 + 인식 후 3~4자리 숫자를 정규식으로 추출합니다."""
+
+    def __init__(self, reader, extract):
+        self.reader = reader
+        self.extract = extract
+
+    def read(self, crop):
+        for _, text, confidence in self.reader.readtext(crop):
+            cleaned = self.extract(text)
+            if cleaned:
+                return cleaned, float(confidence)
+        return None, 0.0
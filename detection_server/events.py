@@ -0,0 +1,44 @@
+import json
+import time
+
+from settings import get_setting
+
+try:
+    import msgpack
+except ImportError:  # msgpack 미설치 시 JSON만 사용
+    msgpack = None
+
+# 지원하는 이벤트 직렬화 형식
+EVENT_FORMATS = ("json", "msgpack")
+
+
+def make_event(kind, **fields):
+    """타임스탬프가 붙은 이벤트 dict를 만듭니다."""
+    return dict(type=kind, ts=round(time.time(), 3), **fields)
+
+
+def get_events_config():
+    """
+    :return: (직렬화 형식, 클라이언트별 큐 크기, 매 프레임 요약 송출 여부)
+    """
+    config = get_setting("events", {}) or {}
+    fmt = config.get("format", "json")
+    if fmt not in EVENT_FORMATS:
+        raise ValueError(
+            f"지원하지 않는 이벤트 형식: {fmt} (사용 가능: {EVENT_FORMATS})"
+        )
+    if fmt == "msgpack" and msgpack is None:
+        print("⚠️ msgpack 미설치 → 이벤트를 JSON으로 송출합니다.", flush=True)
+        fmt = "json"
+    return fmt, int(config.get("queue_size", 64)), bool(config.get("frames", True))
+
+
+def encode_message(message, fmt="json"):
+    """
+    이벤트 메시지를 직렬화합니다.
+
+    :return: JSON 문자열(텍스트 프레임) 또는 msgpack bytes(바이너리 프레임)
+    """
+    if fmt == "msgpack":
+        return msgpack.packb(message, use_bin_type=True)
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,78 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from settings import get_setting
+from streams import load_stream_configs
+
+# 전역 compute executor (최초 사용 시 생성)
+_executor = None
+
+
+def get_executor_config():
+    """
+    compute executor 설정을 읽어옵니다.
+
+    :return: (종류 "thread"/"process", 워커 수)
+    """
+    config = get_setting("compute_executor", {}) or {}
+    kind = config.get("type", "thread")
+    max_workers = int(config.get("max_workers", 1))
+
+    if kind not in ("thread", "process"):
+        print(f"⚠️ 알 수 없는 executor 종류: {kind} → thread 사용", flush=True)
+        kind = "thread"
+
+    # 추적기/상태가 워커 프로세스 안에 있으므로 프로세스 모드는 워커 1개만 허용
+    # (모든 스트림이 한 워커에서 순서대로 처리되므로 배치 감지 효과 없음)
+    if kind == "process" and max_workers != 1:
+        print(
+            "⚠️ process executor는 상태 일관성을 위해 워커 1개로 고정됩니다", flush=True
+        )
+        max_workers = 1
+
+    # 스레드 모드는 스트림마다 동시에 연산할 수 있도록 최소 스트림 수만큼 워커 확보
+    if kind == "thread":
+        max_workers = max(max_workers, len(load_stream_configs()))
+
+    return kind, max(1, max_workers)
+
+
+def get_compute_executor():
+    """YOLO/추적/OCR 연산을 실행할 executor를 반환합니다."""
+    global _executor
+    if _executor is not None:
+        return _executor
+
+    kind, max_workers = get_executor_config()
+    if kind == "process":
+        from pipeline import init_worker
+
+        _executor = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=init_worker
+        )
+    else:
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="compute"
+        )
+
+    print(f"✅ compute executor 생성 ({kind}, workers={max_workers})", flush=True)
+    return _executor
+
+
+def uses_process_executor():
+    """연산 상태(추적/움직임 감지/OCR 풀 등)가 별도 워커 프로세스에 있는지 여부"""
+    return isinstance(get_compute_executor(), ProcessPoolExecutor)
+
+
+async def run_compute(fn, *args):
+    """이벤트 루프를 막지 않도록 블로킹 연산을 executor에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_compute_executor(), fn, *args)
+
+
+def shutdown_executor():
+    """executor를 종료합니다."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,45 @@
+import numpy as np
+
+from settings import get_setting
+
+
+class FrameBufferPool:
+    """
+    미리 할당한 프레임 버퍼를 돌려가며 재사용합니다. (frame.copy() 대신 np.copyto)
+
+    반환된 버퍼는 slots-1 번의 다음 호출 동안 유지되므로,
+    송출 큐(최신 1개) + 인코딩 중 1개 + 그리는 중 1개 보다 slots가 커야 합니다.
+    """
+
+    def __init__(self, slots=4):
+        self.slots = max(1, int(slots))
+        self._buffers = [None] * self.slots
+        self._index = 0
+        self.allocations = 0
+
+    def copy(self, frame):
+        """
+        frame 을 다음 버퍼에 복사해서 반환합니다.
+        크기/형식이 바뀐 경우에만 해당 슬롯을 새로 할당합니다.
+        """
+        buffer = self._buffers[self._index]
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = self._buffers[self._index] = np.empty_like(frame)
+            self.allocations += 1
+        np.copyto(buffer, frame)
+        self._index = (self._index + 1) % self.slots
+        return buffer
+
+
+# 스트림별 프레임 버퍼 풀 (같은 스트림의 프레임은 항상 순서대로 처리됨)
+frame_pools = {}
+
+
+def get_frame_pool(stream_id="default"):
+    """설정(frame_buffer_slots)에 따른 스트림별 프레임 버퍼 풀을 반환합니다."""
+    pool = frame_pools.get(stream_id)
+    if pool is None:
+        pool = frame_pools[stream_id] = FrameBufferPool(
+            get_setting("frame_buffer_slots", 4)
+        )
+    return pool
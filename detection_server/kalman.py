@@ -0,0 +1,81 @@
+import numpy as np
+
+# 상태: [cx, cy, w, h, vcx, vcy, vw, vh] (등속 모델, 1프레임 단위)
+_F = np.eye(8, dtype=np.float64)
+_F[:4, 4:] = np.eye(4)
+_H = np.eye(4, 8, dtype=np.float64)
+
+
+def _to_measurement(bbox):
+    x, y, w, h = [float(v) for v in bbox]
+    return np.array([x + w / 2, y + h / 2, w, h], dtype=np.float64)
+
+
+class KalmanBoxTracker:
+    """
+    감지 결과만으로 박스를 추적하는 칼만 예측기 (tracking-by-detection 모드).
+    OpenCV 추적기와 같은 init/update 인터페이스를 제공하고,
+    감지와 매칭되면 correct(), 매칭되지 않으면 mark_missed()를 호출합니다.
+
+    - max_misses: 연속으로 매칭되지 않은 감지 라운드 허용 횟수
+    - max_coast: 마지막 보정 후 예측만으로 이어갈 최대 프레임 수 (None이면 제한 없음).
+      감지 스케줄러가 감지를 미루는 동안에는 mark_missed()가 호출되지 않으므로 이 값으로 만료
+    """
+
+    def __init__(self, max_misses=3, max_coast=None):
+        self.max_misses = max_misses
+        self.max_coast = max_coast
+        self.misses = 0
+        self.coasted = 0  # 마지막 보정 후 예측만 한 프레임 수
+        self.x = np.zeros(8, dtype=np.float64)
+        self.P = np.eye(8, dtype=np.float64)
+        # 위치는 측정을 신뢰, 속도는 불확실하게 시작
+        self.P[4:, 4:] *= 1000.0
+        self.P *= 10.0
+        self.Q = np.eye(8, dtype=np.float64)
+        self.Q[4:, 4:] *= 0.01
+        self.R = np.eye(4, dtype=np.float64)
+
+    def init(self, frame, bbox):
+        self.x[:4] = _to_measurement(bbox)
+        self.x[4:] = 0.0
+        self.misses = 0
+        self.coasted = 0
+        return True
+
+    def bbox(self):
+        cx, cy, w, h = self.x[:4]
+        w, h = max(w, 1.0), max(h, 1.0)
+        return (int(cx - w / 2), int(cy - h / 2), int(w), int(h))
+
+    def update(self, frame):
+        """
+        다음 프레임의 박스를 예측합니다. (frame은 사용하지 않음)
+
+        :return: (추적 유지 여부, 예측 bbox)
+        """
+        self.x = _F @ self.x
+        self.P = _F @ self.P @ _F.T + self.Q
+        self.coasted += 1
+        return self.alive(), self.bbox()
+
+    def alive(self):
+        """감지 미매칭 횟수와 예측만 한 프레임 수가 허용 범위 안인지 여부"""
+        if self.max_coast and self.coasted > self.max_coast:
+            return False
+        return self.misses <= self.max_misses
+
+    def correct(self, bbox):
+        """매칭된 감지 박스로 상태를 보정합니다."""
+        z = _to_measurement(bbox)
+        y = z - _H @ self.x
+        S = _H @ self.P @ _H.T + self.R
+        K = self.P @ _H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(8) - K @ _H) @ self.P
+        self.misses = 0
+        self.coasted = 0
+
+    def mark_missed(self):
+        """감지 라운드에서 매칭되지 않았음을 기록합니다."""
+        self.misses += 1
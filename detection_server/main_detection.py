@@ -3,23 +3,40 @@ import os
 import cv2
 import asyncio
 import time
+import json
 import numpy as np
 import websockets
-import gc
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
 
-from ultralytics import YOLO
-from settings import load_settings_once, get_setting, get_model_path
-from state import state
-from detector import detect_objects, set_model
-from tracker import create_tracker, init_tracker, update_tracker
-from motion_detector import detect_motion
-from roi_checker import is_inside_roi, draw_roi, load_roi_settings
-from ocr import run_ocr_on_bbox
-from failure_manager import has_roi_timeout, exceeded_ocr_retries, reset_system
+# 저장소 루트 (shared 패키지 import 용)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import load_settings_once
+from roi_checker import load_roi_settings
+from executor import (
+    get_executor_config,
+    run_compute,
+    shutdown_executor,
+    uses_process_executor,
+)
+from pipeline import compute_snapshot, load_model, process_frame
+from ocr_pool import get_ocr_pool, shutdown_ocr_pool
+from streams import create_streams, get_transport_config
+from metrics import snapshot_all
+from events import encode_message
+from memory_debug import (
+    install_gc_monitor,
+    memory_snapshot,
+    start_tracemalloc,
+    stop_tracemalloc,
+)
+from shared.frame_transport import read_frame, socket_path
+from shared.shm_ring import FRAME_READY, ShmFrameReader
+from shared.jpeg_encoder import encode_snapshot
+from shared.broadcaster import TieredBroadcaster, parse_profile
 
 
 # === 전역 설정 및 모델 초기화 ===
@@ -31,269 +48,379 @@ def initialize_system():
     load_settings_once()
     ROI_BOX = load_roi_settings()
 
-    # YOLO 모델 초기화 (한 번만 수행)
-    model_path = get_model_path()
-    print(f"🔄 YOLO 모델 로드 중... (경로: {model_path})", flush=True)
-    model = YOLO(model_path)
-    print("✅ YOLO 모델 로드 완료", flush=True)
+    # 스레드 executor는 같은 프로세스의 모델을 공유하므로 여기서 한 번만 로드
+    # (프로세스 executor는 워커 초기화 시 각자 로드)
+    kind, _ = get_executor_config()
+    if kind == "thread":
+        return load_model()
+    return None
 
-    # detector 모듈에 모델 주입
-    set_model(model)
-
-    return model
-
-
-# 기존 코드는 그대로 유지하고, lifespan 함수 앞에 추가
-initialize_system()
 
 # === 전역 설정 ===
-VIDEO_WS_URL = "ws://127.0.0.1:8000/ws/video"
 ROI_BOX = load_roi_settings()
 templates = Jinja2Templates(directory="detection_server/templates")
-frame_queue = asyncio.Queue(maxsize=1)
-active_ws = set()
-active_pass_ws = set()
+
+# 스트림 id → StreamContext (첫 번째 스트림이 기본 엔드포인트 대상)
+streams = create_streams()
+default_stream = next(iter(streams.values()))
+
+
+def put_latest(queue, item, stage, on_drop=None):
+    """큐에 쌓인 오래된 항목을 버리고 최신 항목만 넣습니다."""
+    while not queue.empty():
+        try:
+            dropped = queue.get_nowait()
+            stage.drop()
+            if on_drop is not None:
+                on_drop(dropped)
+        except asyncio.QueueEmpty:
+            break
+    queue.put_nowait(item)
 
 
 # === WebSocket 프레임 수신 ===
-async def receive_frames_from_ws():
+async def receive_frames_from_ws(stream):
     while True:
         try:
-            print("🔌 WebSocket 연결 시도 중...")
-            async with websockets.connect(VIDEO_WS_URL, max_size=None) as ws:
-                print("✅ WebSocket 연결 성공 → ping 전송")
+            print(f"🔌 [{stream.id}] WebSocket 연결 시도 중...")
+            async with websockets.connect(stream.url, max_size=None) as ws:
+                print(f"✅ [{stream.id}] WebSocket 연결 성공 → ping 전송")
                 await ws.send("ping")
                 while True:
                     data = await ws.recv()
                     if isinstance(data, bytes):
-                        frame = cv2.imdecode(
-                            np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR
-                        )
+                        with stream.ingest_stage.time():
+                            frame = cv2.imdecode(
+                                np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR
+                            )
                         if frame is not None:
-                            while not frame_queue.empty():
-                                try:
-                                    frame_queue.get_nowait()
-                                except asyncio.QueueEmpty:
-                                    break
-                            await frame_queue.put(frame)
+                            # 원본 영상의 기본 단계는 수신한 JPEG를 그대로 전달 (재인코딩 없음)
+                            if stream.active_pass_ws:
+                                await stream.active_pass_ws.publish_frame(
+                                    frame, encoded=data
+                                )
+                            put_latest(stream.frame_queue, frame, stream.compute_stage)
                     await asyncio.sleep(0.001)
         except Exception as e:
-            print(f"💥 WebSocket 연결 오류: {e}")
+            print(f"💥 [{stream.id}] WebSocket 연결 오류: {e}")
             await asyncio.sleep(1)
 
 
-# === 프레임 처리 및 송출 ===
-async def process_and_broadcast_frames():
-    frame_counter = 0
+# === Unix 소켓 원시 프레임 수신 (같은 호스트의 video_server) ===
+async def receive_frames_from_unix(stream, socket_dir):
+    path = socket_path(socket_dir, stream.camera_id)
+    while True:
+        writer = None
+        try:
+            print(f"🔌 [{stream.id}] Unix 소켓 연결 시도 중... ({path})")
+            reader, writer = await asyncio.open_unix_connection(path)
+            print(f"✅ [{stream.id}] Unix 소켓 연결 성공")
+            while True:
+                with stream.ingest_stage.time():
+                    _, _, frame = await read_frame(reader)
+                put_latest(stream.frame_queue, frame, stream.compute_stage)
+
+                # 원시 프레임 전송에는 JPEG가 없으므로 원본 구독자가 있을 때만 인코딩
+                if stream.active_pass_ws:
+                    await stream.active_pass_ws.publish_frame(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"💥 [{stream.id}] Unix 소켓 연결 오류: {e}")
+            await asyncio.sleep(1)
+        finally:
+            if writer is not None:
+                writer.close()
+
 
+# === 공유 메모리 프레임 수신 (같은 호스트의 video_server) ===
+async def receive_frames_from_shm(stream, socket_dir):
+    path = socket_path(socket_dir, stream.camera_id)
     while True:
-        buffer_annotated = None
-        buffer_original = None
-        data_annotated = None
-        data_original = None
+        writer = None
+        shm_reader = None
+        try:
+            print(f"🔌 [{stream.id}] 공유 메모리 제어 채널 연결 시도 중... ({path})")
+            reader, writer = await asyncio.open_unix_connection(path)
+            shm_reader = ShmFrameReader(stream.camera_id, writer)
+            stream.release_frame = shm_reader.release
+            print(f"✅ [{stream.id}] 공유 메모리 제어 채널 연결 성공")
+            while True:
+                message = await reader.readexactly(FRAME_READY.size)
+                with stream.ingest_stage.time():
+                    _, _, frame = shm_reader.view(message)
+
+                # 원본 구독자가 있을 때만 인코딩 (슬롯을 돌려주기 전에 수행)
+                if stream.active_pass_ws:
+                    await stream.active_pass_ws.publish_frame(frame)
+
+                # 처리되지 못하고 버려진 프레임의 슬롯은 바로 돌려줌
+                put_latest(
+                    stream.frame_queue,
+                    frame,
+                    stream.compute_stage,
+                    on_drop=shm_reader.release,
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"💥 [{stream.id}] 공유 메모리 수신 오류: {e}")
+            await asyncio.sleep(1)
+        finally:
+            stream.release_frame = None
+            if shm_reader is not None:
+                shm_reader.close()
+            if writer is not None:
+                writer.close()
+
 
+# === 프레임 처리 (compute executor) ===
+async def process_frames(stream):
+    while True:
         try:
-            frame = await frame_queue.get()
-            while not frame_queue.empty():
-                try:
-                    frame = frame_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
-
-            annotated_frame = frame.copy()
-            annotated_frame = draw_roi(annotated_frame)
-
-            if state["mode"] == "idle":
-                if detect_motion(annotated_frame):
-                    cv2.putText(
-                        annotated_frame,
-                        "Motion On",
-                        (10, 120),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.2,
-                        (0, 255, 0),
-                        2,
-                    )
-                    bbox = detect_objects(annotated_frame)
-                    if bbox:
-                        tracker = create_tracker()
-                        if init_tracker(tracker, annotated_frame, bbox):
-                            state.update(
-                                {
-                                    "mode": "tracking",
-                                    "tracker": tracker,
-                                    "bbox": bbox,
-                                    "start_time": time.time(),
-                                    "roi_enter_time": None,
-                                    "ocr_attempts": 0,
-                                    "ocr_done": False,
-                                    "ocr_result": None,
-                                    "failure_message": None,
-                                }
-                            )
-                    else:
-                        print("❌ 객체 감지 실패", flush=True)
-                        state["failure_message"] = "객체 감지 실패"
-                        reset_system()
-                else:
-                    cv2.putText(
-                        annotated_frame,
-                        "Motion Off",
-                        (10, 120),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.2,
-                        (0, 0, 255),
-                        2,
+            frame = await stream.frame_queue.get()
+
+            # 감지/추적/OCR 은 executor에서 실행 → 수신/송출 루프는 계속 동작
+            # 오버레이 프레임은 분석 영상 구독자가 있을 때만 그림
+            release_frame = stream.release_frame
+            annotate = bool(stream.active_ws)
+            try:
+                with stream.compute_stage.time():
+                    annotated_frame, overlay, events = await run_compute(
+                        process_frame, stream.id, frame, annotate
                     )
+            finally:
+                # 공유 메모리 프레임이면 슬롯을 video_server에 돌려줌
+                if release_frame is not None:
+                    release_frame(frame)
+
+            # 이벤트는 최신 프레임 우선 정책으로 버려지지 않도록 송출 큐를 거치지 않음
+            publish_events(stream, overlay, events)
+            put_latest(
+                stream.result_queue, (annotated_frame, overlay), stream.broadcast_stage
+            )
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"💥 [{stream.id}] 프레임 처리 예외: {e}")
+            await asyncio.sleep(0.5)
 
-            elif state["mode"] == "tracking":
-                tracker = state["tracker"]
-                success, bbox = update_tracker(tracker, annotated_frame)
-                if success:
-                    state["bbox"] = bbox
-                    x, y, w, h = [int(v) for v in bbox]
-                    cv2.rectangle(
-                        annotated_frame, (x, y), (x + w, y + h), (0, 0, 255), 2
-                    )
 
-                    if is_inside_roi(bbox) and not state["ocr_done"]:
-                        state["roi_enter_time"] = state["roi_enter_time"] or time.time()
-                        ocr_result = run_ocr_on_bbox(annotated_frame, bbox)
-                        state["ocr_attempts"] += 1
-                        if ocr_result:
-                            state["ocr_result"] = ocr_result
-                            state["ocr_done"] = True
-                            print(f"✅ OCR 성공: {ocr_result}")
-                        elif exceeded_ocr_retries():
-                            print("❌ OCR 최대 시도 실패")
-                            state["failure_message"] = "OCR 실패"
-                            reset_system()
-                    elif has_roi_timeout():
-                        print("⌛ ROI 진입 실패")
-                        state["failure_message"] = "ROI 진입 실패"
-                        reset_system()
-                else:
-                    print("❌ 추적 실패")
-                    state["failure_message"] = "추적 실패"
-                    reset_system()
-
-                if state["ocr_result"]:
-                    cv2.putText(
-                        annotated_frame,
-                        f"OCR: {state['ocr_result']}",
-                        (10, 40),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.2,
-                        (0, 255, 0),
-                        2,
-                    )
-                elif state["failure_message"]:
-                    cv2.putText(
-                        annotated_frame,
-                        state["failure_message"],
-                        (10, 40),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.2,
-                        (0, 0, 255),
-                        2,
-                    )
+def publish_events(stream, overlay, events):
+    """
+    프레임 요약(모드, 객체 수, 추적 박스)과 이번 프레임 이벤트를 /ws/events 구독자에게 보냅니다.
+    events.frames=false 이면 이벤트가 있는 프레임만 보냅니다.
+    """
+    if not stream.events_ws or not (events or stream.events_every_frame):
+        return
+    message = {
+        "stream": stream.id,
+        "ts": round(time.time(), 3),
+        "mode": overlay["mode"],
+        "count": len(overlay["tracks"]),
+        "tracks": overlay["tracks"],
+        "events": events,
+    }
+    stream.events_ws.publish(encode_message(message, stream.events_format))
+
+
+# === 프레임 인코딩 및 송출 ===
+async def broadcast_frames(stream):
+    while True:
+        try:
+            annotated_frame, overlay = await stream.result_queue.get()
+            start = time.perf_counter()
 
-            # 분석 프레임 인코딩 및 전송
-            if active_ws:
-                success, buffer_annotated = cv2.imencode(".jpg", annotated_frame)
-                if success:
-                    data_annotated = buffer_annotated.tobytes()
-                else:
-                    buffer_annotated = None
-
-                if data_annotated:
-                    for ws in list(active_ws):
-                        try:
-                            await ws.send_bytes(data_annotated)
-                        except:
-                            await ws.close()
-                            active_ws.discard(ws)
-
-            # 원본 프레임 인코딩 및 전송
-            if active_pass_ws:
-                success, buffer_original = cv2.imencode(".jpg", frame)
-                if success:
-                    data_original = buffer_original.tobytes()
-                else:
-                    buffer_original = None
-
-                if data_original:
-                    for ws in list(active_pass_ws):
-                        try:
-                            await ws.send_bytes(data_original)
-                        except:
-                            await ws.close()
-                            active_pass_ws.discard(ws)
-
-            # 메모리 정리
-            frame_counter += 1
-            if frame_counter % 100 == 0:
-                del buffer_annotated, buffer_original
-                del data_annotated, data_original
-                del annotated_frame, frame
-                gc.collect()
-
-            await asyncio.sleep(0.03)
+            # 분석 프레임 인코딩 후 클라이언트별 큐에 전달 (송신은 클라이언트별 태스크)
+            if annotated_frame is not None and stream.active_ws:
+                await stream.active_ws.publish_frame(annotated_frame)
 
+            # 오버레이 정보만 받는 클라이언트 (인코딩 없음)
+            if stream.overlay_ws:
+                overlay["ts"] = time.time()
+                stream.overlay_ws.publish(json.dumps(overlay))
+
+            stream.broadcast_stage.observe(time.perf_counter() - start)
+
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"💥 프레임 처리 예외: {e}")
+            print(f"💥 [{stream.id}] 프레임 송출 예외: {e}")
             await asyncio.sleep(0.5)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    t1 = asyncio.create_task(receive_frames_from_ws())
-    t2 = asyncio.create_task(process_and_broadcast_frames())
+    # 모델/OCR 풀은 시작 시 한 번만 초기화
+    # (spawn 방식 워커가 이 모듈을 다시 import 해도 모델을 로드하지 않도록 lifespan에서 수행)
+    initialize_system()
+    # 프로세스 executor는 워커 프로세스가 OCR 풀을 만들어 사용하므로 메인 프로세스에는 만들지 않음
+    # (만들면 쓰지 않는 OCR 프로세스 풀이 OCR 모델을 한 번 더 로드함)
+    if not uses_process_executor():
+        get_ocr_pool()
+    install_gc_monitor()
+
+    transport, socket_dir = get_transport_config()
+    tasks = []
+    for stream in streams.values():
+        if transport == "shm":
+            receiver = receive_frames_from_shm(stream, socket_dir)
+        elif transport == "unix":
+            receiver = receive_frames_from_unix(stream, socket_dir)
+        else:
+            receiver = receive_frames_from_ws(stream)
+        tasks += [
+            asyncio.create_task(receiver),
+            asyncio.create_task(process_frames(stream)),
+            asyncio.create_task(broadcast_frames(stream)),
+        ]
+    print(
+        f"📡 감지 스트림 {len(streams)}개 시작 ({transport}): {list(streams)}",
+        flush=True,
+    )
     yield
-    t1.cancel()
-    t2.cancel()
-    try:
-        await t1
-    except asyncio.CancelledError:
-        pass
-    try:
-        await t2
-    except asyncio.CancelledError:
-        pass
-    print("🛑 수신/송출 태스크 종료", flush=True)
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    shutdown_executor()
+    shutdown_ocr_pool()
+    print("🛑 수신/연산/송출 태스크 종료", flush=True)
 
 
 app = FastAPI(lifespan=lifespan)
 
 
-@app.websocket("/ws/annotated")
-async def ws_annotated(websocket: WebSocket):
+async def serve_client(websocket, clients, label):
+    """
+    클라이언트를 송출 대상에 등록하고 연결이 끊길 때까지 ping을 수신합니다.
+    영상 엔드포인트는 ?tier=thumbnail 처럼 단계를 고르거나, ping 대신
+    {"max_fps": 10, "max_width": 320, "quality": 60} 같은 프로필을 보내 송출 방식을 바꿀 수 있습니다.
+    """
     await websocket.accept()
-    active_ws.add(websocket)
-    print(f"🧠 분석 WebSocket 연결됨 ({len(active_ws)}명)", flush=True)
+    tiered = isinstance(clients, TieredBroadcaster)
+    if tiered:
+        clients.add(websocket, websocket.query_params.get("tier"))
+    else:
+        clients.add(websocket)
+    print(f"🧠 {label} WebSocket 연결됨 ({len(clients)}명)", flush=True)
     try:
         while True:
-            await websocket.receive_text()
+            message = await websocket.receive_text()
+            profile = parse_profile(message) if tiered else None
+            if profile is not None:
+                clients.add(websocket, profile)
+                print(f"🎚️ {label} 송출 프로필 변경: {profile}", flush=True)
     except WebSocketDisconnect:
         pass
+    except Exception as e:
+        # 느린 클라이언트로 판단되어 서버가 연결을 끊은 경우 등
+        print(f"🔴 {label} WebSocket 수신 종료: {e}", flush=True)
     finally:
-        active_ws.discard(websocket)
-        print(f"🔴 분석 WebSocket 해제됨 ({len(active_ws)}명)", flush=True)
+        clients.remove(websocket)
+        print(f"🔴 {label} WebSocket 해제됨 ({len(clients)}명)", flush=True)
+
+
+@app.websocket("/ws/annotated")
+async def ws_annotated(websocket: WebSocket):
+    await serve_client(websocket, default_stream.active_ws, "분석")
+
+
+@app.websocket("/ws/annotated/{stream_id}")
+async def ws_annotated_stream(websocket: WebSocket, stream_id: str):
+    stream = streams.get(stream_id)
+    if stream is None:
+        await websocket.close(code=1008)
+        return
+    await serve_client(websocket, stream.active_ws, f"[{stream_id}] 분석")
 
 
 @app.websocket("/ws/pass_through")
 async def ws_pass_through(websocket: WebSocket):
-    await websocket.accept()
-    active_pass_ws.add(websocket)
-    print(f"🧪 pass_through WebSocket 연결됨 ({len(active_pass_ws)}명)")
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        pass
-    finally:
-        active_pass_ws.discard(websocket)
-        print(f"🔴 pass_through WebSocket 해제됨 ({len(active_pass_ws)}명)")
+    await serve_client(websocket, default_stream.active_pass_ws, "pass_through")
+
+
+@app.websocket("/ws/pass_through/{stream_id}")
+async def ws_pass_through_stream(websocket: WebSocket, stream_id: str):
+    stream = streams.get(stream_id)
+    if stream is None:
+        await websocket.close(code=1008)
+        return
+    await serve_client(websocket, stream.active_pass_ws, f"[{stream_id}] pass_through")
+
+
+@app.websocket("/ws/overlay")
+async def ws_overlay(websocket: WebSocket):
+    await serve_client(websocket, default_stream.overlay_ws, "overlay")
+
+
+@app.websocket("/ws/overlay/{stream_id}")
+async def ws_overlay_stream(websocket: WebSocket, stream_id: str):
+    stream = streams.get(stream_id)
+    if stream is None:
+        await websocket.close(code=1008)
+        return
+    await serve_client(websocket, stream.overlay_ws, f"[{stream_id}] overlay")
+
+
+@app.websocket("/ws/events")
+async def ws_events(websocket: WebSocket):
+    await serve_client(websocket, default_stream.events_ws, "events")
+
+
+@app.websocket("/ws/events/{stream_id}")
+async def ws_events_stream(websocket: WebSocket, stream_id: str):
+    stream = streams.get(stream_id)
+    if stream is None:
+        await websocket.close(code=1008)
+        return
+    await serve_client(websocket, stream.events_ws, f"[{stream_id}] events")
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    단계별 큐 깊이와 지연 시간, 배치/움직임 감지/감지 스케줄/OCR 크롭 품질/추적 통계, 클라이언트별 송출 통계
+    (process executor 에서는 연산 상태 통계를 워커 프로세스에서 받아옴 → 처리 중인 프레임 뒤에 실행)
+    """
+    if uses_process_executor():
+        compute = await run_compute(compute_snapshot)
+    else:
+        compute = compute_snapshot()
+    return {
+        "stages": snapshot_all(),
+        **compute,
+        "encoding": encode_snapshot(),
+        "clients": {
+            stream.id: {
+                "annotated": stream.active_ws.stats(),
+                "pass_through": stream.active_pass_ws.stats(),
+                "overlay": stream.overlay_ws.stats(),
+                "events": stream.events_ws.stats(),
+            }
+            for stream in streams.values()
+        },
+    }
+
+
+@app.get("/debug/memory")
+async def debug_memory(top: int = 10):
+    """GC 세대별 카운트/일시 정지 시간, tracemalloc 상위 할당 위치 (누수 추적용)"""
+    return memory_snapshot(top)
+
+
+@app.post("/debug/tracemalloc")
+async def debug_tracemalloc(enabled: bool = True, frames: int = 1):
+    """할당 추적을 켜거나 끕니다. (켜져 있는 동안 할당 오버헤드 발생)"""
+    if enabled:
+        start_tracemalloc(frames)
+    else:
+        stop_tracemalloc()
+    return {"tracing": enabled}
 
 
 @app.get("/")
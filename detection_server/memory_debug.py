@@ -0,0 +1,156 @@
+import gc
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from settings import get_setting
+
+
+class GcMonitor:
+    """gc.callbacks 로 세대별 수거 횟수와 일시 정지(pause) 시간을 기록합니다."""
+
+    def __init__(self, history=200):
+        self.collections = [0, 0, 0]
+        self.collected = [0, 0, 0]
+        self.total_ms = [0.0, 0.0, 0.0]
+        self.max_ms = [0.0, 0.0, 0.0]
+        self.recent = deque(maxlen=history)  # (세대, ms)
+        self._start = None
+        # stats() 안에서의 할당이 GC(콜백)를 일으킬 수 있으므로 재진입 가능한 잠금 사용
+        self._lock = threading.RLock()
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        if self._start is None:
+            return
+        ms = (time.perf_counter() - self._start) * 1000.0
+        self._start = None
+        generation = info["generation"]
+        with self._lock:
+            self.collections[generation] += 1
+            self.collected[generation] += info.get("collected", 0)
+            self.total_ms[generation] += ms
+            self.max_ms[generation] = max(self.max_ms[generation], ms)
+            self.recent.append((generation, ms))
+
+    def stats(self):
+        with self._lock:
+            generations = [
+                {
+                    "generation": gen,
+                    "collections": self.collections[gen],
+                    "collected": self.collected[gen],
+                    "total_ms": round(self.total_ms[gen], 2),
+                    "max_ms": round(self.max_ms[gen], 2),
+                }
+                for gen in range(3)
+            ]
+            recent = [ms for _, ms in self.recent]
+        return {
+            "generations": generations,
+            "recent_p95_ms": (
+                round(float(np.percentile(recent, 95)), 3) if recent else None
+            ),
+        }
+
+
+# 전역 GC 모니터 (install_gc_monitor 호출 시 등록)
+gc_monitor = None
+
+# 증가량 비교용 직전 tracemalloc 스냅샷
+_last_snapshot = None
+
+
+def install_gc_monitor():
+    """GC 일시 정지 시간 기록을 시작하고, 설정(debug.tracemalloc)에 따라 tracemalloc을 켭니다."""
+    global gc_monitor
+    if gc_monitor is None:
+        gc_monitor = GcMonitor()
+        gc.callbacks.append(gc_monitor)
+
+    config = get_setting("debug", {}) or {}
+    if config.get("tracemalloc", False):
+        start_tracemalloc(config.get("tracemalloc_frames", 1))
+    return gc_monitor
+
+
+def uninstall_gc_monitor():
+    global gc_monitor
+    if gc_monitor is not None and gc_monitor in gc.callbacks:
+        gc.callbacks.remove(gc_monitor)
+    gc_monitor = None
+
+
+def start_tracemalloc(frames=1):
+    """할당 추적을 시작합니다. (추적 중에는 할당마다 오버헤드가 있으므로 진단 시에만 사용)"""
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        _last_snapshot = None
+        print(f"🔍 tracemalloc 시작 (frames={frames})", flush=True)
+
+
+def stop_tracemalloc():
+    global _last_snapshot
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        print("🔍 tracemalloc 중지", flush=True)
+    _last_snapshot = None
+
+
+def _format_stats(stats, limit):
+    return [
+        {
+            "location": str(stat.traceback[0]) if stat.traceback else "?",
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(getattr(stat, "size_diff", 0) / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def memory_snapshot(top=10):
+    """
+    GC/메모리 진단 정보 (/debug/memory 노출용)
+
+    :param top: tracemalloc 상위 할당 위치 개수
+    :return: gc 세대별 카운트/임계값/일시 정지 시간, tracemalloc 상위 할당 위치와 직전 조회 대비 증가량
+    """
+    global _last_snapshot
+    result = {
+        "gc": {
+            "enabled": gc.isenabled(),
+            "counts": gc.get_count(),
+            "thresholds": gc.get_threshold(),
+            "stats": gc.get_stats(),
+            "pauses": gc_monitor.stats() if gc_monitor is not None else None,
+        },
+        "tracemalloc": {"tracing": tracemalloc.is_tracing()},
+    }
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        result["tracemalloc"].update(
+            {
+                "current_kb": round(current / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top": _format_stats(snapshot.statistics("lineno"), top),
+                # 조회 사이에 계속 늘어나는 위치가 누수 후보
+                "growth": (
+                    _format_stats(snapshot.compare_to(_last_snapshot, "lineno"), top)
+                    if _last_snapshot is not None
+                    else None
+                ),
+            }
+        )
+        _last_snapshot = snapshot
+    return result
@@ -0,0 +1,76 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# 단계 이름 → StageMetrics
+_stages = {}
+_lock = threading.Lock()
+
+
+class StageMetrics:
+    """
+    파이프라인 한 단계의 처리 건수, 지연 시간, 입력 큐 깊이를 기록합니다.
+    executor 스레드와 이벤트 루프 양쪽에서 호출되므로 내부 잠금을 사용합니다.
+    """
+
+    def __init__(self, name, queue=None):
+        self.name = name
+        self.queue = queue
+        self.count = 0
+        self.dropped = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_sec):
+        """처리 1건의 소요 시간(초)을 기록합니다."""
+        ms = elapsed_sec * 1000.0
+        with self._lock:
+            self.count += 1
+            self.last_ms = ms
+            # 지수 이동 평균 (최근 값에 가중치)
+            self.avg_ms = ms if self.count == 1 else self.avg_ms * 0.9 + ms * 0.1
+            self.max_ms = max(self.max_ms, ms)
+
+    def drop(self, n=1):
+        """최신 프레임 우선 정책으로 버려진 항목 수를 기록합니다."""
+        with self._lock:
+            self.dropped += n
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "dropped": self.dropped,
+                "queue_depth": self.queue.qsize() if self.queue is not None else None,
+                "last_ms": round(self.last_ms, 2),
+                "avg_ms": round(self.avg_ms, 2),
+                "max_ms": round(self.max_ms, 2),
+            }
+
+
+def get_stage(name, queue=None):
+    """이름으로 단계 메트릭을 가져오거나 새로 생성합니다."""
+    with _lock:
+        stage = _stages.get(name)
+        if stage is None:
+            stage = _stages[name] = StageMetrics(name, queue)
+        elif queue is not None:
+            stage.queue = queue
+        return stage
+
+
+def snapshot_all():
+    """모든 단계의 메트릭을 dict로 반환합니다."""
+    with _lock:
+        stages = list(_stages.values())
+    return {stage.name: stage.snapshot() for stage in stages}
@@ -1,31 +1,292 @@
 import cv2
+import numpy as np
 
-# 이전 프레임 저장용 (초기에는 None)
-prev_frame = None
+from settings import get_setting
+from roi_checker import ROI_BOX
 
+# 스트림별 움직임 감지기 (stream_id → MotionDetector)
+motion_detectors = {}
 
-def detect_motion(frame, threshold=25, area_threshold=5000):
+# 움직임 감지 방식
+MOTION_METHODS = ("running_average", "mog2", "knn")
+
+
+class MotionDetector:
     """
-    현재 프레임과 이전 프레임을 비교하여 움직임을 감지합니다.
+    ROI 주변 영역만 잘라 축소한 그레이 영상을 running average 배경과 비교해 움직임을 감지합니다.
+    (전체 해상도 blur/absdiff 대신 작은 영상에서 계산 → idle 모드 비용 감소)
 
-    :param frame: 현재 프레임 (BGR 이미지)
-    :param threshold: 픽셀 차이 임계값
-    :param area_threshold: 움직임으로 판단할 최소 영역 크기
-    :return: 움직임 감지 여부 (True/False)
+    - roi_margin: ROI 주변으로 감시 영역을 넓히는 비율 (ROI 크기 기준, 다가오는 객체 감지용)
+    - stride: 축소 전에 행/열을 건너뛰는 간격 (1이면 사용 안 함)
+    - scale: 감시 영역 축소 비율
+    - alpha: 배경 갱신 가중치 (cv2.accumulateWeighted)
+    - method: "running_average" 또는 배경 차분기 "mog2"/"knn" (learning_rate: -1이면 자동)
+    - min_blob_area/max_blob_area: 연결 요소 하나의 면적 범위 (원본 해상도 기준 픽셀 수).
+      설정하면 이 범위의 덩어리가 있을 때만 움직임으로 판단 → 조명 깜빡임 등으로 인한
+      불필요한 YOLO 호출을 줄임
+    - warmup_frames: 배경 모델을 새로 만들거나 reset 한 뒤 학습만 하고 움직임 없음으로 처리할 프레임 수.
+      None 이면 mog2/knn 은 min(history, 10), running_average 는 0 (첫 프레임은 항상 학습만)
     """
-    global prev_frame
 
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    gray = cv2.GaussianBlur(gray, (5, 5), 0)
+    def __init__(
+        self,
+        roi=None,
+        roi_margin=0.5,
+        scale=0.25,
+        stride=1,
+        alpha=0.05,
+        threshold=25,
+        area_threshold=5000,
+        method="running_average",
+        learning_rate=-1,
+        history=500,
+        min_blob_area=None,
+        max_blob_area=None,
+        warmup_frames=None,
+    ):
+        if method not in MOTION_METHODS:
+            raise ValueError(
+                f"지원하지 않는 움직임 감지 방식: {method} (사용 가능: {MOTION_METHODS})"
+            )
+        self.roi = roi
+        self.roi_margin = roi_margin
+        self.scale = scale
+        self.stride = max(1, int(stride))
+        self.alpha = alpha
+        self.threshold = threshold
+        self.area_threshold = area_threshold  # 원본 해상도 기준 픽셀 수
+        self.method = method
+        self.learning_rate = learning_rate
+        self.history = history
+        self.min_blob_area = min_blob_area
+        self.max_blob_area = max_blob_area
+        if warmup_frames is None:
+            warmup_frames = 0 if method == "running_average" else min(history, 10)
+        self.warmup_frames = max(0, int(warmup_frames))
+
+        self.last_ratio = 0.0  # 마지막 프레임에서 움직인 픽셀 비율 (0~1)
+        self.last_region = (
+            None  # 마지막으로 움직임이 감지된 영역 (원본 좌표 x, y, w, h)
+        )
+        self.frames = 0
+        self.triggered = 0
+        # 면적은 넘었지만 덩어리 크기 조건 또는 배경 학습(warm-up) 중이라 걸러진 프레임 수
+        self.yolo_avoided = 0
+        self._warmup_left = self.warmup_frames
+        self._subtractor = None
+        self._origin = (0, 0)
+        self._factor = (1.0, 1.0)
+        self._area_scale = 1.0
+        self._min_blob_pixels = None
+        self._max_blob_pixels = None
+        self._frame_shape = None
+        self._region = None
+        self._size = None
+        self._min_pixels = 0
+        self._small = None
+        self._gray = None
+        self._background = None
+        self._diff = None
+        self._mask = None
+
+    def _prepare(self, frame_shape):
+        """프레임 크기에 맞춰 감시 영역과 버퍼를 미리 계산/할당합니다."""
+        frame_h, frame_w = frame_shape[:2]
+        if self.roi is not None:
+            x, y, w, h = self.roi
+            mx, my = int(w * self.roi_margin), int(h * self.roi_margin)
+            x0, y0 = max(0, x - mx), max(0, y - my)
+            x1, y1 = min(frame_w, x + w + mx), min(frame_h, y + h + my)
+            if x1 <= x0 or y1 <= y0:
+                x0, y0, x1, y1 = 0, 0, frame_w, frame_h  # ROI가 프레임 밖이면 전체 사용
+        else:
+            x0, y0, x1, y1 = 0, 0, frame_w, frame_h
+
+        strided_w = len(range(x0, x1, self.stride))
+        strided_h = len(range(y0, y1, self.stride))
+        small_w = max(8, int(strided_w * self.scale))
+        small_h = max(8, int(strided_h * self.scale))
+
+        self._frame_shape = frame_shape
+        self._origin = (x0, y0)
+        self._factor = ((x1 - x0) / small_w, (y1 - y0) / small_h)
+        self._region = (slice(y0, y1, self.stride), slice(x0, x1, self.stride))
+        self._size = (small_w, small_h)
+        # 원본 해상도 기준 면적 임계값을 축소 영상 픽셀 수로 환산
+        self._area_scale = (small_w * small_h) / ((x1 - x0) * (y1 - y0))
+        self._min_pixels = self.area_threshold * self._area_scale
+        self._min_blob_pixels = (
+            self.min_blob_area * self._area_scale if self.min_blob_area else None
+        )
+        self._max_blob_pixels = (
+            self.max_blob_area * self._area_scale if self.max_blob_area else None
+        )
+        self._small = np.empty((small_h, small_w, 3), dtype=np.uint8)
+        self._gray = np.empty((small_h, small_w), dtype=np.uint8)
+        self._diff = np.empty((small_h, small_w), dtype=np.uint8)
+        self._mask = np.empty((small_h, small_w), dtype=np.uint8)
+        self._background = None
+        self._subtractor = None
+        self._warmup_left = self.warmup_frames
+
+    def detect(self, frame):
+        """
+        프레임에서 움직임을 감지합니다.
+
+        :param frame: 현재 프레임 (BGR 이미지)
+        :return: 움직임 감지 여부 (True/False)
+        """
+        if frame.shape != self._frame_shape:
+            self._prepare(frame.shape)
+
+        region = frame[self._region]
+        cv2.resize(region, self._size, dst=self._small, interpolation=cv2.INTER_AREA)
+        self.frames += 1
+        # 새 배경 모델은 처음 몇 프레임 동안 정지 장면도 전경으로 판단하므로 학습만 진행
+        warming = self._warmup_left > 0
+        if warming:
+            self._warmup_left -= 1
+
+        if self.method == "running_average":
+            if not self._update_running_average():
+                return False
+        else:
+            self._update_subtractor()
+
+        motion_pixels = cv2.countNonZero(self._mask)
+        self.last_ratio = motion_pixels / self._mask.size
+        if motion_pixels <= self._min_pixels:
+            return False
+
+        if warming:
+            self.yolo_avoided += 1
+            return False
+
+        if not self._has_plausible_blob():
+            self.yolo_avoided += 1
+            return False
 
-    if prev_frame is None:
-        prev_frame = gray
-        return False
+        self.triggered += 1
+        self.last_region = self._mask_region()
+        return True
 
-    diff = cv2.absdiff(prev_frame, gray)
-    _, thresh = cv2.threshold(diff, threshold, 255, cv2.THRESH_BINARY)
-    motion_area = cv2.countNonZero(thresh)
+    def _mask_region(self):
+        """움직인 픽셀을 감싸는 영역을 원본 프레임 좌표로 변환합니다."""
+        x, y, w, h = cv2.boundingRect(self._mask)
+        fx, fy = self._factor
+        ox, oy = self._origin
+        return (
+            ox + int(x * fx),
+            oy + int(y * fy),
+            int(np.ceil(w * fx)),
+            int(np.ceil(h * fy)),
+        )
+
+    def _update_running_average(self):
+        """running average 배경과의 차이를 이진화합니다. (첫 프레임은 배경 학습만)"""
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self._background is None:
+            self._background = self._gray.astype(np.float32)
+            self.last_ratio = 0.0
+            return False
+
+        cv2.absdiff(self._gray, cv2.convertScaleAbs(self._background), dst=self._diff)
+        cv2.threshold(
+            self._diff, self.threshold, 255, cv2.THRESH_BINARY, dst=self._mask
+        )
+        cv2.accumulateWeighted(self._gray, self._background, self.alpha)
+        return True
+
+    def _update_subtractor(self):
+        """MOG2/KNN 배경 차분기로 전경 마스크를 구합니다. (그림자 픽셀은 제외)"""
+        if self._subtractor is None:
+            if self.method == "mog2":
+                self._subtractor = cv2.createBackgroundSubtractorMOG2(
+                    history=self.history, detectShadows=True
+                )
+            else:
+                self._subtractor = cv2.createBackgroundSubtractorKNN(
+                    history=self.history, detectShadows=True
+                )
+        self._subtractor.apply(self._small, self._diff, self.learning_rate)
+        # 그림자(127)는 버리고 전경(255)만 남김
+        cv2.threshold(self._diff, 200, 255, cv2.THRESH_BINARY, dst=self._mask)
+
+    def _has_plausible_blob(self):
+        """부품 크기에 해당하는 연결 요소가 있는지 확인합니다. (조건 미설정 시 항상 True)"""
+        if self._min_blob_pixels is None and self._max_blob_pixels is None:
+            return True
+        count, _, stats, _ = cv2.connectedComponentsWithStats(
+            self._mask, connectivity=8
+        )
+        areas = stats[1:count, cv2.CC_STAT_AREA]  # 0번은 배경
+        plausible = np.ones(len(areas), dtype=bool)
+        if self._min_blob_pixels is not None:
+            plausible &= areas >= self._min_blob_pixels
+        if self._max_blob_pixels is not None:
+            plausible &= areas <= self._max_blob_pixels
+        return bool(plausible.any())
+
+    def stats(self):
+        return {
+            "method": self.method,
+            "frames": self.frames,
+            "triggered": self.triggered,
+            "yolo_avoided": self.yolo_avoided,
+            "last_ratio": round(self.last_ratio, 4),
+        }
+
+    def reset(self):
+        """배경 모델을 초기화합니다. (다음 프레임부터 다시 학습)"""
+        self._background = None
+        self._subtractor = None
+        self._warmup_left = self.warmup_frames
+        self.last_ratio = 0.0
+        self.last_region = None
+
+
+def get_motion_detector(stream_id):
+    """스트림의 MotionDetector를 반환합니다. (없으면 설정값으로 생성)"""
+    detector = motion_detectors.get(stream_id)
+    if detector is None:
+        config = get_setting("motion", {}) or {}
+        detector = motion_detectors[stream_id] = MotionDetector(
+            roi=ROI_BOX if config.get("use_roi", True) else None,
+            roi_margin=config.get("roi_margin", 0.5),
+            scale=config.get("scale", 0.25),
+            stride=config.get("stride", 1),
+            alpha=config.get("alpha", 0.05),
+            threshold=config.get("threshold", 25),
+            area_threshold=config.get("area_threshold", 5000),
+            method=config.get("method", "running_average"),
+            learning_rate=config.get("learning_rate", -1),
+            history=config.get("history", 500),
+            min_blob_area=config.get("min_blob_area"),
+            max_blob_area=config.get("max_blob_area"),
+            warmup_frames=config.get("warmup_frames"),
+        )
+    return detector
+
+
+def detect_motion(frame, threshold=None, area_threshold=None, stream_id="default"):
+    """
+    현재 프레임과 배경 모델을 비교하여 움직임을 감지합니다.
+
+    :param frame: 현재 프레임 (BGR 이미지)
+    :param threshold: 픽셀 차이 임계값 (None이면 설정값)
+    :param area_threshold: 움직임으로 판단할 최소 영역 크기 (원본 해상도 기준, None이면 설정값)
+    :param stream_id: 스트림 id (스트림마다 배경 모델을 따로 보관)
+    :return: 움직임 감지 여부 (True/False)
+    """
+    detector = get_motion_detector(stream_id)
+    if threshold is not None:
+        detector.threshold = threshold
+    if area_threshold is not None and area_threshold != detector.area_threshold:
+        detector.area_threshold = area_threshold
+        detector._frame_shape = None  # 환산 임계값 다시 계산
+    return detector.detect(frame)
 
-    prev_frame = gray  # 이전 프레임 갱신
 
-    return motion_area > area_threshold
+def motion_snapshot():
+    """스트림별 움직임 감지 통계 (YOLO 호출 회피 횟수 포함)"""
+    return {stream_id: d.stats() for stream_id, d in motion_detectors.items()}
@@ -1,9 +1,68 @@
-import easyocr
 import re
 import cv2
 
-# EasyOCR Reader 초기화 (한 번만)
-reader = easyocr.Reader(["en"], gpu=False)  # GPU 사용 시 gpu=True
+from settings import get_setting
+from ocr_preprocess import clamp_bbox, get_preprocessor
+from digit_recognizer import (
+    OCR_ENGINES,
+    CrnnDigitRecognizer,
+    EasyOcrDigitRecognizer,
+    EasyOcrRecognizer,
+)
+
+# EasyOCR Reader (프로세스마다 최초 사용 시 한 번만 생성)
+reader = None
+
+# 설정된 OCR 엔진 (프로세스마다 최초 사용 시 한 번만 생성)
+engine = None
+
+
+def get_reader(detector=True):
+    """
+    현재 프로세스의 EasyOCR Reader를 반환합니다. (지연 초기화)
+
+    :param detector: False면 문자 검출(CRAFT) 모델을 로드하지 않음 (인식 전용)
+    """
+    global reader
+    # 인식 전용으로 만든 Reader에 검출 모델이 필요해지면 다시 생성
+    if reader is None or (detector and getattr(reader, "detector", None) is None):
+        import easyocr
+
+        # GPU 사용 시 gpu=True
+        reader = easyocr.Reader(["en"], gpu=False, detector=detector)
+    return reader
+
+
+def create_engine(name, config=None):
+    """
+    OCR 엔진을 생성합니다.
+
+    :param name: "easyocr"(검출+인식), "easyocr_digits"(인식 전용, 숫자 allowlist),
+                 "crnn"(숫자 전용 CRNN ONNX 모델)
+    :param config: ocr 설정 (crnn_model_path, crnn_height, crnn_width, alphabet)
+    """
+    config = config or {}
+    if name == "easyocr":
+        return EasyOcrRecognizer(get_reader(), extract_numbers_from_text)
+    if name == "easyocr_digits":
+        return EasyOcrDigitRecognizer(get_reader(detector=False))
+    if name == "crnn":
+        return CrnnDigitRecognizer(
+            config.get("crnn_model_path", "runs/ocr/digits_crnn.onnx"),
+            config.get("crnn_height", 32),
+            config.get("crnn_width", 128),
+            config.get("alphabet", "0123456789"),
+        )
+    raise ValueError(f"지원하지 않는 OCR 엔진: {name} (사용 가능: {OCR_ENGINES})")
+
+
+def get_engine():
+    """설정(ocr.engine)에 따른 현재 프로세스의 OCR 엔진을 반환합니다. (지연 초기화)"""
+    global engine
+    if engine is None:
+        config = get_setting("ocr", {}) or {}
+        engine = create_engine(config.get("engine", "easyocr"), config)
+    return engine
 
 
 def extract_numbers_from_text(text):
@@ -16,25 +75,67 @@ def extract_numbers_from_text(text):
     return matches[0] if matches else None
 
 
-def run_ocr_on_bbox(frame, bbox):
+def crop_bbox(frame, bbox):
     """
-    객체 바운딩 박스 내부에서 OCR 수행
+    바운딩 박스 영역을 프레임 범위 안으로 잘라냅니다.
     :param frame: 전체 BGR 이미지
     :param bbox: (x, y, w, h) 바운딩 박스
-    :return: 숫자 결과 문자열 또는 None
+    :return: 잘라낸 이미지 (frame의 view, 프레임 밖이면 빈 배열)
     """
-    x, y, w, h = bbox
-    roi = frame[y : y + h, x : x + w]  # 객체 박스 부분만 잘라냄
+    box = clamp_bbox(bbox, frame.shape)
+    if box is None:
+        return frame[0:0, 0:0]
+    x0, y0, x1, y1 = box
+    return frame[y0:y1, x0:x1]
 
-    # OCR 실행
-    result = reader.readtext(roi)
 
-    if not result:
+def prepare_crop(frame, bbox):
+    """
+    OCR 입력 이미지를 만듭니다. (ocr_preprocess 설정에 따라 높이 정규화/보정 적용)
+    워커 프로세스로 넘길 수 있도록 항상 복사본을 반환합니다.
+
+    :param frame: 오버레이가 그려지지 않은 원본 BGR 프레임
+    :param bbox: (x, y, w, h) 바운딩 박스
+    :return: OCR 입력 이미지 또는 None (박스가 프레임 밖)
+    """
+    preprocessor = get_preprocessor()
+    if preprocessor is not None:
+        crop = preprocessor.process(frame, bbox)
+    else:
+        crop = crop_bbox(frame, bbox)
+    if crop is None or crop.size == 0:
         return None
+    return crop.copy()
+
+
+def read_digits(crop):
+    """
+    잘라낸 이미지에서 OCR 수행 (신뢰도 포함)
+    :param crop: 객체 박스 부분 이미지 (BGR 또는 전처리된 그레이)
+    :return: (숫자 결과 문자열 또는 None, 신뢰도)
+    """
+    if crop is None or crop.size == 0:
+        return None, 0.0
+
+    # 설정된 엔진으로 OCR 실행
+    return get_engine().read(crop)
 
-    for _, text, _ in result:
-        cleaned = extract_numbers_from_text(text)
-        if cleaned:
-            return cleaned
 
-    return None
+def recognize_digits(crop):
+    """
+    잘라낸 이미지에서 OCR 수행
+    :param crop: 객체 박스 부분 이미지 (BGR 또는 전처리된 그레이)
+    :return: 숫자 결과 문자열 또는 None
+    """
+    text, _ = read_digits(crop)
+    return text
+
+
+def run_ocr_on_bbox(frame, bbox):
+    """
+    객체 바운딩 박스 내부에서 OCR 수행
+    :param frame: 전체 BGR 이미지
+    :param bbox: (x, y, w, h) 바운딩 박스
+    :return: 숫자 결과 문자열 또는 None
+    """
+    return recognize_digits(prepare_crop(frame, bbox))
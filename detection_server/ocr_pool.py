@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+
+from settings import get_setting
+from ocr import get_engine, read_digits
+
+
+def _init_worker():
+    """OCR 워커 프로세스 초기화: 프로세스마다 OCR 엔진(모델)을 미리 로드합니다."""
+    get_engine()
+
+
+class OcrWorkerPool:
+    """
+    OCR 작업을 별도 프로세스 풀에서 실행하고 결과를 track id별 future로 관리합니다.
+    workers=0 이면 호출한 스레드에서 바로 실행합니다. (완료된 future 반환)
+    워커 프로세스가 죽어(OOM 등) 풀이 깨지면 max_restarts 번까지 다시 만들고,
+    그 뒤로는 호출한 스레드에서 바로 실행합니다.
+    """
+
+    def __init__(self, workers, max_restarts=3):
+        self.workers = workers
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._executor = None
+        self._pending = {}  # track_id → Future
+        self._lock = threading.Lock()
+
+        # 설정 시 OCR에 넘긴 크롭을 저장 (bench_ocr.py 평가용 데이터 수집)
+        self.save_dir = (get_setting("ocr", {}) or {}).get("save_crops_dir")
+        if self.save_dir:
+            os.makedirs(self.save_dir, exist_ok=True)
+
+        if workers > 0:
+            self._executor = self._create_executor()
+        print(f"✅ OCR 워커 풀 생성 (workers={workers})", flush=True)
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    def _recover(self, broken):
+        """
+        깨진 프로세스 풀을 다시 만듭니다. (재시작 횟수를 넘으면 스레드에서 바로 실행)
+        같은 풀에 대해서는 한 번만 처리하고 기록합니다.
+        """
+        with self._lock:
+            if self._executor is not broken:
+                return  # 다른 호출에서 이미 처리함
+            broken.shutdown(wait=False, cancel_futures=True)
+            if self.restarts < self.max_restarts:
+                self.restarts += 1
+                self._executor = self._create_executor()
+                print(
+                    f"💥 OCR 워커 프로세스 종료 감지 → 풀 재생성 "
+                    f"({self.restarts}/{self.max_restarts})",
+                    flush=True,
+                )
+            else:
+                self._executor = None
+                print(
+                    "💥 OCR 워커 풀 재생성 한도 초과 → 이후 OCR은 호출 스레드에서 실행",
+                    flush=True,
+                )
+
+    def submit(self, track_id, crop):
+        """
+        잘라낸 이미지에 대한 OCR 작업을 제출합니다.
+
+        :param track_id: 추적 객체 id
+        :param crop: 객체 박스 BGR 이미지 (복사본)
+        :return: (숫자 결과 문자열 또는 None, 신뢰도)를 돌려줄 Future
+        """
+        if self.save_dir:
+            name = f"track{track_id}_{int(time.time() * 1000)}.png"
+            cv2.imwrite(os.path.join(self.save_dir, name), crop)
+
+        future = None
+        executor = self._executor
+        if executor is not None:
+            try:
+                future = executor.submit(read_digits, crop)
+            except BrokenProcessPool:
+                # 워커가 죽어 깨진 풀은 다시 만들어 제출 (한도를 넘으면 아래에서 바로 실행)
+                self._recover(executor)
+                if self._executor is not None:
+                    future = self._executor.submit(read_digits, crop)
+
+        if future is None:
+            future = Future()
+            try:
+                future.set_result(read_digits(crop))
+            except Exception as e:
+                future.set_exception(e)
+
+        with self._lock:
+            self._pending[track_id] = future
+        return future
+
+    def is_pending(self, track_id):
+        """해당 track의 OCR 작업이 제출되어 아직 수거되지 않았는지 여부"""
+        with self._lock:
+            return track_id in self._pending
+
+    def poll(self, track_id):
+        """
+        완료된 OCR 결과를 수거합니다.
+
+        :return: (완료 여부, (결과 문자열 또는 None, 신뢰도))
+        """
+        with self._lock:
+            future = self._pending.get(track_id)
+            if future is None or not future.done():
+                return False, (None, 0.0)
+            del self._pending[track_id]
+
+        try:
+            return True, future.result()
+        except Exception as e:
+            print(f"💥 OCR 작업 예외 (track {track_id}): {e}", flush=True)
+            return True, (None, 0.0)
+
+    def cancel(self, track_id):
+        """해당 track의 OCR 작업을 취소하고 결과를 버립니다."""
+        with self._lock:
+            future = self._pending.pop(track_id, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            self._pending.clear()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 OCR 풀 (최초 사용 시 생성)
+_pool = None
+
+
+def get_ocr_pool():
+    """설정(ocr_workers)에 따라 전역 OCR 워커 풀을 반환합니다."""
+    global _pool
+    if _pool is None:
+        _pool = OcrWorkerPool(int(get_setting("ocr_workers", 2)))
+    return _pool
+
+
+def cancel_ocr(track_id):
+    """OCR 풀이 생성된 경우에만 해당 track의 작업을 취소합니다."""
+    if _pool is not None:
+        _pool.cancel(track_id)
+
+
+def shutdown_ocr_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
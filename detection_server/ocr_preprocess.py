@@ -0,0 +1,142 @@
+import threading
+
+import cv2
+import numpy as np
+
+from settings import get_setting
+
+
+def clamp_bbox(bbox, frame_shape, padding=0.0):
+    """
+    바운딩 박스에 여백을 더하고 프레임 범위 안으로 자릅니다.
+
+    :param bbox: (x, y, w, h)
+    :param padding: 박스 크기 대비 여백 비율
+    :return: (x0, y0, x1, y1) 또는 None (프레임과 겹치지 않음)
+    """
+    frame_h, frame_w = frame_shape[:2]
+    x, y, w, h = (int(v) for v in bbox)
+    px, py = int(w * padding), int(h * padding)
+    x0, y0 = max(0, x - px), max(0, y - py)
+    x1, y1 = min(frame_w, x + w + px), min(frame_h, y + h + py)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1, y1
+
+
+class CropPreprocessor:
+    """
+    OCR 입력 크롭 전처리: 박스 보정 → 그레이 → 높이 정규화 → (선택) 기울기 보정/CLAHE/이진화.
+    크기별 버퍼를 미리 할당해 재사용하므로, 반환된 이미지는 다음 호출 전에 복사해야 합니다.
+    """
+
+    def __init__(
+        self,
+        height=64,
+        max_width=256,
+        padding=0.05,
+        deskew=False,
+        max_skew=15.0,
+        clahe=False,
+        clahe_clip=2.0,
+        binarize=False,
+    ):
+        self.height = height
+        self.max_width = max_width
+        self.padding = padding
+        self.deskew = deskew
+        self.max_skew = max_skew
+        self.binarize = binarize
+        self._clahe = (
+            cv2.createCLAHE(clipLimit=clahe_clip, tileGridSize=(4, 4))
+            if clahe
+            else None
+        )
+        self._gray = {}  # (h, w) → 그레이 변환 버퍼
+        self._out = {}  # (h, w) → 정규화 결과 버퍼
+
+    def _buffer(self, cache, shape):
+        buffer = cache.get(shape)
+        if buffer is None:
+            if len(cache) > 32:
+                cache.clear()  # 크기가 계속 바뀌는 경우 버퍼가 무한히 늘지 않도록
+            buffer = cache[shape] = np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    def _deskew(self, image):
+        """전경(글자) 픽셀의 최소 외접 사각형 각도로 기울기를 보정합니다."""
+        _, mask = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        points = cv2.findNonZero(mask)
+        if points is None or len(points) < 10:
+            return image
+        angle = cv2.minAreaRect(points)[2]
+        if angle > 45:
+            angle -= 90
+        if abs(angle) < 0.5 or abs(angle) > self.max_skew:
+            return image
+        h, w = image.shape
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        return cv2.warpAffine(
+            image,
+            matrix,
+            (w, h),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+
+    def process(self, frame, bbox):
+        """
+        원본 프레임에서 박스를 잘라 OCR 입력 이미지를 만듭니다.
+
+        :param frame: 오버레이가 그려지지 않은 원본 BGR 프레임
+        :param bbox: (x, y, w, h)
+        :return: 높이 height 의 그레이 이미지 (재사용 버퍼) 또는 None
+        """
+        box = clamp_bbox(bbox, frame.shape, self.padding)
+        if box is None:
+            return None
+        x0, y0, x1, y1 = box
+        crop = frame[y0:y1, x0:x1]
+
+        gray = self._buffer(self._gray, crop.shape[:2])
+        if crop.ndim == 3:
+            cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY, dst=gray)
+        else:
+            np.copyto(gray, crop)
+
+        h, w = gray.shape
+        width = max(8, min(self.max_width, int(round(w * self.height / h))))
+        out = self._buffer(self._out, (self.height, width))
+        interpolation = cv2.INTER_AREA if h > self.height else cv2.INTER_CUBIC
+        cv2.resize(gray, (width, self.height), dst=out, interpolation=interpolation)
+
+        if self.deskew:
+            out = self._deskew(out)
+        if self._clahe is not None:
+            out = self._clahe.apply(out)
+        if self.binarize:
+            cv2.threshold(out, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU, dst=out)
+        return out
+
+
+# 스레드별 전처리기 (버퍼를 재사용하므로 compute 스레드끼리 공유하지 않음)
+_local = threading.local()
+
+
+def get_preprocessor():
+    """설정(ocr_preprocess)에 따른 현재 스레드의 전처리기를 반환합니다. (enabled=false 이면 None)"""
+    if not hasattr(_local, "preprocessor"):
+        config = get_setting("ocr_preprocess", {}) or {}
+        _local.preprocessor = None
+        if config.get("enabled", True):
+            _local.preprocessor = CropPreprocessor(
+                height=config.get("height", 64),
+                max_width=config.get("max_width", 256),
+                padding=config.get("padding", 0.05),
+                deskew=config.get("deskew", False),
+                max_skew=config.get("max_skew", 15.0),
+                clahe=config.get("clahe", False),
+                clahe_clip=config.get("clahe_clip", 2.0),
+                binarize=config.get("binarize", False),
+            )
+    return _local.preprocessor
@@ -0,0 +1,109 @@
+from settings import get_setting
+
+
+class OcrVote:
+    """
+    한 객체의 여러 프레임 OCR 결과를 모아 신뢰도 가중 투표로 최종 숫자를 정합니다.
+
+    - window 프레임마다 품질 점수(crop_quality)가 가장 높은 크롭 하나만 OCR에 제출합니다.
+    - 숫자를 읽어낸 횟수가 min_votes 이상이고 최다 후보의 가중치 비율이 agreement 이상이면 조기 확정합니다.
+    - 신뢰도가 accept_confidence 이상인 결과는 한 번에 확정합니다. (None 이면 사용 안 함)
+    - max_frames 번 읽은 뒤에는 가중치가 가장 큰 후보로 확정합니다. (후보가 없으면 실패)
+    """
+
+    def __init__(
+        self,
+        max_frames=5,
+        window=3,
+        agreement=0.6,
+        min_votes=2,
+        accept_confidence=0.9,
+    ):
+        self.max_frames = max(1, int(max_frames))
+        self.window = max(1, int(window))
+        self.agreement = agreement
+        self.min_votes = max(1, int(min_votes))
+        self.accept_confidence = accept_confidence
+
+        self.weights = {}  # 숫자 → 신뢰도 합
+        self.reads = 0
+        self.votes = 0  # 숫자를 읽어낸 횟수
+        self.accepted = None  # accept_confidence 이상으로 읽힌 숫자
+        self._best_crop = None
+        self._best_score = -1.0
+        self._frames = 0  # 마지막 제출 이후 후보로 본 프레임 수
+
+    def offer(self, crop, score):
+        """현재 프레임 크롭을 후보로 넣습니다. (구간 내 최고 점수만 유지)"""
+        if crop is None:
+            return
+        self._frames += 1
+        if score > self._best_score:
+            self._best_crop = crop
+            self._best_score = score
+
+    def take(self):
+        """
+        window 프레임이 모였으면 구간 내 최고 점수 크롭을 꺼냅니다.
+
+        :return: OCR에 제출할 크롭 또는 None (아직 모으는 중)
+        """
+        if self._frames < self.window or self._best_crop is None:
+            return None
+        crop = self._best_crop
+        self._best_crop = None
+        self._best_score = -1.0
+        self._frames = 0
+        return crop
+
+    def add(self, text, confidence):
+        """OCR 결과 하나를 반영합니다. (text=None 은 실패로 횟수만 셈)"""
+        self.reads += 1
+        if text:
+            self.votes += 1
+            self.weights[text] = self.weights.get(text, 0.0) + float(confidence)
+            if (
+                self.accept_confidence is not None
+                and confidence >= self.accept_confidence
+            ):
+                self.accepted = self.accepted or text
+
+    def leader(self):
+        """:return: (최다 가중치 후보 또는 None, 전체 가중치 대비 비율)"""
+        if not self.weights:
+            return None, 0.0
+        text = max(self.weights, key=self.weights.get)
+        total = sum(self.weights.values())
+        return text, self.weights[text] / total if total > 0 else 0.0
+
+    def exhausted(self):
+        return self.reads >= self.max_frames
+
+    def result(self):
+        """
+        :return: 확정된 숫자 또는 None (더 읽어야 하거나 후보 없음)
+        """
+        if self.accepted:
+            return self.accepted
+        text, agreement = self.leader()
+        if text is None:
+            return None
+        if self.exhausted():
+            return text
+        if self.votes >= self.min_votes and agreement >= self.agreement:
+            return text
+        return None
+
+
+def create_vote():
+    """설정(ocr_voting)에 따른 객체별 투표 상태를 만듭니다. (enabled=false 이면 None)"""
+    config = get_setting("ocr_voting", {}) or {}
+    if not config.get("enabled", False):
+        return None
+    return OcrVote(
+        max_frames=config.get("max_frames", 5),
+        window=config.get("window", 3),
+        agreement=config.get("agreement", 0.6),
+        min_votes=config.get("min_votes", 2),
+        accept_confidence=config.get("accept_confidence", 0.9),
+    )
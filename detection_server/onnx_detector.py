@@ -0,0 +1,219 @@
+import os
+
+import cv2
+import numpy as np
+
+# 지원하는 CPU 추론 런타임
+ONNX_BACKENDS = ("onnxruntime", "openvino")
+
+
+def export_onnx(pt_path, imgsz=416, onnx_path=None, force=False):
+    """
+    YOLO .pt 가중치를 ONNX로 내보내고 디스크에 캐시합니다.
+    캐시 파일이 .pt보다 새로우면 다시 내보내지 않습니다.
+
+    :param pt_path: 학습된 가중치 경로 (예: runs/detect/ocr_dash/weights/best.pt)
+    :param imgsz: 기본 입력 크기 (배치/입력 크기는 dynamic 축으로 내보냄)
+    :param onnx_path: 저장 경로 (None이면 .pt와 같은 위치의 .onnx)
+    :param force: True면 캐시를 무시하고 다시 내보냄
+    :return: ONNX 파일 경로
+    """
+    onnx_path = onnx_path or os.path.splitext(pt_path)[0] + ".onnx"
+    if (
+        not force
+        and os.path.exists(onnx_path)
+        and (
+            not os.path.exists(pt_path)
+            or os.path.getmtime(onnx_path) >= os.path.getmtime(pt_path)
+        )
+    ):
+        return onnx_path
+
+    from ultralytics import YOLO
+
+    print(f"🔄 ONNX 내보내기 중... ({pt_path} → {onnx_path})", flush=True)
+    exported = YOLO(pt_path).export(format="onnx", imgsz=imgsz, dynamic=True)
+    if os.path.abspath(exported) != os.path.abspath(onnx_path):
+        os.replace(exported, onnx_path)
+    print("✅ ONNX 내보내기 완료", flush=True)
+    return onnx_path
+
+
+def letterbox(image, size, color=114):
+    """
+    비율을 유지한 채 size×size 로 축소/확대하고 남는 부분을 채웁니다.
+
+    :return: (size×size 이미지, 배율, (좌측 여백, 상단 여백))
+    """
+    h, w = image.shape[:2]
+    ratio = min(size / h, size / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+    canvas = np.full((size, size, 3), color, dtype=np.uint8)
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas[pad_y : pad_y + new_h, pad_x : pad_x + new_w] = image
+    return canvas, ratio, (pad_x, pad_y)
+
+
+def preprocess(frames, imgsz):
+    """
+    프레임들을 letterbox 후 하나의 NCHW float32 입력으로 묶습니다.
+
+    :return: (입력 배열, 프레임별 (배율, 여백, 원본 shape) 목록)
+    """
+    size = max(32, (int(imgsz) + 31) // 32 * 32)  # stride(32)의 배수
+    blob = np.empty((len(frames), 3, size, size), dtype=np.float32)
+    metas = []
+    for i, frame in enumerate(frames):
+        image, ratio, pad = letterbox(frame, size)
+        # BGR HWC uint8 → RGB CHW float32 (0~1)
+        np.multiply(image[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=blob[i])
+        metas.append((ratio, pad, frame.shape))
+    return blob, metas
+
+
+def nms(boxes, scores, iou_threshold):
+    """
+    NumPy NMS. (후보 하나와 나머지 전체의 IoU를 한 번에 계산)
+
+    :param boxes: (N, 4) xyxy
+    :param scores: (N,)
+    :return: 남길 인덱스 배열 (신뢰도 내림차순)
+    """
+    x0, y0, x1, y1 = boxes.T
+    areas = (x1 - x0) * (y1 - y0)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x1[i], x1[rest]) - np.maximum(x0[i], x0[rest]), 0, None)
+        h = np.clip(np.minimum(y1[i], y1[rest]) - np.maximum(y0[i], y0[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def decode_predictions(
+    pred, conf_thres, iou_threshold, ratio, pad, shape, with_classes=False
+):
+    """
+    YOLOv8 ONNX 출력 (4 + 클래스 수, 후보 수) 하나를 원본 좌표의 박스로 변환합니다.
+
+    :param with_classes: True면 (N,) 클래스 배열도 함께 반환 (평가용)
+    :return: ((N, 4) int32 xywh, (N,) float32 신뢰도[, (N,) 클래스])
+    """
+    pred = pred.T  # (후보 수, 4 + 클래스 수)
+    class_scores = pred[:, 4:]
+    classes = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(pred)), classes]
+    mask = scores >= conf_thres
+    if not mask.any():
+        empty = np.zeros((0, 4), dtype=np.int32), np.zeros((0,), dtype=np.float32)
+        return empty + (np.zeros((0,), dtype=np.int64),) if with_classes else empty
+
+    cxcywh, scores, classes = pred[mask, :4], scores[mask], classes[mask]
+    xyxy = np.empty_like(cxcywh)
+    xyxy[:, :2] = cxcywh[:, :2] - cxcywh[:, 2:] / 2
+    xyxy[:, 2:] = cxcywh[:, :2] + cxcywh[:, 2:] / 2
+
+    # 클래스별 NMS: 클래스마다 좌표를 멀리 떨어뜨려 한 번에 처리
+    offsets = classes[:, None].astype(xyxy.dtype) * 4096.0
+    keep = nms(xyxy + offsets, scores, iou_threshold)
+    xyxy, scores, classes = xyxy[keep], scores[keep], classes[keep]
+
+    # letterbox 좌표 → 원본 좌표
+    xyxy[:, [0, 2]] -= pad[0]
+    xyxy[:, [1, 3]] -= pad[1]
+    xyxy /= ratio
+    h, w = shape[:2]
+    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, w)
+    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, h)
+
+    boxes = xyxy.copy()
+    boxes[:, 2:] -= boxes[:, :2]
+    if with_classes:
+        return boxes.astype(np.int32), scores.astype(np.float32), classes
+    return boxes.astype(np.int32), scores.astype(np.float32)
+
+
+class OnnxYoloDetector:
+    """
+    ONNX로 내보낸 YOLO 모델을 ONNX Runtime 또는 OpenVINO(CPU)로 실행합니다.
+    전처리(letterbox)와 후처리(디코딩/NMS)는 NumPy로 수행하며,
+    detector.detect_all_objects_batch 와 같은 형식의 결과를 반환합니다.
+    """
+
+    def __init__(self, onnx_path, backend="onnxruntime", imgsz=416, threads=0, iou=0.7):
+        if backend not in ONNX_BACKENDS:
+            raise ValueError(
+                f"지원하지 않는 ONNX 런타임: {backend} (사용 가능: {ONNX_BACKENDS})"
+            )
+        self.path = onnx_path
+        self.backend = backend
+        self.imgsz = int(imgsz)
+        self.iou = iou
+
+        if backend == "onnxruntime":
+            import onnxruntime as ort
+
+            options = ort.SessionOptions()
+            if threads:
+                options.intra_op_num_threads = int(threads)
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._session = ort.InferenceSession(
+                onnx_path, options, providers=["CPUExecutionProvider"]
+            )
+            self._input = self._session.get_inputs()[0].name
+        else:
+            import openvino as ov
+
+            config = {"INFERENCE_NUM_THREADS": int(threads)} if threads else {}
+            self._compiled = ov.Core().compile_model(onnx_path, "CPU", config)
+
+    def _infer(self, blob):
+        if self.backend == "onnxruntime":
+            return self._session.run(None, {self._input: blob})[0]
+        return self._compiled(blob)[0]
+
+    def detect_batch(self, frames, conf_thres=0.5, imgsz=None, with_classes=False):
+        """
+        여러 프레임을 한 번에 감지합니다.
+
+        :return: 프레임별 ((N, 4) xywh 배열, (N,) 신뢰도 배열[, (N,) 클래스]) 목록
+        """
+        if not len(frames):
+            return []
+        blob, metas = preprocess(frames, imgsz or self.imgsz)
+        preds = self._infer(blob)
+        return [
+            decode_predictions(
+                pred, conf_thres, self.iou, ratio, pad, shape, with_classes
+            )
+            for pred, (ratio, pad, shape) in zip(preds, metas)
+        ]
+
+
+def load_onnx_detector(model_path, config):
+    """
+    설정에 따라 ONNX 모델을 준비(필요 시 .pt 내보내기)하고 OnnxYoloDetector를 생성합니다.
+
+    :param model_path: yolo_model_path (.pt 또는 이미 내보낸 .onnx)
+    :param config: {"backend", "imgsz", "intra_op_threads", "iou", "onnx_path"}
+    """
+    imgsz = config.get("imgsz", 416)
+    if model_path.endswith(".onnx"):
+        onnx_path = model_path
+    else:
+        onnx_path = export_onnx(model_path, imgsz, config.get("onnx_path"))
+    return OnnxYoloDetector(
+        onnx_path,
+        backend=config.get("backend", "onnxruntime"),
+        imgsz=imgsz,
+        threads=config.get("intra_op_threads", 0),
+        iou=config.get("iou", 0.7),
+    )
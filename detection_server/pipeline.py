@@ -0,0 +1,245 @@
+import cv2
+
+from ultralytics import YOLO
+from settings import get_model_path, get_setting
+from onnx_detector import load_onnx_detector
+import detector
+from detector import set_model, union_box
+from batcher import detect, get_batcher, get_region_config
+from motion_detector import detect_motion, get_motion_detector, motion_snapshot
+from scheduler import get_scheduler, scheduler_snapshot
+from crop_quality import quality_snapshot
+from roi_checker import draw_roi, ROI_BOX
+from track_manager import TrackManager, OCR_DONE
+from frame_buffers import get_frame_pool
+
+# 스트림별 다중 객체 추적 상태 (stream_id → TrackManager)
+track_managers = {}
+
+
+def get_track_manager(stream_id):
+    """스트림의 TrackManager를 반환합니다. (없으면 생성)"""
+    manager = track_managers.get(stream_id)
+    if manager is None:
+        manager = track_managers[stream_id] = TrackManager(stream_id)
+    return manager
+
+
+def load_model():
+    """
+    YOLO 모델을 로드하여 detector 모듈에 주입합니다. (이미 로드된 경우 생략)
+    detector.backend 가 onnxruntime/openvino 이면 ONNX로 내보낸(캐시된) 모델을 사용합니다.
+    """
+    if detector.yolo_model is not None:
+        return detector.yolo_model
+
+    model_path = get_model_path()
+    config = get_setting("detector", {}) or {}
+    backend = config.get("backend", "ultralytics")
+    print(f"🔄 YOLO 모델 로드 중... (경로: {model_path}, {backend})", flush=True)
+    if backend == "ultralytics":
+        model = YOLO(model_path)
+    else:
+        model = load_onnx_detector(model_path, config)
+    print("✅ YOLO 모델 로드 완료", flush=True)
+
+    set_model(model)
+    return model
+
+
+def init_worker():
+    """프로세스 풀 워커 초기화: 워커 프로세스마다 모델을 한 번 로드합니다."""
+    load_model()
+
+
+def compute_snapshot():
+    """
+    연산 상태 통계 (배치 감지/움직임 감지/감지 스케줄/OCR 크롭 품질/추적, /metrics 노출용).
+    상태는 연산을 실행하는 프로세스에만 있으므로 process executor 에서는 워커에서 실행해야 합니다.
+    """
+    batcher = get_batcher()
+    return {
+        "batching": batcher.snapshot() if batcher else None,
+        "motion": motion_snapshot(),
+        "scheduler": scheduler_snapshot(),
+        "ocr_quality": quality_snapshot(),
+        "tracking": {
+            stream_id: {"mode": manager.mode, "tracks": len(manager.tracks)}
+            for stream_id, manager in track_managers.items()
+        },
+    }
+
+
+def detection_region(stream_id, manager):
+    """
+    ROI 영역 추론 시 YOLO에 넘길 영역을 구합니다. (비활성화 시 None → 전체 프레임)
+    ROI(idle 모드에서 source가 motion이면 움직임 영역)와 추적 중인 객체 박스를 모두 포함합니다.
+    """
+    enabled, source, _, _ = get_region_config()
+    if not enabled:
+        return None
+
+    base = ROI_BOX
+    if source == "motion" and not manager.tracks:
+        base = get_motion_detector(stream_id).last_region or ROI_BOX
+    return union_box([base] + [track.bbox for track in manager.tracks.values()])
+
+
+def build_overlay(frame, manager, motion=None):
+    """
+    화면에 표시할 정보를 JSON으로 보낼 수 있는 dict로 모읍니다.
+    (서버에서 그리거나, 브라우저 캔버스가 원본 영상 위에 직접 그림)
+
+    :param motion: idle 모드의 움직임 감지 여부 (tracking 모드는 None)
+    """
+    height, width = frame.shape[:2]
+    tracking = motion is None
+    return {
+        "size": [width, height],
+        "roi": [int(v) for v in ROI_BOX],
+        "mode": manager.mode,
+        "motion": motion,
+        "tracks": [
+            {
+                "id": track.id,
+                "bbox": [int(v) for v in track.bbox],
+                "ocr_state": track.ocr_state,
+                "ocr_result": track.ocr_result,
+            }
+            for track in manager.tracks.values()
+        ],
+        # 화면 상단 메시지는 이번 프레임을 추적 모드로 처리한 경우만 표시 (OCR 결과 우선)
+        "ocr_result": manager.last_ocr_result if tracking else None,
+        "failure": manager.failure_message if tracking else None,
+    }
+
+
+def draw_tracks(frame, tracks):
+    """추적 중인 객체 박스와 id/OCR 결과를 그립니다."""
+    for track in tracks:
+        x, y, w, h = track["bbox"]
+        color = (0, 255, 0) if track["ocr_state"] == OCR_DONE else (0, 0, 255)
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+        label = f"#{track['id']}"
+        if track["ocr_result"]:
+            label += f" {track['ocr_result']}"
+        cv2.putText(
+            frame,
+            label,
+            (x, max(y - 8, 15)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.7,
+            color,
+            2,
+        )
+
+
+def render_overlay(stream_id, frame, overlay):
+    """
+    원본 프레임을 복사해 ROI/움직임 상태/추적 박스/OCR 결과를 그립니다.
+
+    :return: 오버레이가 그려진 프레임 (스트림별 재사용 버퍼)
+    """
+    # 매 프레임 새로 할당하지 않고 스트림별 버퍼를 돌려가며 사용
+    annotated_frame = get_frame_pool(stream_id).copy(frame)
+    annotated_frame = draw_roi(annotated_frame)
+
+    if overlay["motion"] is not None:
+        cv2.putText(
+            annotated_frame,
+            "Motion On" if overlay["motion"] else "Motion Off",
+            (10, 120),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            (0, 255, 0) if overlay["motion"] else (0, 0, 255),
+            2,
+        )
+
+    draw_tracks(annotated_frame, overlay["tracks"])
+
+    if overlay["ocr_result"]:
+        cv2.putText(
+            annotated_frame,
+            f"OCR: {overlay['ocr_result']}",
+            (10, 40),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            (0, 255, 0),
+            2,
+        )
+    elif overlay["failure"]:
+        cv2.putText(
+            annotated_frame,
+            overlay["failure"],
+            (10, 40),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            (0, 0, 255),
+            2,
+        )
+    return annotated_frame
+
+
+def process_frame(stream_id, frame, annotate=True):
+    """
+    한 프레임에 대해 움직임 감지 → YOLO 감지 → 추적 → OCR 을 수행합니다.
+    블로킹 연산만 모아둔 동기 함수로, compute executor 안에서 실행됩니다.
+    (같은 스트림의 프레임은 항상 순서대로 하나씩 호출됨)
+    감지/추적/OCR 은 모두 오버레이가 없는 원본 프레임에서 수행합니다.
+
+    :param stream_id: 스트림 id
+    :param frame: 원본 BGR 프레임 (수정하지 않음)
+    :param annotate: True면 오버레이를 그린 프레임도 만듦 (분석 영상 구독자가 있을 때만)
+    :return: (오버레이가 그려진 프레임 또는 None, 오버레이 정보 dict, 이번 프레임 이벤트 목록)
+    """
+    manager = get_track_manager(stream_id)
+    scheduler = get_scheduler(stream_id)
+    motion = None
+    mode = manager.mode
+
+    if manager.mode == "idle":
+        motion = bool(detect_motion(frame, stream_id=stream_id))
+        if motion:
+            # 빈 감지 후 대기 중이거나 초당 호출 제한에 걸리면 이번 프레임은 감지 생략
+            motion_ratio = get_motion_detector(stream_id).last_ratio
+            if scheduler.should_detect(motion_ratio=motion_ratio):
+                region = detection_region(stream_id, manager)
+                boxes, _ = detect(stream_id, frame, region)
+                scheduler.record(len(boxes) > 0)
+                if len(boxes):
+                    manager.apply_detections(frame, boxes)
+                else:
+                    print(
+                        f"❌ 객체 감지 실패 (다음 감지까지 {scheduler.cooldown:.1f}s 대기)",
+                        flush=True,
+                    )
+
+    else:
+        manager.update_trackers(frame)
+
+        # 재감지 주기(k 프레임), 추적 신뢰도, 마지막 감지 후 경과 시간으로 재감지 여부 결정
+        # (새로 들어온 객체 추가 및 박스 보정, tracking-by-detection 모드는 그 사이 칼만 예측으로 보간)
+        manager.frames_since_detection += 1
+        if manager.tracks and scheduler.should_detect(
+            confidence=manager.confidence(),
+            due=manager.frames_since_detection >= manager.detection_interval,
+        ):
+            region = detection_region(stream_id, manager)
+            boxes, _ = detect(stream_id, frame, region)
+            # 빈 재감지는 idle 모드 대기 시간(backoff)에 반영하지 않음
+            scheduler.record(len(boxes) > 0, backoff=False)
+            manager.apply_detections(frame, boxes)
+
+        manager.update_ocr(frame)
+
+    if manager.mode != mode:
+        manager.emit("mode", previous=mode, mode=manager.mode)
+        if manager.mode == "idle":
+            # 추적 중에는 움직임 감지를 건너뛰어 배경 모델이 오래되었으므로 다시 학습 (warm-up 적용)
+            get_motion_detector(stream_id).reset()
+
+    overlay = build_overlay(frame, manager, motion)
+    events = manager.drain_events()
+    if not annotate:
+        return None, overlay, events
+    return render_overlay(stream_id, frame, overlay), overlay, events
@@ -0,0 +1,368 @@
+"""
+학습된 YOLO 감지 모델을 INT8로 정적 양자화(PTQ)하고 검증셋 mAP50 / 지연 시간을 비교합니다.
+
+사용 예 (저장소 루트에서 실행):
+    python detection_server/quantize_detector.py --data D:/Workspace/ocr_app/dataset/data.yaml
+
+결과 모델(기본값: best_int8.onnx)을 서버에서 쓰려면 shared/config.json 에서
+"yolo_model_path" 를 해당 .onnx 경로로, "detector.backend" 를 "onnxruntime" 으로 설정합니다.
+
+보정(calibration) 이미지는 data.yaml 의 train 분할에서, mAP50 평가는
+runs/detect/ocr_dash/results.csv 를 만든 것과 같은 val 분할에서 읽습니다.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+import yaml
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from settings import get_model_path, get_setting
+from onnx_detector import OnnxYoloDetector, export_onnx, preprocess
+from association import iou_matrix
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# 학습 설정/결과 (기본 데이터셋 경로와 기준 mAP50)
+RUN_DIR = os.path.join("runs", "detect", "ocr_dash")
+
+# 양자화에서 제외할 YOLOv8 Detect 헤드(model.22)의 후처리 연산
+# (박스 디코딩/DFL 은 INT8 오차에 민감하므로 float 으로 유지)
+HEAD_PREFIX = "/model.22/"
+HEAD_FLOAT_OPS = {
+    "Concat",
+    "Split",
+    "Sigmoid",
+    "Softmax",
+    "Mul",
+    "Add",
+    "Sub",
+    "Div",
+    "Reshape",
+    "Transpose",
+}
+
+
+def load_dataset(data_yaml):
+    """
+    data.yaml 에서 분할별 이미지 폴더와 클래스 이름을 읽습니다.
+
+    :return: ({"train": 폴더, "val": 폴더}, 클래스 이름 목록)
+    """
+    with open(data_yaml, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    root = data.get("path") or os.path.dirname(os.path.abspath(data_yaml))
+    if not os.path.isabs(root):
+        root = os.path.join(os.path.dirname(os.path.abspath(data_yaml)), root)
+
+    splits = {}
+    for split in ("train", "val"):
+        path = data.get(split)
+        if isinstance(path, list):
+            path = path[0]
+        if path:
+            splits[split] = path if os.path.isabs(path) else os.path.join(root, path)
+
+    names = data.get("names", [])
+    if isinstance(names, dict):
+        names = [names[k] for k in sorted(names)]
+    return splits, names
+
+
+def list_images(folder):
+    files = []
+    for ext in IMAGE_EXTENSIONS:
+        files += glob.glob(os.path.join(folder, "**", f"*{ext}"), recursive=True)
+    return sorted(files)
+
+
+def label_path(image_path):
+    """YOLO 규칙: .../images/xxx.jpg → .../labels/xxx.txt"""
+    parts = image_path.replace("\\", "/").rsplit("/images/", 1)
+    base = "/labels/".join(parts) if len(parts) == 2 else image_path
+    return os.path.splitext(base)[0] + ".txt"
+
+
+def load_labels(image_path, shape):
+    """
+    YOLO 라벨(class cx cy w h, 0~1)을 원본 좌표 xywh 로 읽습니다.
+
+    :return: ((N, 4) xywh, (N,) 클래스)
+    """
+    path = label_path(image_path)
+    if not os.path.exists(path):
+        return np.zeros((0, 4)), np.zeros((0,), dtype=np.int64)
+    rows = np.loadtxt(path, ndmin=2)
+    if rows.size == 0:
+        return np.zeros((0, 4)), np.zeros((0,), dtype=np.int64)
+    h, w = shape[:2]
+    cx, cy, bw, bh = rows[:, 1] * w, rows[:, 2] * h, rows[:, 3] * w, rows[:, 4] * h
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, bw, bh], axis=1)
+    return boxes, rows[:, 0].astype(np.int64)
+
+
+class CalibrationReader:
+    """onnxruntime quantize_static 용 보정 데이터 (이미지 한 장씩 letterbox 입력으로 제공)"""
+
+    def __init__(self, image_paths, input_name, imgsz):
+        self.image_paths = list(image_paths)
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._index = 0
+
+    def get_next(self):
+        while self._index < len(self.image_paths):
+            image = cv2.imread(self.image_paths[self._index])
+            self._index += 1
+            if image is not None:
+                blob, _ = preprocess([image], self.imgsz)
+                return {self.input_name: blob}
+        return None
+
+    def rewind(self):
+        self._index = 0
+
+
+def head_nodes_to_exclude(onnx_path):
+    """Detect 헤드의 디코딩/DFL 연산 노드 이름 목록"""
+    import onnx
+
+    graph = onnx.load(onnx_path).graph
+    return [
+        node.name
+        for node in graph.node
+        if node.name.startswith(HEAD_PREFIX) and node.op_type in HEAD_FLOAT_OPS
+    ]
+
+
+def quantize(fp32_path, int8_path, calib_paths, imgsz, method, per_channel, keep_head):
+    """FP32 ONNX 모델을 QDQ 형식 INT8 모델로 정적 양자화합니다."""
+    import onnxruntime as ort
+    from onnxruntime.quantization import (
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    # 양자화 전 그래프 최적화/shape 추론
+    prepared_path = os.path.splitext(int8_path)[0] + "_prep.onnx"
+    quant_pre_process(fp32_path, prepared_path)
+
+    input_name = (
+        ort.InferenceSession(prepared_path, providers=["CPUExecutionProvider"])
+        .get_inputs()[0]
+        .name
+    )
+    reader = CalibrationReader(calib_paths, input_name, imgsz)
+    exclude = head_nodes_to_exclude(prepared_path) if keep_head else []
+
+    print(
+        f"🔄 INT8 양자화 중... (보정 이미지 {len(calib_paths)}장, {method}, "
+        f"float 유지 노드 {len(exclude)}개)",
+        flush=True,
+    )
+    quantize_static(
+        prepared_path,
+        int8_path,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=per_channel,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method={
+            "minmax": CalibrationMethod.MinMax,
+            "entropy": CalibrationMethod.Entropy,
+            "percentile": CalibrationMethod.Percentile,
+        }[method],
+        nodes_to_exclude=exclude,
+    )
+    os.remove(prepared_path)
+    print(f"✅ INT8 모델 저장: {int8_path}", flush=True)
+
+
+def average_precision(recall, precision):
+    """101점 보간 AP (COCO/ultralytics 방식)"""
+    mrec = np.concatenate(([0.0], recall, [1.0]))
+    mpre = np.concatenate(([1.0], precision, [0.0]))
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    x = np.linspace(0, 1, 101)
+    y = np.interp(x, mrec, mpre)
+    return float(np.sum((x[1:] - x[:-1]) * (y[1:] + y[:-1]) / 2))
+
+
+def evaluate(model, images, imgsz, iou_threshold=0.5):
+    """
+    검증 이미지의 mAP50 과 이미지당 추론 시간을 측정합니다.
+
+    :param images: [(이미지, (N, 4) 정답 xywh, (N,) 정답 클래스)]
+    :return: (mAP50, 평균 ms, p95 ms)
+    """
+    records = {}  # 클래스 → [(신뢰도, TP 여부)]
+    gt_counts = {}
+    times = []
+
+    for image, gt_boxes, gt_classes in images:
+        start = time.perf_counter()
+        boxes, scores, classes = model.detect_batch(
+            [image], conf_thres=0.001, imgsz=imgsz, with_classes=True
+        )[0]
+        times.append((time.perf_counter() - start) * 1000.0)
+
+        for c in np.unique(np.concatenate([gt_classes, classes])):
+            gt_c = gt_boxes[gt_classes == c]
+            det_mask = classes == c
+            det_c, score_c = boxes[det_mask], scores[det_mask]
+            gt_counts[c] = gt_counts.get(c, 0) + len(gt_c)
+
+            order = np.argsort(-score_c)
+            det_c, score_c = det_c[order], score_c[order]
+            tp = np.zeros(len(det_c), dtype=bool)
+            if len(gt_c) and len(det_c):
+                # 신뢰도 높은 감지부터 아직 매칭되지 않은 정답과 매칭
+                ious = iou_matrix(det_c, gt_c)
+                used = np.zeros(len(gt_c), dtype=bool)
+                for i in range(len(det_c)):
+                    candidates = np.where(~used & (ious[i] >= iou_threshold))[0]
+                    if len(candidates):
+                        j = candidates[np.argmax(ious[i, candidates])]
+                        used[j] = True
+                        tp[i] = True
+            records.setdefault(c, []).extend(zip(score_c, tp))
+
+    aps = []
+    for c, count in gt_counts.items():
+        if count == 0:
+            continue
+        rec = sorted(records.get(c, []), key=lambda r: -r[0])
+        tp = np.array([r[1] for r in rec], dtype=np.float64)
+        if not len(tp):
+            aps.append(0.0)
+            continue
+        tp_cum = np.cumsum(tp)
+        fp_cum = np.cumsum(1.0 - tp)
+        aps.append(average_precision(tp_cum / count, tp_cum / (tp_cum + fp_cum)))
+
+    mean_ap = float(np.mean(aps)) if aps else 0.0
+    return mean_ap, float(np.mean(times)), float(np.percentile(times, 95))
+
+
+def training_map50():
+    """results.csv 의 최고 mAP50 (학습 시 검증 결과, 참고용)"""
+    path = os.path.join(RUN_DIR, "results.csv")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [{k.strip(): v for k, v in row.items()} for row in csv.DictReader(f)]
+    values = [float(r["metrics/mAP50(B)"]) for r in rows if r.get("metrics/mAP50(B)")]
+    return max(values) if values else None
+
+
+def default_data_yaml():
+    """학습에 사용한 data.yaml 경로 (runs/detect/ocr_dash/args.yaml)"""
+    path = os.path.join(RUN_DIR, "args.yaml")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return (yaml.safe_load(f) or {}).get("data")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="YOLO 감지 모델 INT8 양자화 / 정확도 비교"
+    )
+    parser.add_argument(
+        "--model", help="가중치 경로 (.pt 또는 .onnx, 기본값: yolo_model_path)"
+    )
+    parser.add_argument(
+        "--data", help="data.yaml 경로 (기본값: 학습 args.yaml 의 data)"
+    )
+    parser.add_argument("--output", help="INT8 모델 경로 (기본값: <모델>_int8.onnx)")
+    parser.add_argument("--imgsz", type=int, help="입력 크기 (기본값: detector.imgsz)")
+    parser.add_argument("--calib-images", type=int, default=200)
+    parser.add_argument(
+        "--method", choices=("minmax", "entropy", "percentile"), default="minmax"
+    )
+    parser.add_argument("--per-channel", action="store_true")
+    parser.add_argument(
+        "--quantize-head",
+        action="store_true",
+        help="Detect 헤드의 디코딩/DFL 연산까지 INT8로 양자화",
+    )
+    parser.add_argument("--threads", type=int, default=0, help="intra-op 스레드 수")
+    parser.add_argument("--max-val-images", type=int, default=0, help="0이면 전체")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = get_setting("detector", {}) or {}
+    imgsz = args.imgsz or config.get("imgsz", 416)
+    model_path = args.model or get_model_path()
+    data_yaml = args.data or default_data_yaml()
+    if not data_yaml or not os.path.exists(data_yaml):
+        print(f"🚨 data.yaml 을 찾을 수 없습니다: {data_yaml} (--data 로 지정)")
+        return
+
+    splits, names = load_dataset(data_yaml)
+    calib_paths = list_images(splits.get("train", ""))
+    val_paths = list_images(splits.get("val", ""))
+    if not calib_paths or not val_paths:
+        print(f"🚨 train/val 이미지가 없습니다: {splits}")
+        return
+
+    random.Random(args.seed).shuffle(calib_paths)
+    calib_paths = calib_paths[: args.calib_images]
+    if args.max_val_images:
+        val_paths = val_paths[: args.max_val_images]
+
+    if model_path.endswith(".onnx"):
+        fp32_path = model_path
+    else:
+        fp32_path = export_onnx(model_path, imgsz, config.get("onnx_path"))
+    int8_path = args.output or os.path.splitext(fp32_path)[0] + "_int8.onnx"
+    quantize(
+        fp32_path,
+        int8_path,
+        calib_paths,
+        imgsz,
+        args.method,
+        args.per_channel,
+        not args.quantize_head,
+    )
+
+    # 검증 이미지는 미리 읽어 디코딩 시간을 측정에서 제외
+    images = []
+    for path in val_paths:
+        image = cv2.imread(path)
+        if image is not None:
+            images.append((image,) + load_labels(path, image.shape))
+    print(f"🎞️ 검증 이미지 {len(images)}장, 클래스 {len(names)}개 (imgsz={imgsz})")
+
+    reference = training_map50()
+    if reference is not None:
+        print(f"📈 학습 시 최고 mAP50 (results.csv): {reference:.4f}")
+
+    print(f"{'model':<6} {'mAP50':>8} {'avg_ms':>8} {'p95_ms':>8} {'size_mb':>8}")
+    baseline_ms = None
+    for label, path in (("fp32", fp32_path), ("int8", int8_path)):
+        model = OnnxYoloDetector(path, imgsz=imgsz, threads=args.threads)
+        model.detect_batch([images[0][0]], imgsz=imgsz)  # warmup
+        map50, avg_ms, p95_ms = evaluate(model, images, imgsz)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        baseline_ms = baseline_ms or avg_ms
+        print(
+            f"{label:<6} {map50:>8.4f} {avg_ms:>8.2f} {p95_ms:>8.2f} {size_mb:>8.1f}"
+            + (f"  (x{baseline_ms / avg_ms:.2f})" if label == "int8" else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import time
+
+from settings import get_setting
+
+# 스트림별 감지 스케줄러 (stream_id → DetectionScheduler)
+schedulers = {}
+
+
+class DetectionScheduler:
+    """
+    스트림별로 YOLO 감지를 언제 실행할지 결정합니다.
+
+    - 초당 최대 호출 수(max_calls_per_second)를 넘지 않도록 제한
+    - idle 모드: 빈 감지가 이어지면 대기 시간을 늘림 (empty_cooldown × backoff_factor^n,
+      최대 max_cooldown). 움직임 비율이 wake_motion_ratio 이상이면 대기 중에도 감지
+    - 추적 모드: 재감지 주기가 되었거나, 추적 신뢰도가 min_track_confidence 미만이거나,
+      마지막 감지 후 max_detection_age 초가 지나면 감지
+    """
+
+    def __init__(
+        self,
+        stream_id,
+        max_calls_per_second=10.0,
+        empty_cooldown=0.2,
+        backoff_factor=2.0,
+        max_cooldown=2.0,
+        wake_motion_ratio=0.05,
+        min_track_confidence=0.5,
+        max_detection_age=1.0,
+    ):
+        self.stream_id = stream_id
+        self.min_interval = 1.0 / max_calls_per_second if max_calls_per_second else 0.0
+        self.empty_cooldown = empty_cooldown
+        self.backoff_factor = backoff_factor
+        self.max_cooldown = max_cooldown
+        self.wake_motion_ratio = wake_motion_ratio
+        self.min_track_confidence = min_track_confidence
+        self.max_detection_age = max_detection_age
+
+        self.last_call = 0.0
+        self.cooldown = 0.0
+        self.cooldown_until = 0.0
+        self.empty_streak = 0
+
+        # 통계
+        self.calls = 0
+        self.empty = 0
+        self.skipped_rate = 0  # 초당 호출 제한으로 생략
+        self.skipped_cooldown = 0  # 빈 감지 후 대기 중이라 생략
+
+    def should_detect(self, motion_ratio=0.0, confidence=None, due=False, now=None):
+        """
+        이번 프레임에서 감지를 실행할지 결정합니다.
+
+        :param motion_ratio: idle 모드 움직임 비율 (0~1)
+        :param confidence: 추적 신뢰도 (0~1, 추적 모드에서만 전달)
+        :param due: 프레임 기준 재감지 주기 도달 여부 (추적 모드)
+        :return: True(감지 실행) / False(생략)
+        """
+        now = time.monotonic() if now is None else now
+        if now - self.last_call < self.min_interval:
+            self.skipped_rate += 1
+            return False
+
+        if confidence is not None:
+            return (
+                due
+                or confidence < self.min_track_confidence
+                or now - self.last_call >= self.max_detection_age
+            )
+
+        if now < self.cooldown_until and motion_ratio < self.wake_motion_ratio:
+            self.skipped_cooldown += 1
+            return False
+        return True
+
+    def record(self, found, now=None, backoff=True):
+        """
+        감지 결과를 기록하고 빈 감지가 이어지면 다음 감지까지의 대기 시간을 늘립니다.
+
+        :param backoff: False면 빈 감지여도 대기 시간을 늘리지 않음 (추적 모드 재감지용.
+            객체가 화면을 떠나며 생긴 빈 재감지가 idle 복귀 후 다음 객체 감지를 늦추지 않도록)
+        """
+        now = time.monotonic() if now is None else now
+        self.last_call = now
+        self.calls += 1
+        if found:
+            self.empty_streak = 0
+            self.cooldown = 0.0
+            self.cooldown_until = 0.0
+            return
+
+        self.empty += 1
+        if not backoff:
+            return
+        self.empty_streak += 1
+        self.cooldown = min(
+            self.empty_cooldown * self.backoff_factor ** (self.empty_streak - 1),
+            self.max_cooldown,
+        )
+        self.cooldown_until = now + self.cooldown
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "empty": self.empty,
+            "skipped_rate": self.skipped_rate,
+            "skipped_cooldown": self.skipped_cooldown,
+            "empty_streak": self.empty_streak,
+            "cooldown_s": round(self.cooldown, 3),
+        }
+
+
+def get_scheduler(stream_id):
+    """스트림의 DetectionScheduler를 반환합니다. (없으면 설정값으로 생성)"""
+    scheduler = schedulers.get(stream_id)
+    if scheduler is None:
+        config = get_setting("detection_schedule", {}) or {}
+        scheduler = schedulers[stream_id] = DetectionScheduler(
+            stream_id,
+            max_calls_per_second=config.get("max_calls_per_second", 10.0),
+            empty_cooldown=config.get("empty_cooldown", 0.2),
+            backoff_factor=config.get("backoff_factor", 2.0),
+            max_cooldown=config.get("max_cooldown", 2.0),
+            wake_motion_ratio=config.get("wake_motion_ratio", 0.05),
+            min_track_confidence=config.get("min_track_confidence", 0.5),
+            max_detection_age=config.get("max_detection_age", 1.0),
+        )
+    return scheduler
+
+
+def scheduler_snapshot():
+    """스트림별 감지 스케줄 통계"""
+    return {stream_id: s.stats() for stream_id, s in schedulers.items()}
@@ -1,12 +0,0 @@
-state = {
-    "mode": "idle",
-    "tracker": None,
-    "bbox": None,
-    "last_seen": None,
-    "ocr_attempts": 0,
-    "ocr_done": False,
-    "start_time": None,
-    "roi_enter_time": None,
-    "ocr_result": None,
-    "failure_message": None,  # <= 추가
-}
@@ -0,0 +1,90 @@
+import asyncio
+import socket
+
+from settings import get_setting
+from metrics import get_stage
+from events import get_events_config
+from shared.broadcaster import Broadcaster, TieredBroadcaster
+
+# 기본 영상 WebSocket 주소 (streams 설정이 없을 때)
+DEFAULT_VIDEO_WS_URL = "ws://127.0.0.1:8000/ws/video"
+
+
+def load_stream_configs():
+    """
+    감지할 카메라 스트림 목록을 설정에서 읽어옵니다.
+
+    :return: [{"id": 스트림 id, "url": 영상 WebSocket 주소, "camera": 카메라 id}, ...]
+    """
+    streams = get_setting("streams") or [{"id": "cam0", "url": DEFAULT_VIDEO_WS_URL}]
+    configs = []
+    for i, s in enumerate(streams):
+        stream_id = str(s.get("id", f"cam{i}"))
+        configs.append(
+            {
+                "id": stream_id,
+                "url": s.get("url", DEFAULT_VIDEO_WS_URL),
+                # Unix 소켓 전송 시 연결할 video_server 카메라 id
+                "camera": str(s.get("camera", stream_id)),
+            }
+        )
+    return configs
+
+
+def get_transport_config():
+    """
+    video_server → 감지 서버 프레임 전달 방식을 반환합니다.
+
+    :return: (type, socket_dir) - type은 "ws"(JPEG), "unix"(원시 프레임),
+             "shm"(공유 메모리 + Unix 소켓 제어 채널)
+    """
+    transport = get_setting("transport", {}) or {}
+    kind = transport.get("type", "ws")
+    if kind in ("unix", "shm") and not hasattr(socket, "AF_UNIX"):
+        print("⚠️ Unix 소켓을 지원하지 않는 환경 → WebSocket 전송 사용")
+        kind = "ws"
+    return kind, transport.get("socket_dir", "/tmp/ocr_dash")
+
+
+class StreamContext:
+    """스트림 하나의 수신/연산/송출 큐와 접속 클라이언트"""
+
+    def __init__(self, stream_id, url, camera_id=None):
+        self.id = stream_id
+        self.url = url
+        self.camera_id = camera_id or stream_id
+        self.frame_queue = asyncio.Queue(maxsize=1)
+        # 공유 메모리 전송 시 처리가 끝난 프레임 슬롯을 돌려주는 콜백
+        self.release_frame = None
+        self.result_queue = asyncio.Queue(maxsize=1)
+
+        # 분석/원본 영상 클라이언트 (클라이언트별 송신 큐)
+        broadcast = get_setting("broadcast", {}) or {}
+        queue_size = broadcast.get("queue_size", 1)
+        max_lag = broadcast.get("max_lag", 2.0)
+        # 영상 클라이언트는 해상도/화질 단계(jpeg.tiers)별로 한 번씩 인코딩
+        jpeg_config = get_setting("jpeg", {}) or {}
+        self.active_ws = TieredBroadcaster(
+            f"annotated:{stream_id}", jpeg_config, queue_size, max_lag
+        )
+        self.active_pass_ws = TieredBroadcaster(
+            f"pass_through:{stream_id}", jpeg_config, queue_size, max_lag
+        )
+        # 오버레이 정보(JSON) 클라이언트: 원본 영상 위에 브라우저가 직접 그림
+        self.overlay_ws = Broadcaster(f"overlay:{stream_id}", queue_size, max_lag)
+        # 감지/추적/OCR 이벤트 클라이언트 (이벤트가 버려지지 않도록 큐를 크게 둠)
+        self.events_format, events_queue, self.events_every_frame = get_events_config()
+        self.events_ws = Broadcaster(f"events:{stream_id}", events_queue, max_lag)
+
+        # 단계별 메트릭 (수신 → 연산 → 송출)
+        self.ingest_stage = get_stage(f"ingest:{stream_id}")
+        self.compute_stage = get_stage(f"compute:{stream_id}", self.frame_queue)
+        self.broadcast_stage = get_stage(f"broadcast:{stream_id}", self.result_queue)
+
+
+def create_streams():
+    """설정된 스트림마다 StreamContext를 생성합니다. (id → StreamContext, 설정 순서 유지)"""
+    return {
+        s["id"]: StreamContext(s["id"], s["url"], s["camera"])
+        for s in load_stream_configs()
+    }
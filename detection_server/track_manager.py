@@ -0,0 +1,340 @@
+import itertools
+import time
+
+import numpy as np
+
+from settings import get_setting
+from tracker import (
+    create_tracker,
+    init_tracker,
+    update_tracker,
+    get_tracker_backend,
+    get_detection_interval,
+    is_detection_tracker,
+)
+from association import associate, iou_matrix
+from roi_checker import is_inside_roi
+from ocr import prepare_crop
+from ocr_pool import get_ocr_pool, cancel_ocr
+from ocr_voting import create_vote
+from crop_quality import get_quality_scorer
+from events import make_event
+from failure_manager import (
+    has_roi_timeout,
+    has_tracking_timeout,
+    exceeded_ocr_retries,
+)
+
+# 객체별 OCR 상태
+OCR_WAITING = "waiting"  # ROI 진입 대기 또는 재시도 대기
+OCR_READING = "reading"  # OCR 작업 진행 중
+OCR_DONE = "done"  # OCR 성공
+OCR_FAILED = "failed"  # 최대 시도 실패
+
+# 모든 스트림에서 유일한 track id (OCR future 키로 사용)
+_track_ids = itertools.count(1)
+
+
+class Track:
+    """추적 중인 객체 하나의 상태"""
+
+    def __init__(self, track_id, bbox, tracker):
+        now = time.time()
+        self.id = track_id
+        self.bbox = tuple(int(v) for v in bbox)
+        self.tracker = tracker
+        self.ocr_state = OCR_WAITING
+        self.ocr_attempts = 0
+        self.quality_rejects = 0  # 품질 기준 미달로 OCR에 넘기지 못한 크롭 수
+        self.ocr_result = None
+        self.vote = create_vote()  # 다중 프레임 투표 (ocr_voting 비활성 시 None)
+        self.start_time = now
+        self.roi_enter_time = None
+        self.last_seen = now
+        self.last_detected = now  # 마지막으로 YOLO 감지와 매칭된 시각
+        self.missed_detections = 0  # 연속으로 재감지와 매칭되지 않은 횟수
+
+
+class TrackManager:
+    """
+    여러 객체의 추적기와 OCR 상태를 track id별로 관리합니다.
+    (기존 전역 state dict / reset_system 대체)
+    """
+
+    def __init__(self, stream_id="default", backend=None):
+        self.stream_id = stream_id
+        self.backend = backend or get_tracker_backend()
+        self.detection_interval = get_detection_interval(self.backend)
+        self.tracks = {}  # track_id → Track
+        self.failure_message = None
+        self.last_ocr_result = None
+        self.frames_since_detection = 0
+        self.events = []  # 이번 프레임에 발생한 이벤트 (drain_events 로 수거)
+
+        self.max_tracks = int(get_setting("max_tracks", 32))
+        self.iou_threshold = float(get_setting("association_iou", 0.3))
+        self.centroid_threshold = float(get_setting("association_centroid", 0.5))
+        self.reinit_iou = float(get_setting("tracker_reinit_iou", 0.5))
+        # OpenCV 추적기가 재감지와 연속으로 매칭되지 않아도 유지할 횟수
+        # (배경에 붙은 추적기나 ROI 앞에서 멈춘 객체 정리, 칼만 추적은 detection_max_misses 사용)
+        self.max_missed_detections = int(get_setting("redetect_max_misses", 3))
+        self.max_quality_rejects = int(
+            (get_setting("ocr_quality", {}) or {}).get("max_rejects", 30)
+        )
+        self.confidence_horizon = float(
+            (get_setting("detection_schedule", {}) or {}).get("confidence_horizon", 2.0)
+        )
+
+    @property
+    def mode(self):
+        return "tracking" if self.tracks else "idle"
+
+    def confidence(self):
+        """
+        추적 신뢰도 (0~1, 가장 낮은 객체 기준).
+        감지로 확인된 지 오래될수록, 재감지에서 놓친 횟수가 많을수록 낮아집니다.
+        """
+        if not self.tracks:
+            return 1.0
+        now = time.time()
+        lowest = 1.0
+        for track in self.tracks.values():
+            age = now - track.last_detected
+            value = max(0.0, 1.0 - age / self.confidence_horizon)
+            if is_detection_tracker(track.tracker):
+                value *= 1.0 - track.tracker.misses / (track.tracker.max_misses + 1)
+            else:
+                value *= 1.0 - track.missed_detections / (
+                    self.max_missed_detections + 1
+                )
+            lowest = min(lowest, value)
+        return lowest
+
+    def spawn(self, frame, bbox):
+        """새 객체 추적을 시작합니다."""
+        if len(self.tracks) >= self.max_tracks:
+            return None
+
+        bbox = tuple(int(v) for v in bbox)
+        tracker = create_tracker(self.backend)
+        if not init_tracker(tracker, frame, bbox):
+            return None
+
+        track = Track(next(_track_ids), bbox, tracker)
+        self.tracks[track.id] = track
+        self.failure_message = None
+        print(f"🎯 추적 시작 ({self.stream_id} track {track.id})", flush=True)
+        self.emit("track_started", track=track.id, bbox=list(track.bbox))
+        return track
+
+    def emit(self, kind, **fields):
+        """이벤트를 기록합니다. (/ws/events 송출용)"""
+        self.events.append(make_event(kind, **fields))
+
+    def drain_events(self):
+        """기록된 이벤트를 꺼내고 비웁니다."""
+        events, self.events = self.events, []
+        return events
+
+    def update_trackers(self, frame):
+        """모든 객체의 추적기를 갱신하고 추적에 실패한 객체를 제거합니다."""
+        now = time.time()
+        for track in list(self.tracks.values()):
+            success, bbox = update_tracker(track.tracker, frame)
+            if success:
+                track.bbox = tuple(int(v) for v in bbox)
+                track.last_seen = now
+            else:
+                self.drop(track, "추적 실패")
+
+    def apply_detections(self, frame, det_boxes):
+        """
+        YOLO 감지 결과를 기존 객체와 매칭합니다.
+        매칭된 객체는 박스를 보정하고, 매칭되지 않은 감지는 새 객체로 추적합니다.
+
+        :param frame: 현재 프레임
+        :param det_boxes: (N, 4) (x, y, w, h) 감지 박스
+        """
+        self.frames_since_detection = 0
+        tracks = list(self.tracks.values())
+        track_boxes = [t.bbox for t in tracks]
+        matches, unmatched_tracks, unmatched_dets = associate(
+            track_boxes, det_boxes, self.iou_threshold, self.centroid_threshold
+        )
+
+        now = time.time()
+        if matches:
+            t_idx = np.array([t for t, _ in matches])
+            d_idx = np.array([d for _, d in matches])
+            overlap = iou_matrix(
+                np.asarray(track_boxes)[t_idx], np.asarray(det_boxes)[d_idx]
+            ).diagonal()
+            for (t, d), iou in zip(matches, overlap):
+                track = tracks[t]
+                track.bbox = tuple(int(v) for v in det_boxes[d])
+                track.last_seen = now
+                track.last_detected = now
+                track.missed_detections = 0
+                if is_detection_tracker(track.tracker):
+                    track.tracker.correct(track.bbox)
+                # 추적기가 크게 어긋난 경우에만 감지 박스로 재초기화
+                elif iou < self.reinit_iou:
+                    tracker = create_tracker(self.backend)
+                    if init_tracker(tracker, frame, track.bbox):
+                        track.tracker = tracker
+
+        # 재감지에서 연속으로 매칭되지 않은 객체는 추적 종료
+        # (tracking-by-detection 은 update()에서 추적 실패 처리)
+        for t in unmatched_tracks:
+            track = tracks[t]
+            track.missed_detections += 1
+            if is_detection_tracker(track.tracker):
+                track.tracker.mark_missed()
+            elif track.missed_detections > self.max_missed_detections:
+                self.drop(track, "재감지 실패")
+
+        for d in unmatched_dets:
+            self.spawn(frame, det_boxes[d])
+
+    def update_ocr(self, frame):
+        """
+        객체별 OCR 상태 머신을 한 단계 진행합니다.
+
+        :param frame: 오버레이가 그려지지 않은 원본 프레임 (OCR 크롭용)
+        """
+        ocr_pool = get_ocr_pool()
+        scorer = get_quality_scorer(self.stream_id)
+
+        for track in list(self.tracks.values()):
+            # 백그라운드에서 끝난 OCR 결과 반영
+            if track.ocr_state == OCR_READING:
+                finished, (ocr_result, confidence) = ocr_pool.poll(track.id)
+                if finished:
+                    track.ocr_attempts += 1
+                    if track.vote is not None:
+                        track.vote.add(ocr_result, confidence)
+                        ocr_result = track.vote.result()
+                        failed = ocr_result is None and track.vote.exhausted()
+                    else:
+                        failed = exceeded_ocr_retries(track)
+
+                    if ocr_result:
+                        track.ocr_state = OCR_DONE
+                        track.ocr_result = ocr_result
+                        self.last_ocr_result = ocr_result
+                        print(f"✅ OCR 성공 (track {track.id}): {ocr_result}")
+                        self.emit(
+                            "ocr_result",
+                            track=track.id,
+                            text=ocr_result,
+                            attempts=track.ocr_attempts,
+                        )
+                    elif failed:
+                        print(f"❌ OCR 최대 시도 실패 (track {track.id})")
+                        self.fail_ocr(track, "OCR 실패")
+                        continue
+                    else:
+                        track.ocr_state = OCR_WAITING
+
+            inside = is_inside_roi(track.bbox)
+            if inside and track.ocr_state != OCR_DONE:
+                track.roi_enter_time = track.roi_enter_time or time.time()
+                # 진행 중인 작업이 없을 때만 새 OCR 작업 제출 (추적은 계속 진행)
+                crop = None
+                if track.vote is not None or track.ocr_state == OCR_WAITING:
+                    candidate = prepare_crop(frame, track.bbox)
+                    score = 0.0
+                    if candidate is not None:
+                        # 품질 점수가 기준 미만인 크롭(흐림/노출 불량/작음)은 OCR에 넘기지 않음
+                        score, passed = scorer.score(candidate, track.bbox)
+                        if not passed:
+                            candidate = None
+                            track.quality_rejects += 1
+                    if track.vote is not None:
+                        # 투표 모드: 매 프레임 후보를 모으고 구간 내 가장 좋은 크롭만 제출
+                        track.vote.offer(candidate, score)
+                        if track.ocr_state == OCR_WAITING:
+                            crop = track.vote.take()
+                    else:
+                        crop = candidate
+                if crop is not None:
+                    ocr_pool.submit(track.id, crop)
+                    track.ocr_state = OCR_READING
+                elif (
+                    track.ocr_state == OCR_WAITING
+                    and track.quality_rejects >= self.max_quality_rejects
+                ):
+                    # 품질 미달 크롭만 계속 들어오면 OCR 시도 없이 실패 처리
+                    print(f"❌ OCR 크롭 품질 미달 (track {track.id})")
+                    self.fail_ocr(track, "OCR 크롭 품질 미달")
+                    continue
+
+            # ROI 체류 시간 초과: ROI 밖으로 나갔거나, ROI 안에서도 OCR을 끝내지 못한 경우
+            # (ROI 안에서 진행 중인 OCR 작업은 결과를 기다림)
+            if has_roi_timeout(track) and not (
+                inside and track.ocr_state == OCR_READING
+            ):
+                if track.ocr_state == OCR_DONE:
+                    self.drop(track)
+                elif inside:
+                    print(f"⌛ ROI 체류 시간 초과 (track {track.id})")
+                    self.fail_ocr(track, "ROI 체류 시간 초과")
+                else:
+                    print(f"⌛ ROI 진입 실패 (track {track.id})")
+                    self.drop(track, "ROI 진입 실패")
+            elif track.roi_enter_time is None and has_tracking_timeout(track):
+                # ROI에 한 번도 들어오지 않은 채 detection_grace_period 가 지난 객체
+                print(f"⌛ ROI 진입 실패 (track {track.id})")
+                self.drop(track, "ROI 진입 실패")
+
+    def fail_ocr(self, track, reason):
+        """OCR 실패로 객체 추적을 종료합니다."""
+        track.ocr_state = OCR_FAILED
+        self.emit(
+            "ocr_failed",
+            track=track.id,
+            attempts=track.ocr_attempts,
+            rejected=track.quality_rejects,
+            reason=reason,
+        )
+        self.drop(track, reason)
+
+    def drop(self, track, reason=None):
+        """
+        객체 추적을 종료합니다.
+
+        :param track: 제거할 Track
+        :param reason: 실패 사유 (완료로 종료하는 경우 None)
+        """
+        if reason:
+            print(f"🔄 추적 종료 (track {track.id}): {reason}", flush=True)
+            self.failure_message = reason
+        else:
+            print(f"🔄 추적 종료 (track {track.id}): 완료", flush=True)
+        self.emit(
+            "track_ended",
+            track=track.id,
+            reason=reason,
+            ocr_result=track.ocr_result,
+        )
+
+        cancel_ocr(track.id)
+        track.tracker = None
+        self.tracks.pop(track.id, None)
+
+        if not self.tracks:
+            self.reset()
+
+    def reset(self, reason=None):
+        """모든 추적을 종료합니다."""
+        if reason:
+            print(f"🔄 시스템 상태 초기화: {reason}", flush=True)
+            self.failure_message = reason
+            self.emit("reset", reason=reason)
+
+        for track in list(self.tracks.values()):
+            cancel_ocr(track.id)
+            track.tracker = None
+        self.tracks.clear()
+        self.last_ocr_result = None
+        self.frames_since_detection = 0
@@ -1,15 +1,56 @@
 import cv2
+from settings import get_setting
+from kalman import KalmanBoxTracker
 
+# 사용 가능한 추적기 종류
+TRACKER_BACKENDS = ("csrt", "kcf", "mosse", "detection")
 
-def create_tracker():
+
+def get_tracker_backend():
+    """설정에서 추적기 종류를 읽어옵니다. (기본값 csrt)"""
+    backend = str(get_setting("tracker_backend", "csrt")).lower()
+    if backend not in TRACKER_BACKENDS:
+        print(f"⚠️ 알 수 없는 추적기: {backend} → csrt 사용", flush=True)
+        backend = "csrt"
+    return backend
+
+
+def get_detection_interval(backend=None):
     """
-    OpenCV Tracker 객체를 생성합니다. (CSRT 사용)
+    추적 중 YOLO 재감지 간격(프레임)을 반환합니다.
+    tracking-by-detection 모드는 감지가 유일한 관측이므로 별도 간격(detection_interval)을 사용합니다.
+    """
+    backend = backend or get_tracker_backend()
+    if backend == "detection":
+        return max(1, int(get_setting("detection_interval", 3)))
+    return max(1, int(get_setting("redetect_interval", 5)))
+
 
+def create_tracker(backend=None):
+    """
+    Tracker 객체를 생성합니다.
+
+    :param backend: "csrt" / "kcf" / "mosse" / "detection" (None이면 설정값 사용)
     :return: tracker 객체
     """
+    backend = backend or get_tracker_backend()
+    if backend == "kcf":
+        return cv2.TrackerKCF_create()
+    if backend == "mosse":
+        return cv2.legacy.TrackerMOSSE_create()
+    if backend == "detection":
+        return KalmanBoxTracker(
+            int(get_setting("detection_max_misses", 3)),
+            get_setting("detection_max_coast", 30),
+        )
     return cv2.TrackerCSRT_create()
 
 
+def is_detection_tracker(tracker):
+    """감지 결과로만 보정되는 추적기인지 여부"""
+    return isinstance(tracker, KalmanBoxTracker)
+
+
 def init_tracker(tracker, frame, bbox):
     """
     Tracker를 초기화합니다.
@@ -19,7 +60,9 @@ def init_tracker(tracker, frame, bbox):
     :param bbox: (x, y, w, h) 형식의 초기 바운딩 박스
     :return: 초기화 성공 여부 (bool)
     """
-    return tracker.init(frame, bbox)
+    # OpenCV 4.5.3+ 추적기는 init()이 None을 반환함 (legacy 추적기는 bool)
+    result = tracker.init(frame, tuple(int(v) for v in bbox))
+    return result is None or bool(result)
 
 
 def update_tracker(tracker, frame):
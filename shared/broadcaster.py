@@ -0,0 +1,368 @@
+import asyncio
+import itertools
+import json
+import time
+
+from shared.jpeg_encoder import JpegEncoder, get_encode_stats, load_tiers
+
+# 클라이언트 표시용 일련번호
+_client_ids = itertools.count(1)
+
+
+class ClientChannel:
+    """
+    클라이언트 하나의 송신 큐와 통계.
+    큐가 가득 차면 가장 오래된 프레임을 버리고 최신 프레임을 넣습니다. (newest-wins)
+    """
+
+    def __init__(self, websocket, queue_size):
+        self.id = next(_client_ids)
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.task = None
+        self.sent = 0
+        self.dropped = 0
+        self.fps = 0.0
+        self.send_started = None  # 진행 중인 send 시작 시각 (지연 판정용)
+        self._window_start = time.monotonic()
+        self._window_sent = 0
+
+    def offer(self, data):
+        """프레임을 큐에 넣습니다. 밀린 프레임은 버립니다."""
+        while self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                break
+        self.queue.put_nowait(data)
+
+    def lag(self, now):
+        """현재 진행 중인 send가 걸리고 있는 시간(초)"""
+        return now - self.send_started if self.send_started is not None else 0.0
+
+    def record_sent(self, now):
+        self.sent += 1
+        self._window_sent += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.fps = self._window_sent / elapsed
+            self._window_start = now
+            self._window_sent = 0
+
+    def stats(self, now):
+        return {
+            "id": self.id,
+            "fps": round(self.fps, 1),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "lag_ms": round(self.lag(now) * 1000.0, 1),
+        }
+
+
+class Broadcaster:
+    """
+    한 번 인코딩한 프레임(또는 JSON 문자열)을 여러 WebSocket 클라이언트에게 동시에 송출합니다.
+    클라이언트마다 별도 송신 태스크와 크기 제한 큐를 두어 느린 클라이언트가
+    다른 클라이언트나 캡처/처리 루프를 지연시키지 않으며,
+    send 하나가 max_lag 초 이상 걸리는 클라이언트는 연결을 끊습니다.
+    """
+
+    def __init__(self, name, queue_size=1, max_lag=2.0):
+        self.name = name
+        self.queue_size = queue_size
+        self.max_lag = max_lag
+        self.evicted = 0
+        self._channels = {}  # websocket → ClientChannel
+
+    def __len__(self):
+        return len(self._channels)
+
+    def __bool__(self):
+        return bool(self._channels)
+
+    def __contains__(self, websocket):
+        return websocket in self._channels
+
+    def add(self, websocket):
+        """클라이언트를 등록하고 송신 태스크를 시작합니다."""
+        if websocket in self._channels:
+            return self._channels[websocket]
+        channel = ClientChannel(websocket, self.queue_size)
+        channel.task = asyncio.create_task(self._sender(channel))
+        self._channels[websocket] = channel
+        return channel
+
+    def remove(self, websocket):
+        """클라이언트 등록을 해제하고 송신 태스크를 중지합니다."""
+        channel = self._channels.pop(websocket, None)
+        if channel is not None and channel.task is not None:
+            channel.task.cancel()
+        return channel
+
+    def publish(self, data):
+        """모든 클라이언트 큐에 프레임을 넣고, 지연이 큰 클라이언트를 내보냅니다."""
+        now = time.monotonic()
+        for websocket, channel in list(self._channels.items()):
+            if self.max_lag and channel.lag(now) > self.max_lag:
+                self._evict(websocket, channel)
+                continue
+            channel.offer(data)
+
+    def _evict(self, websocket, channel):
+        print(
+            f"🐢 [{self.name}] 느린 클라이언트 연결 해제 (client {channel.id}, "
+            f"지연 {channel.lag(time.monotonic()):.1f}s)",
+            flush=True,
+        )
+        self.evicted += 1
+        self.remove(websocket)
+        asyncio.create_task(self._close(websocket))
+
+    async def _close(self, websocket):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+    async def _sender(self, channel):
+        websocket = channel.websocket
+        try:
+            while True:
+                data = await channel.queue.get()
+                channel.send_started = time.monotonic()
+                if isinstance(data, str):
+                    await websocket.send_text(data)
+                else:
+                    await websocket.send_bytes(data)
+                channel.send_started = None
+                channel.record_sent(time.monotonic())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"💥 [{self.name}] 송신 중 예외 발생 (client {channel.id}): {e}")
+            # 현재 태스크 자신은 취소하지 않고 등록만 해제
+            self._channels.pop(websocket, None)
+            await self._close(websocket)
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "clients": [channel.stats(now) for channel in self._channels.values()],
+            "evicted": self.evicted,
+        }
+
+
+# 클라이언트가 첫 메시지로 보낼 수 있는 송출 프로필 항목
+PROFILE_KEYS = ("max_fps", "max_width", "quality")
+
+
+def parse_profile(message):
+    """
+    클라이언트 메시지에서 송출 프로필을 읽습니다.
+
+    :param message: "ping" 또는 JSON ({"tier": "thumbnail"} / {"max_fps", "max_width", "quality"})
+    :return: 단계 이름(str), 프로필 dict 또는 None (프로필 아님)
+    """
+    try:
+        data = json.loads(message)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    profile = {key: data[key] for key in PROFILE_KEYS if data.get(key) is not None}
+    if profile:
+        return profile
+    tier = data.get("tier")
+    # 단계 이름은 문자열만 허용 (그 외 값은 프로필 아님 → 현재 송출 방식 유지)
+    return tier if isinstance(tier, str) else None
+
+
+class _Variant:
+    """같은 프로필 클라이언트들이 공유하는 인코더/송출 대상과 fps 제한"""
+
+    def __init__(self, name, broadcaster, encoder, max_fps=None):
+        self.name = name
+        self.broadcaster = broadcaster
+        self.encoder = encoder
+        self.interval = 1.0 / max_fps if max_fps else 0.0
+        self.last_sent = 0.0
+
+    def due(self, now):
+        """max_fps 간격이 지났는지 여부 (지났으면 송출 시각 갱신)"""
+        if self.interval and now - self.last_sent < self.interval:
+            return False
+        self.last_sent = now
+        return True
+
+
+class TieredBroadcaster:
+    """
+    송출 프로필(최대 fps, 최대 폭, 화질)별 Broadcaster 묶음.
+    프로필은 설정된 단계(jpeg.tiers) 이름이나 클라이언트가 보낸 값으로 정하며,
+    같은 프로필의 클라이언트는 프레임당 한 번 인코딩한 결과를 함께 받습니다.
+    """
+
+    def __init__(self, name, jpeg_config=None, queue_size=1, max_lag=2.0):
+        self.name = name
+        self.jpeg_config = jpeg_config or {}
+        self.tiers = load_tiers(self.jpeg_config)
+        self.default_tier = next(iter(self.tiers))
+        self.backend = self.jpeg_config.get("backend", "auto")
+        # 동시에 유지하는 프로필 수 상한 (넘으면 기본 단계로 송출 → 인코딩 비용 제한)
+        self.max_variants = int(self.jpeg_config.get("max_profiles", 8))
+        self.queue_size = queue_size
+        self.max_lag = max_lag
+        self._variants = {}  # (max_width, quality, max_fps) → _Variant
+        self._key_of = {}  # websocket → 프로필 키
+
+    def __len__(self):
+        return sum(len(variant.broadcaster) for variant in self._variants.values())
+
+    def __bool__(self):
+        return any(variant.broadcaster for variant in self._variants.values())
+
+    def __contains__(self, websocket):
+        key = self._key_of.get(websocket)
+        return key is not None and websocket in self._variants[key].broadcaster
+
+    def _resolve(self, profile):
+        """
+        단계 이름/프로필 dict를 (이름, 프로필 키)로 바꿉니다. 값은 허용 범위로 제한합니다.
+        """
+        if not isinstance(profile, dict):
+            if not isinstance(profile, str) or profile not in self.tiers:
+                if profile is not None:
+                    print(
+                        f"⚠️ [{self.name}] 알 수 없는 단계 {profile} → {self.default_tier}"
+                    )
+                profile = self.default_tier
+            name, settings = profile, self.tiers[profile]
+        else:
+            name, settings = None, profile
+
+        try:
+            max_width = settings.get("max_width")
+            max_width = max(32, int(max_width)) if max_width else None
+            quality = settings.get("quality")
+            quality = min(100, max(10, int(quality))) if quality else None
+            max_fps = settings.get("max_fps")
+            max_fps = min(60.0, max(0.1, float(max_fps))) if max_fps else None
+        except (TypeError, ValueError, OverflowError):
+            print(f"⚠️ [{self.name}] 잘못된 프로필 {settings} → {self.default_tier}")
+            return self._resolve(None)
+
+        key = (max_width, quality, max_fps)
+        if name is None:
+            name = f"w{max_width or 'full'}_q{quality or 'src'}_f{max_fps or 'max'}"
+        return name, key
+
+    def _variant(self, profile):
+        name, key = self._resolve(profile)
+        variant = self._variants.get(key)
+        if variant is not None:
+            return key, variant
+
+        if len(self._variants) >= self.max_variants:
+            # 구독자가 없는 프로필을 정리하고도 넘치면 기본 단계 사용
+            for stale in [k for k, v in self._variants.items() if not v.broadcaster]:
+                del self._variants[stale]
+            if len(self._variants) >= self.max_variants:
+                print(
+                    f"⚠️ [{self.name}] 프로필 수 상한({self.max_variants}) → 기본 단계"
+                )
+                name, key = self._resolve(None)
+                variant = self._variants.get(key)
+                if variant is not None:
+                    return key, variant
+
+        max_width, quality, max_fps = key
+        variant = self._variants[key] = _Variant(
+            name,
+            Broadcaster(f"{self.name}:{name}", self.queue_size, self.max_lag),
+            JpegEncoder(
+                quality,
+                max_width,
+                self.backend,
+                get_encode_stats(f"{self.name}:{name}"),
+            ),
+            max_fps,
+        )
+        return key, variant
+
+    def add(self, websocket, profile=None):
+        """
+        클라이언트를 프로필에 등록합니다. 이미 등록된 클라이언트는 새 프로필로 옮깁니다.
+
+        :param profile: 단계 이름, parse_profile() 결과 dict 또는 None (기본 단계)
+        """
+        key, variant = self._variant(profile)
+        if self._key_of.get(websocket) != key:
+            self.remove(websocket)
+        self._key_of[websocket] = key
+        return variant.broadcaster.add(websocket)
+
+    def remove(self, websocket):
+        key = self._key_of.pop(websocket, None)
+        if key is None or key not in self._variants:
+            return None
+        return self._variants[key].broadcaster.remove(websocket)
+
+    def due_variants(self, encoded=None):
+        """
+        구독자가 있고 max_fps 간격이 지난 프로필을 고릅니다. (이벤트 루프에서 호출)
+
+        :param encoded: 이미 인코딩된 원본 JPEG (있으면 화질/크기 지정이 없는 프로필에 바로 전달)
+        :return: 인코딩이 필요한 프로필 목록
+        """
+        now = time.monotonic()
+        pending = []
+        for variant in list(self._variants.values()):
+            if not variant.broadcaster or not variant.due(now):
+                continue
+            if encoded is not None and variant.encoder.passthrough:
+                variant.broadcaster.publish(encoded)
+            else:
+                pending.append(variant)
+        return pending
+
+    @staticmethod
+    def encode_variants(variants, frame):
+        """프로필마다 프레임을 한 번씩 인코딩합니다. (워커 스레드에서 호출 가능)"""
+        return [variant.encoder.encode(frame) for variant in variants]
+
+    @staticmethod
+    def publish_encoded(variants, results):
+        """인코딩 결과를 프로필별 클라이언트 큐에 넣습니다. (이벤트 루프에서 호출)"""
+        for variant, data in zip(variants, results):
+            if data is not None:
+                variant.broadcaster.publish(data)
+
+    async def publish_frame(self, frame, encoded=None):
+        """
+        구독자가 있는 프로필마다 (max_fps 간격이 지났으면) 프레임을 인코딩해 송출합니다.
+        CPU를 쓰는 JPEG 인코딩은 프로필마다 한 번씩 스레드에서 병렬로 실행하므로
+        이벤트 루프의 수신/송출 태스크를 막지 않습니다.
+        (frame 은 완료될 때까지 덮어쓰지 않아야 함)
+
+        :param frame: BGR 프레임
+        :param encoded: 이미 인코딩된 원본 JPEG (있으면 화질/크기 지정이 없는 프로필에 그대로 전달)
+        """
+        pending = self.due_variants(encoded)
+        if not pending:
+            return
+        results = await asyncio.gather(
+            *(asyncio.to_thread(variant.encoder.encode, frame) for variant in pending)
+        )
+        self.publish_encoded(pending, results)
+
+    def stats(self):
+        clients = []
+        evicted = 0
+        for variant in self._variants.values():
+            stats = variant.broadcaster.stats()
+            clients += [
+                dict(client, profile=variant.name) for client in stats["clients"]
+            ]
+            evicted += stats["evicted"]
+        return {"clients": clients, "evicted": evicted}
@@ -0,0 +1,56 @@
+import os
+import struct
+
+import numpy as np
+
+# 원시 프레임 헤더: seq, 캡처 시각(time.time), height, width, channels
+FRAME_HEADER = struct.Struct("<QdIII")
+
+
+def socket_path(socket_dir, camera_id):
+    """카메라별 Unix 소켓 경로"""
+    return os.path.join(socket_dir, f"{camera_id}.sock")
+
+
+def pack_frame(seq, timestamp, frame):
+    """
+    원시 프레임을 (헤더, 본문) 으로 직렬화합니다. (JPEG 인코딩 없음)
+
+    :param frame: (H, W, C) uint8 BGR 이미지
+    :return: (header bytes, body bytes)
+    """
+    h, w = frame.shape[:2]
+    c = frame.shape[2] if frame.ndim == 3 else 1
+    return FRAME_HEADER.pack(seq, timestamp, h, w, c), frame.tobytes()
+
+
+async def read_frame(reader):
+    """
+    Unix 소켓에서 원시 프레임 하나를 읽습니다.
+
+    :return: (seq, 캡처 시각, (H, W, C) uint8 배열)
+    """
+    header = await reader.readexactly(FRAME_HEADER.size)
+    seq, timestamp, h, w, c = FRAME_HEADER.unpack(header)
+    body = await reader.readexactly(h * w * c)
+    frame = np.frombuffer(body, dtype=np.uint8).reshape(h, w, c)
+    return seq, timestamp, frame
+
+
+class UnixFrameClient:
+    """
+    Unix 소켓 구독자를 Broadcaster에 등록하기 위한 어댑터.
+    (WebSocket과 같은 send_bytes/close 인터페이스)
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    async def send_bytes(self, data):
+        header, body = data
+        self.writer.write(header)
+        self.writer.write(body)
+        await self.writer.drain()
+
+    async def close(self):
+        self.writer.close()
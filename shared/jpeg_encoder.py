@@ -0,0 +1,168 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+try:
+    import simplejpeg  # libjpeg-turbo 기반 (설치된 경우 OpenCV보다 빠름)
+except ImportError:
+    simplejpeg = None
+
+# 지원하는 JPEG 인코딩 백엔드
+JPEG_BACKENDS = ("auto", "opencv", "simplejpeg")
+
+# quality 미지정 시 화질 (cv2.imencode 기본값과 같음)
+DEFAULT_QUALITY = 95
+
+# 해상도/화질 단계 (jpeg.tiers 설정이 없을 때)
+# quality/max_width 가 모두 null 인 단계는 이미 인코딩된 원본 JPEG가 있으면 그대로 전달
+DEFAULT_TIERS = {
+    "full": {"quality": None, "max_width": None},
+    "thumbnail": {"quality": 60, "max_width": 320},
+}
+
+
+class EncodeStats:
+    """엔드포인트(송출 대상) 하나의 JPEG 인코딩 건수, 시간, 크기"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.avg_kb = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_sec, size):
+        ms = elapsed_sec * 1000.0
+        kb = size / 1024.0
+        with self._lock:
+            self.count += 1
+            # 지수 이동 평균 (최근 값에 가중치)
+            first = self.count == 1
+            self.avg_ms = ms if first else self.avg_ms * 0.9 + ms * 0.1
+            self.avg_kb = kb if first else self.avg_kb * 0.9 + kb * 0.1
+            self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.avg_ms, 2),
+                "max_ms": round(self.max_ms, 2),
+                "avg_kb": round(self.avg_kb, 1),
+            }
+
+
+# 엔드포인트 이름 → EncodeStats
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def get_encode_stats(name):
+    with _stats_lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = EncodeStats(name)
+        return stats
+
+
+def encode_snapshot():
+    """엔드포인트별 인코딩 통계 (/metrics, /stats 노출용)"""
+    with _stats_lock:
+        items = list(_stats.items())
+    return {name: stats.snapshot() for name, stats in items}
+
+
+def resolve_backend(backend="auto"):
+    """설정된 백엔드를 실제 사용할 백엔드로 바꿉니다. (simplejpeg 미설치 시 opencv)"""
+    if backend not in JPEG_BACKENDS:
+        raise ValueError(
+            f"지원하지 않는 JPEG 백엔드: {backend} (사용 가능: {JPEG_BACKENDS})"
+        )
+    if backend == "auto":
+        return "simplejpeg" if simplejpeg is not None else "opencv"
+    if backend == "simplejpeg" and simplejpeg is None:
+        print("⚠️ simplejpeg 미설치 → OpenCV로 JPEG 인코딩합니다.", flush=True)
+        return "opencv"
+    return backend
+
+
+def load_tiers(jpeg_config):
+    """:return: 단계 이름 → {"quality", "max_width", "max_fps"} (설정 순서 유지, 첫 번째가 기본 단계)"""
+    return (jpeg_config or {}).get("tiers") or DEFAULT_TIERS
+
+
+class JpegEncoder:
+    """
+    화질/최대 폭을 지정한 JPEG 인코더.
+    축소 결과 버퍼를 재사용하며, stats 가 주어지면 인코딩 시간과 크기를 기록합니다.
+    (동시에 한 스레드에서만 사용)
+    """
+
+    def __init__(self, quality=None, max_width=None, backend="auto", stats=None):
+        self.quality = int(quality) if quality else DEFAULT_QUALITY
+        self.max_width = int(max_width) if max_width else None
+        self.backend = resolve_backend(backend)
+        self.stats = stats
+        # 원본 JPEG를 그대로 전달해도 되는 단계 (화질/크기 지정 없음)
+        self.passthrough = not quality and not max_width
+        self._params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        self._resized = None
+
+    def _scale(self, frame):
+        """max_width 보다 넓으면 비율을 유지해 줄입니다. (결과 버퍼 재사용)"""
+        h, w = frame.shape[:2]
+        if not self.max_width or w <= self.max_width:
+            return frame
+        size = (self.max_width, max(1, int(round(h * self.max_width / w))))
+        shape = (size[1], size[0]) + frame.shape[2:]
+        if self._resized is None or self._resized.shape != shape:
+            self._resized = np.empty(shape, dtype=frame.dtype)
+        cv2.resize(frame, size, dst=self._resized, interpolation=cv2.INTER_AREA)
+        return self._resized
+
+    def encode(self, frame):
+        """
+        :param frame: BGR 또는 그레이 프레임
+        :return: JPEG bytes 또는 None (인코딩 실패)
+        """
+        start = time.perf_counter()
+        image = self._scale(frame)
+        if self.backend == "simplejpeg":
+            image = np.ascontiguousarray(image)
+            if image.ndim == 2:
+                data = simplejpeg.encode_jpeg(
+                    image[:, :, None], quality=self.quality, colorspace="GRAY"
+                )
+            else:
+                data = simplejpeg.encode_jpeg(
+                    image, quality=self.quality, colorspace="BGR"
+                )
+        else:
+            success, buffer = cv2.imencode(".jpg", image, self._params)
+            data = buffer.tobytes() if success else None
+
+        if data is not None and self.stats is not None:
+            self.stats.observe(time.perf_counter() - start, len(data))
+        return data
+
+
+def create_encoder(name, tier=None, jpeg_config=None):
+    """
+    설정(jpeg)에 따른 단계별 인코더를 만듭니다.
+
+    :param name: 송출 대상 이름 (통계 키: "name:tier")
+    :param tier: 단계 이름 (None이면 첫 번째 단계)
+    """
+    jpeg_config = jpeg_config or {}
+    tiers = load_tiers(jpeg_config)
+    tier = tier or next(iter(tiers))
+    settings = tiers[tier]
+    return JpegEncoder(
+        settings.get("quality"),
+        settings.get("max_width"),
+        jpeg_config.get("backend", "auto"),
+        get_encode_stats(f"{name}:{tier}"),
+    )
@@ -0,0 +1,229 @@
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# 세그먼트 헤더: 슬롯 수, 슬롯당 최대 프레임 크기(bytes)
+SEGMENT_HEADER = struct.Struct("<IQ")
+# 슬롯 헤더: seq, 캡처 시각(time.time), height, width, channels
+SLOT_HEADER = struct.Struct("<QdIII")
+
+# 제어 채널 메시지 (Unix 소켓)
+# video_server → 감지 서버: 프레임 준비 (seq, 캡처 시각, 세대, 슬롯)
+FRAME_READY = struct.Struct("<QdII")
+# 감지 서버 → video_server: 슬롯 사용 완료 (세대, 슬롯)
+FRAME_RELEASE = struct.Struct("<II")
+
+
+def shm_name(camera_id, generation):
+    """카메라/세대별 공유 메모리 이름 (해상도가 커지면 세대를 올려 새로 만듦)"""
+    return f"ocr_dash_{camera_id}_{generation}"
+
+
+def _slot_stride(slot_size):
+    return SLOT_HEADER.size + slot_size
+
+
+def _frame_view(shm, slot, slot_size, shape):
+    offset = SEGMENT_HEADER.size + slot * _slot_stride(slot_size) + SLOT_HEADER.size
+    return np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+
+
+class ShmFrameWriter:
+    """
+    video_server 쪽 공유 메모리 프레임 링.
+    최신 슬롯과 감지 서버가 사용 중인 슬롯은 덮어쓰지 않으며,
+    감지 서버는 제어 채널로 받은 슬롯을 복사 없이 numpy 뷰로 읽습니다.
+    """
+
+    def __init__(self, camera_id, slots=4):
+        self.camera_id = camera_id
+        self.slots = max(3, slots)
+        self.generation = 0
+        self.slot_size = 0
+        self.shm = None
+        self.written = 0
+        self.dropped = 0  # 빈 슬롯이 없어 쓰지 못한 프레임 수
+        self._seqs = [0] * self.slots
+        self._busy = [0] * self.slots
+        self._latest = -1
+        self._write_index = 0
+
+    def _allocate(self, size):
+        """프레임이 현재 슬롯보다 크면 세그먼트를 새 세대로 다시 만듭니다."""
+        self.close()
+        self.generation += 1
+        self.slot_size = size
+        self.shm = shared_memory.SharedMemory(
+            name=shm_name(self.camera_id, self.generation),
+            create=True,
+            size=SEGMENT_HEADER.size + self.slots * _slot_stride(size),
+        )
+        SEGMENT_HEADER.pack_into(self.shm.buf, 0, self.slots, size)
+        self._seqs = [0] * self.slots
+        self._busy = [0] * self.slots
+        self._latest = -1
+
+    def write(self, seq, timestamp, frame):
+        """
+        프레임을 빈 슬롯에 복사합니다.
+
+        :return: 제어 채널로 보낼 (seq, 캡처 시각, 세대, 슬롯) 또는 None(빈 슬롯 없음)
+        """
+        frame = np.ascontiguousarray(frame)
+        if frame.ndim == 2:
+            frame = frame[:, :, None]
+        if self.shm is None or frame.nbytes > self.slot_size:
+            self._allocate(frame.nbytes)
+
+        slot = None
+        for _ in range(self.slots):
+            index = self._write_index
+            self._write_index = (self._write_index + 1) % self.slots
+            if index != self._latest and not self._busy[index]:
+                slot = index
+                break
+        if slot is None:
+            self.dropped += 1
+            return None
+
+        h, w, c = frame.shape
+        header_offset = SEGMENT_HEADER.size + slot * _slot_stride(self.slot_size)
+        SLOT_HEADER.pack_into(self.shm.buf, header_offset, seq, timestamp, h, w, c)
+        np.copyto(_frame_view(self.shm, slot, self.slot_size, frame.shape), frame)
+        self._seqs[slot] = seq
+        self._latest = slot
+        self.written += 1
+        return seq, timestamp, self.generation, slot
+
+    def is_current(self, generation, slot, seq):
+        """큐에서 기다리는 사이 슬롯이 덮어써지지 않았는지 확인합니다."""
+        return generation == self.generation and self._seqs[slot] == seq
+
+    def hold(self, slot):
+        self._busy[slot] += 1
+
+    def release(self, generation, slot):
+        """감지 서버가 사용을 마친 슬롯을 돌려받습니다. (이전 세대는 무시)"""
+        if generation == self.generation and self._busy[slot] > 0:
+            self._busy[slot] -= 1
+
+    def stats(self):
+        return {
+            "generation": self.generation,
+            "slot_bytes": self.slot_size,
+            "written": self.written,
+            "dropped": self.dropped,
+            "busy": sum(1 for busy in self._busy if busy),
+        }
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class ShmFrameReader:
+    """
+    감지 서버 쪽 공유 메모리 프레임 리더.
+    FRAME_READY 메시지의 슬롯을 읽기 전용 numpy 뷰로 반환하고,
+    사용이 끝나면 FRAME_RELEASE 메시지로 슬롯을 돌려줍니다.
+    """
+
+    def __init__(self, camera_id, writer):
+        self.camera_id = camera_id
+        self.writer = writer  # 제어 채널 StreamWriter
+        self.generation = None
+        self.shm = None
+        self.slot_size = 0
+        self._held = {}  # id(뷰) → (세대, 슬롯)
+        self._retired = []  # 뷰가 남아 있어 아직 닫지 못한 이전 세대 세그먼트
+
+    def _attach(self, generation):
+        name = shm_name(self.camera_id, generation)
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python 3.12 이하: 리더 종료 시 세그먼트가 삭제되지 않도록 추적 해제
+            shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, "shared_memory")
+        if self.shm is not None:
+            self._retired.append(self.shm)
+        self.shm = shm
+        self.generation = generation
+        _, self.slot_size = SEGMENT_HEADER.unpack_from(shm.buf, 0)
+
+    def view(self, message):
+        """
+        FRAME_READY 메시지의 프레임 뷰를 반환합니다. (복사 없음)
+
+        :return: (seq, 캡처 시각, (H, W, C) uint8 읽기 전용 배열)
+        """
+        seq, timestamp, generation, slot = FRAME_READY.unpack(message)
+        if generation != self.generation:
+            self._attach(generation)
+        header_offset = SEGMENT_HEADER.size + slot * _slot_stride(self.slot_size)
+        _, _, h, w, c = SLOT_HEADER.unpack_from(self.shm.buf, header_offset)
+        frame = _frame_view(self.shm, slot, self.slot_size, (h, w, c))
+        frame.flags.writeable = False
+        self._held[id(frame)] = (generation, slot)
+        return seq, timestamp, frame
+
+    def release(self, frame):
+        """프레임 뷰 사용이 끝났음을 video_server에 알립니다."""
+        held = self._held.pop(id(frame), None)
+        if held is None:
+            return
+        if not self.writer.is_closing():
+            self.writer.write(FRAME_RELEASE.pack(*held))
+        self._close_retired()
+
+    def _close_retired(self):
+        for shm in list(self._retired):
+            try:
+                shm.close()
+                self._retired.remove(shm)
+            except BufferError:
+                pass  # 아직 이전 세대 뷰를 사용 중
+
+    def close(self):
+        self._held.clear()
+        if self.shm is not None:
+            self._retired.append(self.shm)
+            self.shm = None
+        self._close_retired()
+
+
+class ShmControlClient:
+    """
+    공유 메모리 구독자의 제어 채널을 Broadcaster에 등록하기 위한 어댑터.
+    슬롯은 FRAME_READY를 실제로 보낼 때 잡아 두고, 구독자가 돌려주면 해제합니다.
+    """
+
+    def __init__(self, writer, ring):
+        self.writer = writer
+        self.ring = ring
+        self.held = []  # 이 구독자가 사용 중인 (세대, 슬롯)
+
+    async def send_bytes(self, data):
+        seq, timestamp, generation, slot = data
+        if not self.ring.is_current(generation, slot, seq):
+            return  # 큐에서 기다리는 사이 덮어써진 프레임
+        self.ring.hold(slot)
+        self.held.append((generation, slot))
+        self.writer.write(FRAME_READY.pack(seq, timestamp, generation, slot))
+        await self.writer.drain()
+
+    def release(self, generation, slot):
+        if (generation, slot) in self.held:
+            self.held.remove((generation, slot))
+            self.ring.release(generation, slot)
+
+    def release_all(self):
+        for generation, slot in self.held:
+            self.ring.release(generation, slot)
+        self.held.clear()
+
+    async def close(self):
+        self.writer.close()
@@ -0,0 +1,22 @@
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# detection_server 모듈은 서로 평면 import 를 사용하므로 경로에 추가
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "detection_server"))
+
+import settings  # noqa: E402
+
+# 설정 파일 경로는 저장소 루트 기준 상대 경로이므로 실행 위치와 무관하게 고정
+settings.CONFIG_PATH = os.path.join(ROOT, "shared", "config.json")
+
+# ultralytics 가 설치되지 않은 환경에서도 좌표 계산/파이프라인 로직을 시험할 수 있도록
+# import 만 가능하게 채워둠 (테스트에서 YOLO 모델은 로드하지 않음)
+try:
+    import ultralytics  # noqa: F401
+except ImportError:
+    sys.modules["ultralytics"] = types.ModuleType("ultralytics")
+    sys.modules["ultralytics"].YOLO = None
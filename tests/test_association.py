@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from association import associate, centroid_distance_matrix, iou_matrix
+
+
+def test_iou_values():
+    a = [(0, 0, 10, 10)]
+    b = [(0, 0, 10, 10), (5, 0, 10, 10), (20, 20, 5, 5), (0, 0, 5, 5)]
+    iou = iou_matrix(a, b)
+    assert iou.shape == (1, 4)
+    np.testing.assert_allclose(iou[0], [1.0, 50 / 150, 0.0, 25 / 100], rtol=1e-5)
+
+
+def test_iou_touching_boxes_do_not_overlap():
+    assert iou_matrix([(0, 0, 10, 10)], [(10, 0, 10, 10)])[0, 0] == 0.0
+
+
+def test_iou_matrix_is_symmetric():
+    rng = np.random.default_rng(1)
+    boxes = np.column_stack([rng.integers(0, 100, (6, 2)), rng.integers(1, 50, (6, 2))])
+    iou = iou_matrix(boxes, boxes)
+    np.testing.assert_allclose(iou, iou.T, rtol=1e-5)
+    np.testing.assert_allclose(np.diag(iou), 1.0, rtol=1e-5)
+
+
+@pytest.mark.parametrize("n, m", [(0, 0), (0, 3), (2, 0)])
+def test_empty_inputs(n, m):
+    tracks = [(0, 0, 10, 10)] * n
+    dets = [(0, 0, 10, 10)] * m
+    assert iou_matrix(tracks, dets).shape == (n, m)
+    assert centroid_distance_matrix(tracks, dets).shape == (n, m)
+    matches, unmatched_tracks, unmatched_dets = associate(tracks, dets)
+    assert matches == []
+    assert unmatched_tracks == list(range(n))
+    assert unmatched_dets == list(range(m))
+
+
+def test_iou_gating():
+    tracks = [(0, 0, 10, 10)]
+    # IoU 1/3 → 0.3 기준은 통과, 0.5 기준은 미달 (중심점 거리 보완도 끔)
+    dets = [(5, 0, 10, 10)]
+    assert associate(tracks, dets, 0.3, 0.0)[0] == [(0, 0)]
+    assert associate(tracks, dets, 0.5, 0.0) == ([], [0], [0])
+
+
+def test_centroid_fallback_without_overlap():
+    tracks = [(0, 0, 10, 10)]
+    # 겹침은 없지만 중심점 거리 10 / 대각선 14.1 ≈ 0.71
+    dets = [(10, 0, 10, 10)]
+    assert associate(tracks, dets, 0.3, 0.5)[0] == []
+    assert associate(tracks, dets, 0.3, 0.8)[0] == [(0, 0)]
+
+
+def test_iou_match_preferred_over_centroid_match():
+    tracks = [(0, 0, 10, 10)]
+    # 중심점이 같은 작은 박스(IoU 0.25)보다 IoU 기준을 넘는 박스가 우선
+    dets = [(3, 3, 4, 4), (2, 0, 10, 10)]
+    matches, _, unmatched_dets = associate(tracks, dets, 0.3, 0.5)
+    assert matches == [(0, 1)]
+    assert unmatched_dets == [0]
+
+
+def test_greedy_assigns_highest_scores_first():
+    tracks = [(0, 0, 10, 10), (30, 0, 10, 10)]
+    dets = [(31, 0, 10, 10), (1, 0, 10, 10), (100, 100, 10, 10)]
+    matches, unmatched_tracks, unmatched_dets = associate(tracks, dets)
+    assert sorted(matches) == [(0, 1), (1, 0)]
+    assert unmatched_tracks == []
+    assert unmatched_dets == [2]
+
+
+def test_greedy_each_detection_used_once():
+    # 두 추적 박스가 같은 감지와 겹치면 IoU가 큰 쪽만 매칭
+    tracks = [(0, 0, 10, 10), (4, 0, 10, 10)]
+    dets = [(1, 0, 10, 10)]
+    matches, unmatched_tracks, unmatched_dets = associate(tracks, dets, 0.3, 0.0)
+    assert matches == [(0, 0)]
+    assert unmatched_tracks == [1]
+    assert unmatched_dets == []
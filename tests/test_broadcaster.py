@@ -0,0 +1,126 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from shared.broadcaster import TieredBroadcaster, parse_profile
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def send_bytes(self, data):
+        self.received.append(data)
+
+    async def send_text(self, data):
+        self.received.append(data)
+
+    async def close(self):
+        pass
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_encodes_once_per_profile_off_loop():
+    async def scenario():
+        broadcaster = TieredBroadcaster("test")
+        clients = [FakeWebSocket() for _ in range(3)]
+        broadcaster.add(clients[0], "thumbnail")
+        broadcaster.add(clients[1], "thumbnail")
+        broadcaster.add(clients[2], {"max_width": 160, "quality": 50})
+
+        threads = []
+        for variant in broadcaster._variants.values():
+            encode = variant.encoder.encode
+
+            def traced(frame, encode=encode):
+                threads.append(threading.get_ident())
+                return encode(frame)
+
+            variant.encoder.encode = traced
+
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        await broadcaster.publish_frame(frame)
+        await asyncio.sleep(0.05)
+        return broadcaster, clients, threads
+
+    broadcaster, clients, threads = run(scenario())
+    # 프로필 2개 → 인코딩 2번, 모두 이벤트 루프 밖 스레드에서 실행
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+    assert all(len(client.received) == 1 for client in clients)
+    assert clients[0].received == clients[1].received
+
+
+def test_passthrough_forwards_encoded_without_encoding():
+    async def scenario():
+        broadcaster = TieredBroadcaster("test")
+        client = FakeWebSocket()
+        broadcaster.add(client)
+        await broadcaster.publish_frame(None, encoded=b"jpeg")
+        await asyncio.sleep(0.05)
+        return client
+
+    assert run(scenario()).received == [b"jpeg"]
+
+
+def test_encode_in_worker_then_publish_bytes_on_loop():
+    async def scenario():
+        broadcaster = TieredBroadcaster("test")
+        client = FakeWebSocket()
+        broadcaster.add(client, {"max_width": 160, "max_fps": 1})
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+        variants = broadcaster.due_variants()
+        results = await asyncio.to_thread(broadcaster.encode_variants, variants, frame)
+        broadcaster.publish_encoded(variants, results)
+        # max_fps 간격 안의 다음 프레임은 인코딩 대상이 아님
+        assert broadcaster.due_variants() == []
+        await asyncio.sleep(0.05)
+        return client, results
+
+    client, results = run(scenario())
+    assert client.received == results
+    assert results[0][:2] == b"\xff\xd8"
+
+
+def test_parse_profile():
+    assert parse_profile("ping") is None
+    assert parse_profile('"thumbnail"') is None
+    assert parse_profile('{"tier": "thumbnail"}') == "thumbnail"
+    assert parse_profile('{"max_width": 320, "foo": 1}') == {"max_width": 320}
+    # 문자열이 아닌 단계 이름은 프로필로 보지 않음
+    assert parse_profile('{"tier": [1]}') is None
+    assert parse_profile('{"tier": {"a": 1}}') is None
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        [1],
+        {"max_width": 1e400},
+        {"max_fps": 1e400, "quality": 1e400},
+        {"max_width": "wide"},
+        {"quality": [80]},
+        "unknown",
+    ],
+)
+def test_invalid_profiles_fall_back_to_default_tier(profile):
+    broadcaster = TieredBroadcaster("test")
+    assert broadcaster._resolve(profile) == broadcaster._resolve(None)
+
+
+def test_overflowing_profile_message_keeps_client_connected():
+    async def scenario():
+        broadcaster = TieredBroadcaster("test")
+        client = FakeWebSocket()
+        broadcaster.add(client, parse_profile('{"max_width": 1e400}'))
+        return broadcaster, client
+
+    broadcaster, client = run(scenario())
+    assert client in broadcaster
+    assert len(broadcaster._variants) == 1
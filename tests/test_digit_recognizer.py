@@ -0,0 +1,95 @@
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from digit_recognizer import CrnnDigitRecognizer, ctc_greedy_decode
+
+ALPHABET = "0123456789"
+
+
+def one_hot(classes, num_classes=len(ALPHABET) + 1, p=1.0):
+    logits = np.full((len(classes), num_classes), (1.0 - p) / (num_classes - 1))
+    logits[np.arange(len(classes)), classes] = p
+    return logits
+
+
+def test_ctc_collapses_repeats_and_removes_blanks():
+    # 클래스 k → 문자 ALPHABET[k - 1], 0 은 blank
+    logits = one_hot([2, 2, 0, 3, 0, 0, 4, 4, 4])
+    assert ctc_greedy_decode(logits, ALPHABET) == ("123", pytest.approx(1.0))
+
+
+def test_ctc_blank_separates_repeated_characters():
+    assert ctc_greedy_decode(one_hot([2, 0, 2, 2, 0, 2]), ALPHABET)[0] == "111"
+
+
+def test_ctc_all_blank():
+    assert ctc_greedy_decode(one_hot([0, 0, 0]), ALPHABET) == ("", 0.0)
+
+
+def test_ctc_confidence_is_mean_of_kept_characters():
+    logits = np.vstack([one_hot([2], p=0.9), one_hot([0]), one_hot([3], p=0.5)])
+    text, confidence = ctc_greedy_decode(logits, ALPHABET)
+    assert text == "12"
+    assert confidence == pytest.approx(0.7)
+
+
+def test_ctc_applies_softmax_to_raw_scores():
+    logits = np.log(one_hot([5, 0, 6], p=0.8)) * 3.0
+    text, confidence = ctc_greedy_decode(logits, ALPHABET)
+    assert text == "45"
+    assert 0.0 < confidence <= 1.0
+
+
+def test_ctc_blank_at_last_class():
+    blank = len(ALPHABET)
+    logits = one_hot([1, blank, 1, 2])
+    assert ctc_greedy_decode(logits, ALPHABET, blank=blank)[0] == "112"
+
+
+@pytest.fixture
+def recognizer(monkeypatch):
+    """onnxruntime 없이 입력 버퍼 처리만 확인하기 위한 가짜 세션"""
+
+    class FakeSession:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def get_inputs(self):
+            return [types.SimpleNamespace(name="input")]
+
+    fake = types.SimpleNamespace(InferenceSession=FakeSession)
+    monkeypatch.setitem(sys.modules, "onnxruntime", fake)
+    return CrnnDigitRecognizer("model.onnx", height=32, width=128)
+
+
+def test_input_buffer_is_per_thread(recognizer):
+    barrier = threading.Barrier(2)
+    blobs = {}
+
+    def prepare(value):
+        crop = np.full((16, 40), value, dtype=np.uint8)
+        blob = recognizer._prepare(crop)
+        barrier.wait()  # 두 스레드가 모두 준비를 마친 뒤에도 서로 덮어쓰지 않아야 함
+        blobs[value] = (id(blob), float(blob[0, 0, 0, 0]))
+
+    threads = [threading.Thread(target=prepare, args=(v,)) for v in (51, 255)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert blobs[51][0] != blobs[255][0]
+    assert blobs[51][1] == pytest.approx(0.2)
+    assert blobs[255][1] == pytest.approx(1.0)
+
+
+def test_input_buffer_reused_within_thread(recognizer):
+    first = recognizer._prepare(np.zeros((16, 200), dtype=np.uint8))
+    second = recognizer._prepare(np.full((16, 20), 255, dtype=np.uint8))
+    assert first is second
+    # 이전 크롭 내용은 지워짐 (폭 40 이후는 0)
+    assert second[0, 0, :, 40:].max() == 0.0
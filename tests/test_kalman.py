@@ -0,0 +1,76 @@
+import numpy as np
+
+from kalman import KalmanBoxTracker
+from track_manager import TrackManager
+
+
+def test_init_and_predict_without_motion():
+    tracker = KalmanBoxTracker()
+    assert tracker.init(None, (10, 20, 30, 40))
+    alive, bbox = tracker.update(None)
+    assert alive
+    assert bbox == (10, 20, 30, 40)
+
+
+def test_correct_learns_constant_velocity():
+    tracker = KalmanBoxTracker()
+    tracker.init(None, (0, 0, 20, 20))
+    for step in range(1, 15):
+        tracker.update(None)
+        tracker.correct((5 * step, 2 * step, 20, 20))
+
+    # 보정 없이 예측만 해도 같은 속도로 이동
+    _, bbox = tracker.update(None)
+    assert abs(bbox[0] - 75) <= 2
+    assert abs(bbox[1] - 30) <= 2
+    assert bbox[2:] == (20, 20)
+    np.testing.assert_allclose(tracker.x[4:6], [5, 2], atol=0.5)
+
+
+def test_correct_resets_misses_and_coasting():
+    tracker = KalmanBoxTracker(max_misses=1, max_coast=5)
+    tracker.init(None, (0, 0, 10, 10))
+    tracker.mark_missed()
+    tracker.update(None)
+    tracker.correct((0, 0, 10, 10))
+    assert tracker.misses == 0
+    assert tracker.coasted == 0
+
+
+def test_expires_after_max_misses():
+    tracker = KalmanBoxTracker(max_misses=2)
+    tracker.init(None, (0, 0, 10, 10))
+    for _ in range(2):
+        tracker.mark_missed()
+        assert tracker.update(None)[0]
+    tracker.mark_missed()
+    assert not tracker.update(None)[0]
+
+
+def test_expires_after_coasting_without_detection():
+    tracker = KalmanBoxTracker(max_coast=3)
+    tracker.init(None, (0, 0, 10, 10))
+    assert all(tracker.update(None)[0] for _ in range(3))
+    assert not tracker.update(None)[0]
+
+
+def test_coasting_unlimited_when_disabled():
+    tracker = KalmanBoxTracker(max_coast=None)
+    tracker.init(None, (0, 0, 10, 10))
+    assert all(tracker.update(None)[0] for _ in range(100))
+
+
+def test_track_ages_out_while_detection_is_suppressed():
+    # 감지 스케줄러가 감지를 계속 미루면 (apply_detections 호출 없음) 예측만으로 만료
+    manager = TrackManager("kalman-test", backend="detection")
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    track = manager.spawn(frame, (10, 10, 20, 20))
+    track.tracker.max_coast = 4
+
+    for _ in range(4):
+        manager.update_trackers(frame)
+    assert track.id in manager.tracks
+
+    manager.update_trackers(frame)
+    assert not manager.tracks
+    assert manager.failure_message == "추적 실패"
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from motion_detector import MotionDetector
+
+
+def static_frames(count):
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+    return [frame.copy() for _ in range(count)]
+
+
+def moving_frame():
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[60:180, 80:240] = 255
+    return frame
+
+
+@pytest.mark.parametrize("method", ["mog2", "knn"])
+def test_static_scene_never_triggers_after_start(method):
+    detector = MotionDetector(method=method, scale=0.5, area_threshold=500)
+    results = [detector.detect(frame) for frame in static_frames(15)]
+    assert not any(results)
+    assert detector.triggered == 0
+
+
+@pytest.mark.parametrize("method", ["mog2", "knn"])
+def test_static_scene_never_triggers_after_reset(method):
+    detector = MotionDetector(method=method, scale=0.5, area_threshold=500)
+    for frame in static_frames(15):
+        detector.detect(frame)
+    detector.reset()
+    results = [detector.detect(frame) for frame in static_frames(15)]
+    assert not any(results)
+
+
+def test_warmup_counts_avoided_calls():
+    detector = MotionDetector(
+        method="knn", scale=0.5, area_threshold=500, warmup_frames=4
+    )
+    results = [detector.detect(frame) for frame in static_frames(4)]
+    assert results == [False] * 4
+    # 정지 장면이어도 새 KNN 모델은 전경으로 판단하므로 회피한 호출로 집계
+    assert detector.yolo_avoided >= 1
+
+
+def test_motion_detected_after_warmup():
+    detector = MotionDetector(
+        method="running_average", scale=0.5, area_threshold=500, warmup_frames=2
+    )
+    frames = static_frames(3)
+    assert [detector.detect(frame) for frame in frames] == [False] * 3
+    assert detector.detect(moving_frame())
+    assert detector.triggered == 1
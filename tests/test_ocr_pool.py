@@ -0,0 +1,74 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import ocr_pool
+from ocr_pool import OcrWorkerPool
+
+
+class FakeExecutor:
+    """broken=True 이면 프로세스가 죽은 풀처럼 submit 에서 BrokenProcessPool 발생"""
+
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.submitted = 0
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if self.broken:
+            raise BrokenProcessPool("worker died")
+        self.submitted += 1
+        future = Future()
+        future.set_result(("123", 0.9))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    created = []
+
+    def create(self):
+        created.append(FakeExecutor())
+        return created[-1]
+
+    monkeypatch.setattr(OcrWorkerPool, "_create_executor", create)
+    monkeypatch.setattr(ocr_pool, "read_digits", lambda crop: ("999", 0.5))
+    pool = OcrWorkerPool(workers=1, max_restarts=2)
+    return pool, created
+
+
+def crop():
+    return np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def test_broken_pool_is_rebuilt(pool):
+    pool, created = pool
+    created[0].broken = True
+
+    future = pool.submit(1, crop())
+    assert future.result() == ("123", 0.9)
+    assert len(created) == 2
+    assert created[0].shut_down
+    assert created[1].submitted == 1
+    assert pool.restarts == 1
+    assert pool.poll(1) == (True, ("123", 0.9))
+
+
+def test_falls_back_to_inline_after_max_restarts(pool):
+    pool, created = pool
+    for track_id in range(1, 4):
+        created[-1].broken = True
+        result = pool.submit(track_id, crop()).result()
+        if track_id <= 2:
+            assert result == ("123", 0.9)
+
+    # 재생성 한도(2)를 넘으면 호출한 스레드에서 바로 실행
+    assert pool.restarts == 2
+    assert len(created) == 3
+    assert result == ("999", 0.5)
+    assert pool.submit(4, crop()).result() == ("999", 0.5)
@@ -0,0 +1,106 @@
+import pytest
+
+from ocr_voting import OcrVote
+
+
+def make_vote(**kwargs):
+    options = dict(
+        max_frames=5, window=3, agreement=0.6, min_votes=2, accept_confidence=0.9
+    )
+    options.update(kwargs)
+    return OcrVote(**options)
+
+
+def test_min_votes_required_before_early_decision():
+    vote = make_vote()
+    vote.add("123", 0.5)
+    assert vote.result() is None
+    vote.add("123", 0.5)
+    assert vote.result() == "123"
+
+
+def test_failed_reads_count_towards_max_frames_only():
+    vote = make_vote(max_frames=3)
+    vote.add(None, 0.0)
+    vote.add(None, 0.0)
+    assert vote.votes == 0
+    assert vote.result() is None
+    assert not vote.exhausted()
+    vote.add(None, 0.0)
+    # 읽어낸 숫자가 없으면 끝까지 확정하지 않음 (실패)
+    assert vote.exhausted()
+    assert vote.result() is None
+
+
+def test_agreement_threshold_blocks_split_votes():
+    vote = make_vote()
+    vote.add("123", 0.5)
+    vote.add("128", 0.5)
+    assert vote.leader()[1] == pytest.approx(0.5)
+    assert vote.result() is None
+    vote.add("123", 0.5)
+    # 1.0 / 1.5 ≈ 0.67 ≥ 0.6
+    assert vote.result() == "123"
+
+
+def test_confidence_weighting_beats_vote_count():
+    vote = make_vote(max_frames=3, min_votes=5)
+    vote.add("128", 0.3)
+    vote.add("128", 0.3)
+    vote.add("123", 0.8)
+    # 횟수는 128 이 많지만 신뢰도 합은 123 이 큼 → max_frames 도달 시 123 확정
+    assert vote.exhausted()
+    assert vote.leader() == ("123", pytest.approx(0.8 / 1.4))
+    assert vote.result() == "123"
+
+
+def test_tie_keeps_reading_until_exhausted():
+    vote = make_vote(max_frames=4)
+    vote.add("123", 0.5)
+    vote.add("128", 0.5)
+    assert vote.result() is None
+    vote.add(None, 0.0)
+    vote.add(None, 0.0)
+    # 동점이면 먼저 나온 후보로 확정
+    assert vote.result() == "123"
+
+
+def test_high_confidence_accepts_immediately():
+    vote = make_vote()
+    vote.add("456", 0.95)
+    assert vote.result() == "456"
+
+
+def test_high_confidence_disabled():
+    vote = make_vote(accept_confidence=None)
+    vote.add("456", 0.99)
+    assert vote.result() is None
+
+
+def test_first_high_confidence_read_wins():
+    vote = make_vote()
+    vote.add("456", 0.95)
+    vote.add("789", 0.99)
+    assert vote.result() == "456"
+
+
+def test_window_submits_best_crop_once_per_window():
+    vote = make_vote(window=3)
+    vote.offer("a", 0.2)
+    vote.offer("b", 0.7)
+    assert vote.take() is None
+    vote.offer("c", 0.5)
+    assert vote.take() == "b"
+    # 꺼낸 뒤에는 새 구간을 다시 모음
+    assert vote.take() is None
+
+
+def test_rejected_crops_do_not_fill_window():
+    vote = make_vote(window=2)
+    vote.offer(None, 0.0)
+    vote.offer(None, 0.0)
+    assert vote.take() is None
+    vote.offer("a", 0.4)
+    vote.offer("b", 0.4)
+    # 동점이면 먼저 들어온 크롭 유지
+    assert vote.take() == "a"
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from onnx_detector import decode_predictions, letterbox, nms, preprocess
+
+
+def test_letterbox_landscape():
+    image = np.full((240, 320, 3), 200, dtype=np.uint8)
+    canvas, ratio, pad = letterbox(image, 416)
+    assert canvas.shape == (416, 416, 3)
+    assert ratio == pytest.approx(1.3)
+    assert pad == (0, 52)
+    # 위아래 여백은 채움색, 가운데는 원본
+    assert canvas[:52].max() == 114
+    assert canvas[52:364].min() == 200
+    assert canvas[364:].max() == 114
+
+
+def test_letterbox_portrait_pads_horizontally():
+    _, ratio, pad = letterbox(np.zeros((400, 200, 3), dtype=np.uint8), 320)
+    assert ratio == pytest.approx(0.8)
+    assert pad == (80, 0)
+
+
+def test_letterbox_inverse_maps_points_back():
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    image[100:140, 200:260] = 255
+    canvas, ratio, (pad_x, pad_y) = letterbox(image, 320)
+
+    ys, xs = np.nonzero(canvas[:, :, 0] > 200)
+    x0 = (xs.min() - pad_x) / ratio
+    y0 = (ys.min() - pad_y) / ratio
+    x1 = (xs.max() + 1 - pad_x) / ratio
+    y1 = (ys.max() + 1 - pad_y) / ratio
+    np.testing.assert_allclose([x0, y0, x1, y1], [200, 100, 260, 140], atol=2)
+
+
+def test_preprocess_rounds_size_to_stride():
+    blob, metas = preprocess([np.zeros((240, 320, 3), dtype=np.uint8)], 300)
+    assert blob.shape == (1, 3, 320, 320)
+    assert blob.dtype == np.float32
+    ratio, pad, shape = metas[0]
+    assert (ratio, pad, shape) == (1.0, (0, 40), (240, 320, 3))
+
+
+def test_nms_suppresses_overlaps_and_orders_by_score():
+    boxes = np.array(
+        [[0, 0, 10, 10], [1, 1, 11, 11], [20, 20, 30, 30], [0, 0, 10, 10]],
+        dtype=np.float32,
+    )
+    scores = np.array([0.6, 0.9, 0.5, 0.3], dtype=np.float32)
+    assert nms(boxes, scores, 0.5).tolist() == [1, 2]
+    # 임계값을 높이면 덜 겹치는 박스는 남음 (IoU(0,1) ≈ 0.68, IoU(0,3) = 1)
+    assert nms(boxes, scores, 0.7).tolist() == [1, 0, 2]
+
+
+def test_nms_empty():
+    assert nms(np.zeros((0, 4)), np.zeros(0), 0.5).tolist() == []
+
+
+def make_pred(candidates, num_classes=2):
+    """(cx, cy, w, h, class, score) 목록 → YOLOv8 출력 (4 + 클래스 수, 후보 수)"""
+    pred = np.zeros((4 + num_classes, len(candidates)), dtype=np.float32)
+    for i, (cx, cy, w, h, cls, score) in enumerate(candidates):
+        pred[:4, i] = (cx, cy, w, h)
+        pred[4 + cls, i] = score
+    return pred
+
+
+def test_decode_applies_per_class_nms():
+    pred = make_pred(
+        [
+            (50, 50, 20, 20, 0, 0.9),
+            (51, 51, 20, 20, 0, 0.8),  # 같은 클래스 중복 → 제거
+            (51, 51, 20, 20, 1, 0.7),  # 다른 클래스 → 유지
+            (150, 150, 20, 20, 0, 0.3),  # 신뢰도 미달
+        ]
+    )
+    boxes, scores, classes = decode_predictions(
+        pred, 0.5, 0.5, 1.0, (0, 0), (416, 416, 3), with_classes=True
+    )
+    assert classes.tolist() == [0, 1]
+    assert scores.tolist() == pytest.approx([0.9, 0.7])
+    assert boxes.tolist() == [[40, 40, 20, 20], [41, 41, 20, 20]]
+
+
+def test_decode_maps_letterbox_to_frame_and_clamps():
+    # 640x480 프레임 → 320 letterbox (배율 0.5, 상단 여백 40)
+    ratio, pad, shape = 0.5, (0, 40), (480, 640, 3)
+    pred = make_pred(
+        [
+            (100, 100, 20, 10, 0, 0.9),  # 프레임 (180, 110, 40, 20)
+            (315, 45, 20, 20, 1, 0.8),  # 오른쪽 위 밖으로 넘침 → 잘림
+        ]
+    )
+    boxes, scores = decode_predictions(pred, 0.5, 0.5, ratio, pad, shape)
+    assert boxes.tolist() == [[180, 110, 40, 20], [610, 0, 30, 30]]
+    assert scores.dtype == np.float32
+
+
+def test_decode_nothing_above_threshold():
+    pred = make_pred([(50, 50, 20, 20, 0, 0.1)])
+    boxes, scores = decode_predictions(pred, 0.5, 0.5, 1.0, (0, 0), (416, 416, 3))
+    assert boxes.shape == (0, 4) and scores.shape == (0,)
+    _, _, classes = decode_predictions(
+        pred, 0.5, 0.5, 1.0, (0, 0), (416, 416, 3), with_classes=True
+    )
+    assert classes.shape == (0,)
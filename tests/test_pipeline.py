@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import motion_detector
+import pipeline
+from motion_detector import MotionDetector
+from track_manager import TrackManager
+
+STREAM_ID = "pipeline-test"
+
+
+class FailingTracker:
+    """다음 update()에서 추적에 실패하는 추적기"""
+
+    def update(self, frame):
+        return False, (0, 0, 0, 0)
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    detector = MotionDetector(
+        method="knn", scale=0.5, area_threshold=500, warmup_frames=5
+    )
+    manager = TrackManager(STREAM_ID, backend="detection")
+    monkeypatch.setitem(motion_detector.motion_detectors, STREAM_ID, detector)
+    monkeypatch.setitem(pipeline.track_managers, STREAM_ID, manager)
+    calls = []
+
+    def fake_detect(stream_id, frame, region=None):
+        calls.append(stream_id)
+        return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+    monkeypatch.setattr(pipeline, "detect", fake_detect)
+    return detector, manager, calls
+
+
+def static_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+
+
+def test_returning_to_idle_resets_motion_background(stream):
+    detector, manager, calls = stream
+    frame = static_frame()
+    for _ in range(10):
+        pipeline.process_frame(STREAM_ID, frame, annotate=False)
+    assert detector._warmup_left == 0
+
+    track = manager.spawn(frame, (10, 10, 40, 40))
+    track.tracker = FailingTracker()
+    _, overlay, events = pipeline.process_frame(STREAM_ID, frame, annotate=False)
+    assert overlay["mode"] == "idle"
+    mode_event = next(event for event in events if event["type"] == "mode")
+    assert (mode_event["previous"], mode_event["mode"]) == ("tracking", "idle")
+
+    # 추적 동안 학습하지 않은 배경 모델은 버리고 warm-up 부터 다시 학습
+    assert detector._subtractor is None
+    assert detector._warmup_left == detector.warmup_frames
+
+    # 새 장면으로 바뀌어도 warm-up 동안은 YOLO를 깨우지 않음
+    new_scene = np.full_like(frame, 40)
+    for _ in range(5):
+        _, overlay, _ = pipeline.process_frame(STREAM_ID, new_scene, annotate=False)
+        assert overlay["motion"] is False
+    assert calls == []
+    assert detector.yolo_avoided >= 1
@@ -0,0 +1,98 @@
+import cv2
+import numpy as np
+import pytest
+
+import batcher
+from detector import padded_region, union_box
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def test_padded_region_inside_frame():
+    assert padded_region(FRAME_SHAPE, (100, 200, 40, 20), 0.25) == (90, 195, 150, 225)
+
+
+def test_padded_region_without_padding():
+    assert padded_region(FRAME_SHAPE, (100, 200, 40, 20), 0.0) == (100, 200, 140, 220)
+
+
+@pytest.mark.parametrize(
+    "box, expected",
+    [
+        ((0, 0, 40, 40), (0, 0, 50, 50)),  # 왼쪽 위 모서리
+        ((620, 460, 40, 40), (610, 450, 640, 480)),  # 오른쪽 아래 모서리
+        ((-30, 100, 60, 40), (0, 90, 45, 150)),  # 일부가 프레임 밖
+    ],
+)
+def test_padded_region_clamped_to_frame(box, expected):
+    assert padded_region(FRAME_SHAPE, box, 0.25) == expected
+
+
+def test_padded_region_outside_frame_uses_full_frame():
+    assert padded_region(FRAME_SHAPE, (700, 500, 40, 40), 0.25) == (0, 0, 640, 480)
+
+
+def test_union_box():
+    assert union_box([(10, 20, 30, 40), None, (50, 5, 10, 10)]) == (10, 5, 50, 55)
+    assert union_box([(10, 20, 30, 40)]) == (10, 20, 30, 40)
+    assert union_box([]) is None
+    assert union_box([None]) is None
+
+
+@pytest.fixture
+def region_detect(monkeypatch):
+    """밝은 사각형의 위치를 (잘라낸 영상 기준) 돌려주는 가짜 감지기"""
+    seen = []
+
+    def fake_detect_all_objects(frame, conf_thres=0.5, imgsz=None):
+        seen.append((frame.shape, imgsz))
+        mask = (frame[:, :, 0] > 0).astype(np.uint8)
+        if not mask.any():
+            return np.zeros((0, 4), dtype=np.int32), np.zeros(0, dtype=np.float32)
+        box = np.array([cv2.boundingRect(mask)], dtype=np.int32)
+        return box, np.array([0.9], dtype=np.float32)
+
+    monkeypatch.setattr(batcher, "detect_all_objects", fake_detect_all_objects)
+    monkeypatch.setattr(batcher, "get_batcher", lambda: None)
+    monkeypatch.setattr(batcher, "get_region_config", lambda: (True, "roi", 0.25, 320))
+    return seen
+
+
+def frame_with_object(box):
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    x, y, w, h = box
+    frame[y : y + h, x : x + w] = 255
+    return frame
+
+
+def test_region_crop_remaps_boxes_to_frame(region_detect):
+    obj = (120, 210, 30, 20)
+    boxes, scores = batcher.detect("test", frame_with_object(obj), (100, 200, 80, 40))
+
+    # 여백 포함 영역 (80, 190) ~ (200, 250) 만 작은 imgsz 로 감지
+    assert region_detect == [((60, 120, 3), 320)]
+    assert boxes.tolist() == [list(obj)]
+    assert scores.tolist() == pytest.approx([0.9])
+
+
+def test_region_crop_at_frame_edge(region_detect):
+    obj = (600, 450, 40, 30)
+    boxes, _ = batcher.detect("test", frame_with_object(obj), (590, 440, 50, 40))
+    assert region_detect[0][0] == (50, 62, 3)
+    assert boxes.tolist() == [list(obj)]
+
+
+def test_region_crop_without_detections(region_detect):
+    boxes, scores = batcher.detect(
+        "test", np.zeros(FRAME_SHAPE, dtype=np.uint8), (100, 200, 80, 40)
+    )
+    assert boxes.shape == (0, 4)
+    assert scores.shape == (0,)
+
+
+def test_full_frame_when_region_missing(region_detect):
+    obj = (300, 100, 20, 20)
+    boxes, _ = batcher.detect("test", frame_with_object(obj), None)
+    # 영역이 없으면 전체 프레임을 모델 기본 imgsz 로 감지
+    assert region_detect == [(FRAME_SHAPE, None)]
+    assert boxes.tolist() == [list(obj)]
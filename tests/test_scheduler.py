@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from scheduler import DetectionScheduler
+from track_manager import TrackManager
+
+
+@pytest.fixture
+def scheduler():
+    return DetectionScheduler(
+        "test",
+        max_calls_per_second=8.0,
+        empty_cooldown=0.2,
+        backoff_factor=2.0,
+        max_cooldown=1.0,
+        wake_motion_ratio=0.5,
+        min_track_confidence=0.5,
+        max_detection_age=1.0,
+    )
+
+
+def test_rate_cap(scheduler):
+    assert scheduler.should_detect(now=100.0)
+    scheduler.record(True, now=100.0)
+    assert not scheduler.should_detect(now=100.0625)
+    assert scheduler.skipped_rate == 1
+    assert scheduler.should_detect(now=100.125)
+
+
+def test_no_rate_cap_when_disabled():
+    scheduler = DetectionScheduler("test", max_calls_per_second=0)
+    scheduler.record(True, now=100.0)
+    assert scheduler.should_detect(now=100.0)
+
+
+def test_empty_detections_back_off_exponentially(scheduler):
+    now = 100.0
+    cooldowns = []
+    for _ in range(5):
+        assert scheduler.should_detect(now=now)
+        scheduler.record(False, now=now)
+        cooldowns.append(scheduler.cooldown)
+        # 대기 시간 직전까지는 생략, 지나면 다시 감지
+        assert not scheduler.should_detect(now=now + scheduler.cooldown - 0.01)
+        now += scheduler.cooldown
+    assert cooldowns == pytest.approx([0.2, 0.4, 0.8, 1.0, 1.0])
+    assert scheduler.empty_streak == 5
+    assert scheduler.skipped_cooldown == 5
+
+
+def test_found_resets_backoff(scheduler):
+    scheduler.record(False, now=100.0)
+    scheduler.record(False, now=100.2)
+    scheduler.record(True, now=100.6)
+    assert scheduler.empty_streak == 0
+    assert scheduler.cooldown == 0.0
+    assert scheduler.should_detect(now=100.75)
+
+
+def test_strong_motion_wakes_during_cooldown(scheduler):
+    scheduler.record(False, now=100.0)
+    assert not scheduler.should_detect(motion_ratio=0.1, now=100.15)
+    assert scheduler.should_detect(motion_ratio=0.6, now=100.15)
+    # 초당 호출 제한은 움직임이 커도 적용
+    assert not scheduler.should_detect(motion_ratio=0.6, now=100.0625)
+
+
+def test_tracking_mode_rules(scheduler):
+    scheduler.record(True, now=100.0)
+    # 주기 도달, 낮은 신뢰도, 오래된 감지 중 하나면 감지
+    assert not scheduler.should_detect(confidence=0.9, now=100.2)
+    assert scheduler.should_detect(confidence=0.9, due=True, now=100.2)
+    assert scheduler.should_detect(confidence=0.3, now=100.2)
+    assert scheduler.should_detect(confidence=0.9, now=101.0)
+    # 추적 모드에는 빈 감지 대기 시간을 적용하지 않음
+    scheduler.record(False, now=101.0)
+    assert scheduler.should_detect(confidence=0.9, due=True, now=101.125)
+
+
+def test_empty_tracking_redetections_do_not_back_off_idle(scheduler):
+    # 객체가 화면을 떠나며 생긴 빈 재감지 4번
+    scheduler.record(True, now=100.0)
+    for index in range(1, 5):
+        now = 100.0 + index * 0.25
+        assert scheduler.should_detect(confidence=0.0, now=now)
+        scheduler.record(False, now=now, backoff=False)
+    assert scheduler.empty == 4
+    assert scheduler.empty_streak == 0
+    assert scheduler.cooldown == 0.0
+
+    # idle 로 돌아온 뒤 다음 객체는 약한 움직임에도 바로 감지
+    assert scheduler.should_detect(motion_ratio=0.02, now=101.3)
+    assert scheduler.skipped_cooldown == 0
+
+
+def test_tracking_mode_respects_rate_cap(scheduler):
+    scheduler.record(True, now=100.0)
+    assert not scheduler.should_detect(confidence=0.0, due=True, now=100.0625)
+
+
+def test_kalman_tracks_expire_while_rate_capped():
+    """
+    추적 모드에서 감지가 초당 호출 제한으로 미뤄지는 동안 칼만 추적이 예측만으로 만료되는지 확인합니다.
+    (pipeline.process_frame 추적 분기와 같은 순서로 호출)
+    """
+    scheduler = DetectionScheduler("test", max_calls_per_second=0.1)
+    manager = TrackManager("scheduler-test", backend="detection")
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    track = manager.spawn(frame, (10, 10, 20, 20))
+    track.tracker.max_coast = 5
+    scheduler.record(True, now=0.0)
+
+    detections = 0
+    for index in range(1, 20):
+        now = index / 30.0
+        manager.update_trackers(frame)
+        if not manager.tracks:
+            break
+        manager.frames_since_detection += 1
+        if scheduler.should_detect(
+            confidence=manager.confidence(),
+            due=manager.frames_since_detection >= manager.detection_interval,
+            now=now,
+        ):
+            detections += 1
+            scheduler.record(True, now=now)
+            manager.apply_detections(frame, [track.bbox])
+
+    assert detections == 0
+    assert scheduler.skipped_rate > 0
+    assert not manager.tracks
+    assert index == 6
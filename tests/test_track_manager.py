@@ -0,0 +1,149 @@
+import time
+
+import numpy as np
+import pytest
+
+import track_manager
+from crop_quality import CropQualityScorer
+from ocr_voting import OcrVote
+from track_manager import TrackManager, OCR_WAITING
+
+# ROI(설정 roi) 안쪽 중심을 갖는 박스
+INSIDE_BOX = (200, 250, 60, 40)
+# ROI 밖 박스
+OUTSIDE_BOX = (500, 20, 60, 40)
+
+
+class StuckTracker:
+    """배경에 붙어 계속 같은 박스를 돌려주는 OpenCV 추적기 대용"""
+
+    def __init__(self, bbox):
+        self.bbox = bbox
+
+    def update(self, frame):
+        return True, self.bbox
+
+
+class FakeOcrPool:
+    """제출 횟수만 세는 OCR 풀"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, track_id, crop):
+        self.submitted.append(track_id)
+
+    def poll(self, track_id):
+        return False, (None, 0.0)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    pool = FakeOcrPool()
+    # 단색 프레임은 선명도 0 → 항상 기준 미달
+    scorer = CropQualityScorer(min_score=0.95)
+    monkeypatch.setattr(track_manager, "get_ocr_pool", lambda: pool)
+    monkeypatch.setattr(track_manager, "get_quality_scorer", lambda stream_id: scorer)
+    manager = TrackManager("test", backend="detection")
+    manager.pool = pool
+    return manager
+
+
+def flat_frame():
+    return np.full((480, 640, 3), 128, dtype=np.uint8)
+
+
+def event_types(manager):
+    return [event["type"] for event in manager.drain_events()]
+
+
+def test_quality_rejects_fail_track(manager):
+    frame = flat_frame()
+    manager.max_quality_rejects = 5
+    track = manager.spawn(frame, INSIDE_BOX)
+    track.vote = None
+
+    for _ in range(4):
+        manager.update_ocr(frame)
+    assert track.id in manager.tracks
+    assert track.quality_rejects == 4
+    assert track.ocr_state == OCR_WAITING
+
+    manager.update_ocr(frame)
+    assert not manager.tracks
+    assert manager.mode == "idle"
+    assert manager.pool.submitted == []
+    assert manager.failure_message == "OCR 크롭 품질 미달"
+    types = event_types(manager)
+    assert "ocr_failed" in types and "track_ended" in types
+
+
+def test_quality_rejects_fail_track_with_voting(manager):
+    frame = flat_frame()
+    manager.max_quality_rejects = 3
+    track = manager.spawn(frame, INSIDE_BOX)
+    track.vote = OcrVote()
+
+    for _ in range(3):
+        manager.update_ocr(frame)
+    assert not manager.tracks
+    assert manager.pool.submitted == []
+
+
+def test_dwell_timeout_inside_roi(manager):
+    frame = flat_frame()
+    manager.max_quality_rejects = 1000
+    track = manager.spawn(frame, INSIDE_BOX)
+    track.vote = None
+
+    manager.update_ocr(frame)
+    assert track.id in manager.tracks
+
+    # ROI 안에 머무는 동안에도 체류 시간이 지나면 실패 처리
+    track.roi_enter_time = time.time() - 60
+    manager.update_ocr(frame)
+    assert not manager.tracks
+    assert manager.failure_message == "ROI 체류 시간 초과"
+    assert "ocr_failed" in event_types(manager)
+
+
+def test_unconfirmed_opencv_track_dropped_after_missed_redetections(manager):
+    frame = flat_frame()
+    track = manager.spawn(frame, OUTSIDE_BOX)
+    track.tracker = StuckTracker(OUTSIDE_BOX)
+    manager.max_missed_detections = 3
+
+    for _ in range(3):
+        manager.update_trackers(frame)
+        manager.apply_detections(frame, np.empty((0, 4)))
+    assert track.id in manager.tracks
+    assert track.missed_detections == 3
+    assert manager.confidence() < 0.5
+
+    manager.apply_detections(frame, np.empty((0, 4)))
+    assert not manager.tracks
+    assert manager.failure_message == "재감지 실패"
+
+
+def test_matched_redetection_resets_missed_count(manager):
+    frame = flat_frame()
+    track = manager.spawn(frame, OUTSIDE_BOX)
+    track.tracker = StuckTracker(OUTSIDE_BOX)
+    manager.apply_detections(frame, np.empty((0, 4)))
+    manager.apply_detections(frame, np.array([OUTSIDE_BOX]))
+    assert track.missed_detections == 0
+
+
+def test_track_that_never_enters_roi_times_out(manager):
+    frame = flat_frame()
+    track = manager.spawn(frame, OUTSIDE_BOX)
+
+    manager.update_ocr(frame)
+    assert track.id in manager.tracks
+
+    # ROI에 들어오지 않은 채 detection_grace_period 가 지나면 종료
+    track.start_time = time.time() - 60
+    manager.update_ocr(frame)
+    assert not manager.tracks
+    assert manager.mode == "idle"
+    assert manager.failure_message == "ROI 진입 실패"
@@ -0,0 +1,158 @@
+import json
+import os
+
+import cv2
+
+from capture import FrameRing, CaptureThread
+from shared.broadcaster import Broadcaster, TieredBroadcaster
+
+# 공통 설정 파일 경로
+CONFIG_PATH = os.path.join("shared", "config.json")
+
+# cameras 설정이 없을 때 사용하는 기본 카메라 (기존 동작: 장치 0번)
+DEFAULT_CAMERAS = [{"id": "cam0", "source": 0}]
+
+
+def load_config():
+    """공통 설정 파일을 읽어옵니다. (없으면 빈 dict)"""
+    if not os.path.exists(CONFIG_PATH):
+        return {}
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_camera_configs():
+    """
+    카메라 목록을 설정 파일에서 읽어옵니다.
+
+    :return: [{"id", "source", "width", "height", "fps"}, ...]
+    """
+    return load_config().get("cameras") or DEFAULT_CAMERAS
+
+
+class Camera:
+    """
+    카메라 하나의 캡처 장치와 접속 클라이언트를 관리합니다.
+    source는 장치 번호(int) 또는 RTSP/파일 경로(str)입니다.
+    """
+
+    def __init__(
+        self,
+        camera_id,
+        source,
+        width=None,
+        height=None,
+        fps=None,
+        broadcast=None,
+        jpeg=None,
+    ):
+        self.id = camera_id
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.cap = None
+        self.task = None
+
+        # 접속 클라이언트별 송신 큐 (느린 클라이언트 분리, 해상도/화질 단계별 인코딩)
+        broadcast = broadcast or {}
+        self.broadcaster = TieredBroadcaster(
+            f"video:{camera_id}",
+            jpeg,
+            broadcast.get("queue_size", 1),
+            broadcast.get("max_lag", 2.0),
+        )
+        # 같은 호스트의 감지 서버용 원시 프레임 구독자 (Unix 소켓, JPEG 없음)
+        self.raw_broadcaster = Broadcaster(
+            f"raw:{camera_id}",
+            broadcast.get("queue_size", 1),
+            broadcast.get("max_lag", 2.0),
+        )
+        self.raw_server = None
+        self.shm_ring = None  # 공유 메모리 전송 시 ShmFrameWriter
+
+        # 전용 캡처 스레드가 채우는 프레임 링
+        self.ring = FrameRing()
+        self.capture_thread = None
+
+        # 캡처 → 송출 지연 통계
+        self.sent = 0
+        self.latency_ms_last = 0.0
+        self.latency_ms_avg = 0.0
+
+    def has_clients(self):
+        """WebSocket 또는 원시 프레임 구독자가 있는지 여부"""
+        return bool(self.broadcaster) or bool(self.raw_broadcaster)
+
+    def open(self):
+        """캡처 장치를 (재)연결하고 해상도/fps를 설정합니다."""
+        if self.cap is not None:
+            self.cap.release()  # 기존 카메라 리소스 해제
+
+        self.cap = cv2.VideoCapture(self.source)
+        if self.width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        return self.cap.isOpened()
+
+    def start_capture(self, on_frame=None):
+        """전용 캡처 스레드를 시작합니다."""
+        self.capture_thread = CaptureThread(self, self.ring, on_frame)
+        self.capture_thread.start()
+
+    def record_send(self, captured_at, sent_at):
+        """캡처 시각부터 송출(클라이언트 큐 투입)까지의 지연을 기록합니다."""
+        latency_ms = (sent_at - captured_at) * 1000.0
+        self.sent += 1
+        self.latency_ms_last = latency_ms
+        self.latency_ms_avg = (
+            latency_ms
+            if self.sent == 1
+            else self.latency_ms_avg * 0.9 + latency_ms * 0.1
+        )
+
+    def stats(self):
+        return {
+            "clients": len(self.broadcaster),
+            "captured": self.ring.captured,
+            "dropped": self.ring.dropped,
+            "sent": self.sent,
+            "latency_ms_last": round(self.latency_ms_last, 2),
+            "latency_ms_avg": round(self.latency_ms_avg, 2),
+            "broadcast": self.broadcaster.stats(),
+            "raw": self.raw_broadcaster.stats(),
+            "shm": self.shm_ring.stats() if self.shm_ring else None,
+        }
+
+    def release(self):
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+            self.capture_thread.join(timeout=2.0)
+            self.capture_thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        if self.shm_ring is not None:
+            self.shm_ring.close()
+
+
+def create_cameras():
+    """설정된 카메라마다 Camera 객체를 생성합니다. (id → Camera, 설정 순서 유지)"""
+    config_all = load_config()
+    broadcast = config_all.get("broadcast")
+    cameras = {}
+    for i, config in enumerate(config_all.get("cameras") or DEFAULT_CAMERAS):
+        camera_id = str(config.get("id", f"cam{i}"))
+        cameras[camera_id] = Camera(
+            camera_id,
+            config.get("source", 0),
+            config.get("width"),
+            config.get("height"),
+            config.get("fps"),
+            broadcast,
+            config_all.get("jpeg"),
+        )
+    return cameras
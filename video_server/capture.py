@@ -0,0 +1,166 @@
+import threading
+import time
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    미리 할당한 numpy 프레임 버퍼 링.
+    캡처 스레드는 비어 있는 슬롯에 바로 읽어 넣고, 송출 쪽은 항상 최신 슬롯만 가져갑니다.
+    송출 쪽이 잡고 있는 슬롯은 캡처 스레드가 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, slots=4):
+        self.slots = max(3, slots)
+        self.buffers = []
+        self.shape = None
+        self._timestamps = [0.0] * self.slots
+        self._busy = [False] * self.slots
+        self._latest = -1
+        self._latest_read = True
+        self._write_index = 0
+        self.seq = 0
+        self.captured = 0
+        self.dropped = 0  # 송출되기 전에 새 프레임으로 대체된 프레임 수
+        self._lock = threading.Lock()
+
+    def allocate(self, shape):
+        """프레임 크기에 맞춰 버퍼를 (재)할당합니다."""
+        with self._lock:
+            self.shape = shape
+            self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(self.slots)]
+            self._busy = [False] * self.slots
+            self._latest = -1
+            self._latest_read = True
+
+    def acquire_write(self):
+        """캡처 스레드가 쓸 슬롯을 고릅니다. (최신 슬롯/송출 중인 슬롯 제외)"""
+        with self._lock:
+            for _ in range(self.slots):
+                index = self._write_index
+                self._write_index = (self._write_index + 1) % self.slots
+                if index != self._latest and not self._busy[index]:
+                    return index, (self.buffers[index] if self.buffers else None)
+        return None, None
+
+    def commit(self, index, timestamp):
+        """슬롯에 새 프레임이 준비되었음을 알립니다."""
+        with self._lock:
+            if not self._latest_read:
+                self.dropped += 1
+            self._latest = index
+            self._latest_read = False
+            self._timestamps[index] = timestamp
+            self.seq += 1
+            self.captured += 1
+
+    def acquire_latest(self, last_seq):
+        """
+        last_seq 이후 새 프레임이 있으면 최신 슬롯을 잡아 반환합니다.
+
+        :return: (seq, 슬롯 번호, 프레임 버퍼, 캡처 시각) 또는 None
+        """
+        with self._lock:
+            if self._latest < 0 or self.seq == last_seq:
+                return None
+            index = self._latest
+            self._busy[index] = True
+            self._latest_read = True
+            return self.seq, index, self.buffers[index], self._timestamps[index]
+
+    def release(self, index):
+        """송출이 끝난 슬롯을 캡처 스레드에 돌려줍니다."""
+        with self._lock:
+            if index < len(self._busy):
+                self._busy[index] = False
+
+
+class CaptureThread(threading.Thread):
+    """
+    카메라 프레임을 전용 스레드에서 계속 읽어 FrameRing에 기록합니다.
+    연속 읽기 실패 시 재연결을 시도하고, 새 프레임마다 on_frame 콜백을 호출합니다.
+    """
+
+    def __init__(self, camera, ring, on_frame=None):
+        super().__init__(name=f"capture-{camera.id}", daemon=True)
+        self.camera = camera
+        self.ring = ring
+        self.on_frame = on_frame
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        camera = self.camera
+        ring = self.ring
+
+        # 복구 관련 변수
+        consecutive_failures = 0
+        max_consecutive_failures = 5
+        last_reconnect_time = time.time()
+        reconnect_interval = 10  # 재연결 시도 간격(초)
+        next_capture = time.perf_counter()
+
+        while not self._stop_event.is_set():
+            # 클라이언트가 없으면 캡처 생략
+            if not camera.has_clients():
+                self._stop_event.wait(0.5)
+                continue
+
+            # fps가 설정된 경우(파일 소스 등) 캡처 속도 제한
+            if camera.fps:
+                delay = next_capture - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                next_capture = max(next_capture, time.perf_counter()) + (
+                    1.0 / camera.fps
+                )
+
+            index, buffer = ring.acquire_write()
+            if index is None:
+                # 모든 슬롯이 송출 중 → 잠시 대기
+                self._stop_event.wait(0.005)
+                continue
+
+            # 미리 할당된 버퍼에 바로 디코딩 (크기가 다르면 OpenCV가 새 배열 반환)
+            if buffer is None:
+                ret, frame = camera.cap.read()
+            else:
+                ret, frame = camera.cap.read(buffer)
+            if not ret:
+                consecutive_failures += 1
+                print(
+                    f"⚠️ [{camera.id}] 프레임 읽기 실패 "
+                    f"({consecutive_failures}/{max_consecutive_failures})"
+                )
+
+                # 연속 실패 횟수가 임계값을 초과하면 카메라 재연결 시도
+                if consecutive_failures >= max_consecutive_failures:
+                    current_time = time.time()
+                    if current_time - last_reconnect_time > reconnect_interval:
+                        print(f"🔄 [{camera.id}] 카메라 재연결 시도...")
+                        if camera.open():
+                            print(f"✅ [{camera.id}] 카메라 재연결 성공")
+                            consecutive_failures = 0
+                            last_reconnect_time = current_time
+                        else:
+                            print(f"❌ [{camera.id}] 카메라 재연결 실패")
+
+                # 실패 후 대기 (연속 실패가 많을수록 대기 시간 증가)
+                self._stop_event.wait(min(0.1 * consecutive_failures, 2.0))
+                continue
+
+            # 프레임 읽기 성공 시 연속 실패 카운터 초기화
+            consecutive_failures = 0
+
+            if frame is not buffer:
+                # 첫 프레임 또는 해상도 변경 → 버퍼 재할당 후 이번 프레임 복사
+                ring.allocate(frame.shape)
+                index, buffer = ring.acquire_write()
+                np.copyto(buffer, frame)
+
+            ring.commit(index, time.perf_counter())
+            if self.on_frame is not None:
+                self.on_frame()
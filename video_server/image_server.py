@@ -6,6 +6,14 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 import cv2
 import asyncio
+import os
+import sys
+
+# 저장소 루트 (shared 패키지 import 용)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera_registry import load_config
+from shared.jpeg_encoder import create_encoder, encode_snapshot
 
 # === 초기 설정 ===
 templates = Jinja2Templates(directory="video_server/templates")
@@ -14,6 +22,8 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 uploaded_images = []  # 업로드된 이미지 경로 저장
 active_connections = set()
 broadcast_task = None
+# 설정(jpeg)의 기본 단계 화질로 인코딩
+encoder = create_encoder("image", jpeg_config=load_config().get("jpeg"))
 
 
 # === 업로드된 이미지 순차 송출 ===
@@ -60,9 +70,12 @@ async def video_broadcast():
                 cv2.LINE_AA,
             )
             print("⏸️ 업로드 이미지 송출 중...")
-            _, buffer = cv2.imencode(".jpg", frame)
-            data = buffer.tobytes()
+            data = await asyncio.to_thread(encoder.encode, frame)
             del frame
+            if data is None:
+                print(f"❌ 이미지 인코딩 실패: {image_path}")
+                await asyncio.sleep(0.5)
+                continue
 
             disconnected = set()
             for ws in list(active_connections):
@@ -137,6 +150,12 @@ async def video_feed_ws(websocket: WebSocket):
         print(f"🔵 제거됨 ({len(active_connections)}명)")
 
 
+@app.get("/stats/encoding")
+async def encoding_stats():
+    """JPEG 인코딩 시간과 크기"""
+    return encode_snapshot()
+
+
 # === 메인 페이지 ===
 @app.get("/")
 async def home(request: Request):
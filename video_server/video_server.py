@@ -3,139 +3,188 @@ from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
-import cv2, asyncio
+import cv2, asyncio, os, sys
 import psutil  # 메모리 사용량 측정을 위한 라이브러리 추가
 
+# 저장소 루트 (shared 패키지 import 용)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera_registry import create_cameras, load_config
+from shared.frame_transport import pack_frame, socket_path, UnixFrameClient
+from shared.shm_ring import FRAME_RELEASE, ShmControlClient, ShmFrameWriter
+from shared.jpeg_encoder import encode_snapshot
+from shared.broadcaster import parse_profile
+
 # === 앱 초기화 ===
 templates = Jinja2Templates(directory="video_server/templates")
-active_connections = set()
-broadcast_task = None
 
-
-# === WebSocket으로 프레임 송출 ===
-async def video_broadcast():
+# 카메라 id → Camera (첫 번째 카메라가 기본 /ws/video 대상)
+cameras = create_cameras()
+default_camera = next(iter(cameras.values()))
+
+# 감지 서버로의 프레임 전달 방식
+# "ws": JPEG over WebSocket, "unix": 원시 프레임 over Unix 소켓,
+# "shm": 공유 메모리 프레임 링 + Unix 소켓 제어 채널
+transport = load_config().get("transport") or {}
+
+
+def render_and_encode(camera, frame, clients, process, variants):
+    """프레임에 카메라/메모리 정보를 그리고 단계별로 인코딩합니다. (워커 스레드에서 실행)"""
+    # 메모리 사용량 측정
+    memory_info = process.memory_info()
+    memory_mb = memory_info.rss / 1024 / 1024  # MB 단위로 변환
+
+    cv2.putText(
+        frame,
+        f"{camera.id} Clients: {clients}",
+        (10, 30),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1,
+        (0, 255, 0),
+        2,
+    )
+
+    # 메모리 사용량 표시 추가
+    cv2.putText(
+        frame,
+        f"Memory: {memory_mb:.1f} MB",
+        (10, 70),  # 위치를 아래로 조정
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1,
+        (0, 255, 0),
+        2,
+    )
+    return camera.broadcaster.encode_variants(variants, frame)
+
+
+# === WebSocket으로 프레임 송출 (카메라별 태스크) ===
+async def video_broadcast(camera):
     import time
 
-    # 복구 관련 변수
-    consecutive_failures = 0
-    max_consecutive_failures = 5
-    last_reconnect_time = time.time()
-    reconnect_interval = 10  # 재연결 시도 간격(초)
-
-    # 카메라 초기화 함수
-    def init_camera():
-        nonlocal cap
-        if cap is not None:
-            cap.release()  # 기존 카메라 리소스 해제
-
-        cap = cv2.VideoCapture(0)
-        # 카메라 속성 설정 (필요시)
-        # cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        # cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        return cap.isOpened()
-
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("🚨 카메라 열기 실패")
+    # 장치 열기는 블로킹이므로 스레드에서 실행 → 다른 카메라 송출을 막지 않음
+    if not await asyncio.to_thread(camera.open):
+        print(f"🚨 [{camera.id}] 카메라 열기 실패 (source={camera.source})")
         return
 
-    print("📷 카메라 송출 시작됨")
+    # 캡처는 전용 스레드에서 수행하고, 새 프레임이 링에 들어오면 이벤트로 깨움
+    loop = asyncio.get_running_loop()
+    frame_ready = asyncio.Event()
+    camera.start_capture(lambda: loop.call_soon_threadsafe(frame_ready.set))
+
+    broadcaster = camera.broadcaster
+    print(f"📷 [{camera.id}] 카메라 송출 시작됨")
     process = psutil.Process()  # 현재 프로세스 객체 가져오기
+    last_seq = 0
     try:
         while True:
             # 클라이언트가 없으면 프레임 처리 생략
-            if not active_connections:
-                print("⏸️ 모든 클라이언트가 연결 해제됨. 대기 중...", flush=True)
-                await asyncio.sleep(0.5)
-                continue
-
-            ret, frame = cap.read()
-            if not ret:
-                consecutive_failures += 1
+            if not camera.has_clients():
                 print(
-                    f"⚠️ 프레임 읽기 실패 ({consecutive_failures}/{max_consecutive_failures})"
+                    f"⏸️ [{camera.id}] 모든 클라이언트가 연결 해제됨. 대기 중...",
+                    flush=True,
                 )
-
-                # 연속 실패 횟수가 임계값을 초과하면 카메라 재연결 시도
-                if consecutive_failures >= max_consecutive_failures:
-                    current_time = time.time()
-                    if current_time - last_reconnect_time > reconnect_interval:
-                        print("🔄 카메라 재연결 시도...")
-                        if init_camera():
-                            print("✅ 카메라 재연결 성공")
-                            consecutive_failures = 0
-                            last_reconnect_time = current_time
-                        else:
-                            print("❌ 카메라 재연결 실패")
-
-                # 실패 후 대기 (연속 실패가 많을수록 대기 시간 증가)
-                await asyncio.sleep(min(0.1 * consecutive_failures, 2.0))
+                await asyncio.sleep(0.5)
                 continue
 
-            # 프레임 읽기 성공 시 연속 실패 카운터 초기화
-            consecutive_failures = 0
-
-            # 메모리 사용량 측정
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024  # MB 단위로 변환
-
-            # 프레임 처리 및 전송
-            cv2.putText(
-                frame,
-                f"Clients: {len(active_connections)}",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1,
-                (0, 255, 0),
-                2,
-            )
-
-            # 메모리 사용량 표시 추가
-            cv2.putText(
-                frame,
-                f"Memory: {memory_mb:.1f} MB",
-                (10, 70),  # 위치를 아래로 조정
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1,
-                (0, 255, 0),
-                2,
-            )
-
-            _, buffer = cv2.imencode(".jpg", frame)
-            data = buffer.tobytes()
-
-            # 참조 즉시 해제하여 메모리 회수 촉진
-            del frame
-
-            # 클라이언트별 송신 처리
-            disconnected = set()
-            for ws in list(active_connections):  # 복사본 사용
+            # 최신 프레임만 가져옴 (그 사이 캡처된 프레임은 건너뜀)
+            latest = camera.ring.acquire_latest(last_seq)
+            if latest is None:
+                frame_ready.clear()
                 try:
-                    await ws.send_bytes(data)
-                except WebSocketDisconnect:
-                    print("🔴 WebSocket 연결 해제됨")
-                    disconnected.add(ws)
-                except Exception as e:
-                    print(f"💥 송신 중 예외 발생: {e}")
-                    disconnected.add(ws)
-
-            # 연결 해제된 클라이언트 제거
-            for ws in disconnected:
-                active_connections.discard(ws)
-
-            await asyncio.sleep(0.03)
-    finally:
-        cap.release()
-        print("🛑 카메라 리소스 해제 완료")
-
+                    await asyncio.wait_for(frame_ready.wait(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    pass
+                continue
 
-# === lifespan 기반 프레임 수신 태스크 관리 ===
+            last_seq, slot, frame, captured_at = latest
+            try:
+                # 원시 프레임 구독자: 오버레이 없는 원본을 인코딩 없이 전달
+                if camera.raw_broadcaster:
+                    if camera.shm_ring is not None:
+                        # 공유 메모리 슬롯에 복사하고 제어 채널로 슬롯 번호만 전달
+                        ready = camera.shm_ring.write(last_seq, time.time(), frame)
+                        if ready is not None:
+                            camera.raw_broadcaster.publish(ready)
+                    else:
+                        camera.raw_broadcaster.publish(
+                            pack_frame(last_seq, time.time(), frame)
+                        )
+
+                if broadcaster:
+                    # 표시 문구 그리기와 단계별 인코딩은 스레드에서 한 번에 수행하고
+                    # 루프에서는 인코딩된 bytes만 클라이언트별 큐에 넣음 (다른 카메라 송출을 막지 않음)
+                    # 송출 중인 슬롯은 캡처 스레드가 덮어쓰지 않음
+                    variants = broadcaster.due_variants()
+                    if variants:
+                        results = await asyncio.to_thread(
+                            render_and_encode,
+                            camera,
+                            frame,
+                            len(broadcaster),
+                            process,
+                            variants,
+                        )
+                        broadcaster.publish_encoded(variants, results)
+            finally:
+                camera.ring.release(slot)
+
+            camera.record_send(captured_at, time.perf_counter())
+    finally:
+        await asyncio.to_thread(camera.release)
+        print(f"🛑 [{camera.id}] 카메라 리소스 해제 완료")
+
+
+# === Unix 소켓 원시 프레임 송출 (같은 호스트의 감지 서버용) ===
+async def start_raw_server(camera, socket_dir):
+    path = socket_path(socket_dir, camera.id)
+    os.makedirs(socket_dir, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)  # 이전 실행에서 남은 소켓 파일 제거
+
+    async def handle_client(reader, writer):
+        if camera.shm_ring is not None:
+            client = ShmControlClient(writer, camera.shm_ring)
+        else:
+            client = UnixFrameClient(writer)
+        camera.raw_broadcaster.add(client)
+        print(f"🟢 [{camera.id}] 원시 프레임 구독자 연결됨 ({path})")
+        try:
+            if camera.shm_ring is not None:
+                # 구독자가 사용을 마친 공유 메모리 슬롯을 돌려받음
+                while True:
+                    message = await reader.readexactly(FRAME_RELEASE.size)
+                    client.release(*FRAME_RELEASE.unpack(message))
+            else:
+                # 구독자는 데이터를 보내지 않음 → 연결 종료(EOF)까지 대기
+                await reader.read()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            camera.raw_broadcaster.remove(client)
+            if camera.shm_ring is not None:
+                client.release_all()
+            writer.close()
+            print(f"🔵 [{camera.id}] 원시 프레임 구독자 연결 해제")
+
+    camera.raw_server = await asyncio.start_unix_server(handle_client, path=path)
+    print(f"🧷 [{camera.id}] 원시 프레임 소켓 대기 중: {path}")
+
+
+# === lifespan 기반 프레임 송출 태스크 관리 ===
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global broadcast_task
-    broadcast_task = asyncio.create_task(video_broadcast())
+    for camera in cameras.values():
+        if transport.get("type") == "shm":
+            camera.shm_ring = ShmFrameWriter(camera.id, transport.get("shm_slots", 4))
+        if transport.get("type") in ("unix", "shm"):
+            await start_raw_server(camera, transport.get("socket_dir", "/tmp/ocr_dash"))
+        camera.task = asyncio.create_task(video_broadcast(camera))
+    print(f"📡 카메라 {len(cameras)}대 송출 태스크 시작: {list(cameras)}")
     yield
-    broadcast_task.cancel()
+    for camera in cameras.values():
+        camera.task.cancel()
+        if camera.raw_server is not None:
+            camera.raw_server.close()
     print("🛑 영상 송출 태스크 종료")
 
 
@@ -145,26 +194,61 @@ app.mount("/static", StaticFiles(directory="video_server/static"), name="static"
 
 
 # === WebSocket 엔드포인트 ===
-@app.websocket("/ws/video")
-async def video_feed_ws(websocket: WebSocket):
+async def serve_video_client(websocket, camera):
     await websocket.accept()
-    print("🟡 WebSocket 수락됨 (ping 대기 중...)")
+    broadcaster = camera.broadcaster
+    print(f"🟡 [{camera.id}] WebSocket 수락됨 (ping 대기 중...)")
     try:
         while True:
-            await websocket.receive_text()  # ping 메시지 대기
-            if websocket not in active_connections:  # 아직 추가되지 않았다면 추가
-                active_connections.add(websocket)
+            message = await websocket.receive_text()  # ping 또는 송출 프로필 대기
+            # {"max_fps", "max_width", "quality"} 또는 {"tier"} 를 보내면 해당 프로필로 송출
+            profile = parse_profile(message)
+            if profile is not None:
+                broadcaster.add(websocket, profile)
+                print(f"🎚️ [{camera.id}] 송출 프로필: {profile} ({len(broadcaster)}명)")
+            elif websocket not in broadcaster:  # 아직 추가되지 않았다면 추가
+                # ?tier=thumbnail 처럼 해상도/화질 단계 선택 (없으면 기본 단계)
+                broadcaster.add(websocket, websocket.query_params.get("tier"))
                 print(
-                    f"🟢 WebSocket ping 수신 - 접속 등록됨 ({len(active_connections)}명)"
+                    f"🟢 [{camera.id}] WebSocket ping 수신 - 접속 등록됨 ({len(broadcaster)}명)"
                 )
     except WebSocketDisconnect:
-        print("🔴 WebSocket 연결 해제됨")
+        print(f"🔴 [{camera.id}] WebSocket 연결 해제됨")
+    except Exception as e:
+        # 느린 클라이언트로 판단되어 서버가 연결을 끊은 경우 등
+        print(f"🔴 [{camera.id}] WebSocket 수신 종료: {e}")
     finally:
-        active_connections.discard(websocket)
-        print(f"🔵 WebSocket 연결 제거됨 (총 {len(active_connections)}명)")
+        broadcaster.remove(websocket)
+        print(f"🔵 [{camera.id}] WebSocket 연결 제거됨 (총 {len(broadcaster)}명)")
+
+
+@app.websocket("/ws/video")
+async def video_feed_ws(websocket: WebSocket):
+    await serve_video_client(websocket, default_camera)
+
+
+@app.websocket("/ws/video/{camera_id}")
+async def camera_feed_ws(websocket: WebSocket, camera_id: str):
+    camera = cameras.get(camera_id)
+    if camera is None:
+        await websocket.close(code=1008)
+        return
+    await serve_video_client(websocket, camera)
 
 
 # === HTTP 라우터 ===
+@app.get("/stats")
+async def stats():
+    """카메라별 캡처/드롭/송출 수와 캡처→송출 지연"""
+    return {camera_id: camera.stats() for camera_id, camera in cameras.items()}
+
+
+@app.get("/stats/encoding")
+async def encoding_stats():
+    """송출 대상/단계별 JPEG 인코딩 시간과 크기"""
+    return encode_snapshot()
+
+
 @app.get("/")
 async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})